@@ -14,28 +14,83 @@
 # limitations under the License.
 """
  This package provides a client library for accessing the IBM Cloud Platform Services.
+
+ The service classes (e.g. `ResourceControllerV2`) are imported lazily (PEP 562), so
+ each service module is only loaded the first time its class is accessed.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from ibm_cloud_sdk_core import IAMTokenManager, DetailedResponse, BaseService, ApiException
 
 from .common import get_sdk_headers
 from .version import __version__
 
-from .case_management_v1 import CaseManagementV1
-from .catalog_management_v1 import CatalogManagementV1
-from .enterprise_billing_units_v1 import EnterpriseBillingUnitsV1
-from .enterprise_management_v1 import EnterpriseManagementV1
-from .enterprise_usage_reports_v1 import EnterpriseUsageReportsV1
-from .global_catalog_v1 import GlobalCatalogV1
-from .global_search_v2 import GlobalSearchV2
-from .global_tagging_v1 import GlobalTaggingV1
-from .iam_access_groups_v2 import IamAccessGroupsV2
-from .iam_identity_v1 import IamIdentityV1
-from .iam_policy_management_v1 import IamPolicyManagementV1
-from .ibm_cloud_shell_v1 import IbmCloudShellV1
-from .open_service_broker_v1 import OpenServiceBrokerV1
-from .resource_controller_v2 import ResourceControllerV2
-from .resource_manager_v2 import ResourceManagerV2
-from .usage_metering_v4 import UsageMeteringV4
-from .usage_reports_v4 import UsageReportsV4
-from .user_management_v1 import UserManagementV1
+# Maps each exported service class to the module that defines it.
+_SERVICE_MODULES = {
+    'CaseManagementV1': 'case_management_v1',
+    'CatalogManagementV1': 'catalog_management_v1',
+    'EnterpriseBillingUnitsV1': 'enterprise_billing_units_v1',
+    'EnterpriseManagementV1': 'enterprise_management_v1',
+    'EnterpriseUsageReportsV1': 'enterprise_usage_reports_v1',
+    'GlobalCatalogV1': 'global_catalog_v1',
+    'GlobalSearchV2': 'global_search_v2',
+    'GlobalTaggingV1': 'global_tagging_v1',
+    'IamAccessGroupsV2': 'iam_access_groups_v2',
+    'IamIdentityV1': 'iam_identity_v1',
+    'IamPolicyManagementV1': 'iam_policy_management_v1',
+    'IbmCloudShellV1': 'ibm_cloud_shell_v1',
+    'OpenServiceBrokerV1': 'open_service_broker_v1',
+    'ResourceControllerV2': 'resource_controller_v2',
+    'ResourceManagerV2': 'resource_manager_v2',
+    'UsageMeteringV4': 'usage_metering_v4',
+    'UsageReportsV4': 'usage_reports_v4',
+    'UserManagementV1': 'user_management_v1',
+}
+
+__all__ = [
+    'IAMTokenManager',
+    'DetailedResponse',
+    'BaseService',
+    'ApiException',
+    'get_sdk_headers',
+    '__version__',
+] + list(_SERVICE_MODULES)
+
+if TYPE_CHECKING:
+    from .case_management_v1 import CaseManagementV1
+    from .catalog_management_v1 import CatalogManagementV1
+    from .enterprise_billing_units_v1 import EnterpriseBillingUnitsV1
+    from .enterprise_management_v1 import EnterpriseManagementV1
+    from .enterprise_usage_reports_v1 import EnterpriseUsageReportsV1
+    from .global_catalog_v1 import GlobalCatalogV1
+    from .global_search_v2 import GlobalSearchV2
+    from .global_tagging_v1 import GlobalTaggingV1
+    from .iam_access_groups_v2 import IamAccessGroupsV2
+    from .iam_identity_v1 import IamIdentityV1
+    from .iam_policy_management_v1 import IamPolicyManagementV1
+    from .ibm_cloud_shell_v1 import IbmCloudShellV1
+    from .open_service_broker_v1 import OpenServiceBrokerV1
+    from .resource_controller_v2 import ResourceControllerV2
+    from .resource_manager_v2 import ResourceManagerV2
+    from .usage_metering_v4 import UsageMeteringV4
+    from .usage_reports_v4 import UsageReportsV4
+    from .user_management_v1 import UserManagementV1
+
+
+def __getattr__(name: str):
+    """
+    Import the service module that defines `name` on first access.
+    """
+    module_name = _SERVICE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    value = getattr(importlib.import_module('.' + module_name, __name__), name)
+    # Cache the class so that subsequent lookups bypass __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SERVICE_MODULES))
@@ -0,0 +1,182 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides asyncio variants of the service clients.
+
+Each `Async<Service>` class (e.g. `AsyncResourceControllerV2`) has the same operations,
+with the same signatures, as its synchronous counterpart, but every operation is a
+coroutine:
+
+    service = AsyncResourceControllerV2.new_instance()
+    async with service:
+        responses = await asyncio.gather(*[service.get_resource_instance(id=i) for i in ids])
+
+The async clients are a convenience for calling the service from asyncio code: each
+operation runs the synchronous operation, with the same `prepare_request` logic and
+the same `DetailedResponse`, on a pool of `max_concurrency` worker threads owned by the
+client, so the event loop is not blocked. The transport is still the blocking one of
+the synchronous clients: every request in flight holds a worker thread, and the
+operations beyond `max_concurrency` wait for a free thread. This does not scale
+further than the same number of threads calling the synchronous client, e.g. with
+PlatformBaseService.map(). The connection pool of the client is sized to
+`max_concurrency`, so the workers reuse keep-alive connections.
+
+The pagers take synchronous clients; from asyncio code, run a pager of a synchronous
+client in an executor, e.g. `await loop.run_in_executor(None, pager.get_all)`.
+"""
+
+import asyncio
+import contextvars
+import functools
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Type
+
+from ibm_cloud_sdk_core import BaseService
+from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
+
+from . import _SERVICE_MODULES
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+# Maps each async client class name to the module that defines its synchronous service class.
+_ASYNC_SERVICE_MODULES = {'Async' + name: module for (name, module) in _SERVICE_MODULES.items()}
+_ASYNC_SERVICE_MODULES['AsyncContextBasedRestrictionsV1'] = 'context_based_restrictions_v1'
+
+__all__ = ['AsyncServiceMixin', 'create_async_service_class', 'DEFAULT_MAX_CONCURRENCY'] + list(_ASYNC_SERVICE_MODULES)
+
+
+class AsyncServiceMixin:
+    """
+    Common functionality shared by the async service classes.
+
+    The mixin owns the worker threads that run the synchronous operations of the client,
+    one request per thread, and keeps the connection pool of the client's http adapter
+    sized to `max_concurrency`.
+    """
+
+    def __init__(
+        self,
+        authenticator: Authenticator = None,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        """
+        Construct a new async client.
+
+        :param Authenticator authenticator: The authenticator specifies the authentication mechanism.
+        :param int max_concurrency: (optional) The number of worker threads, i.e. the maximum
+               number of requests that the client sends at the same time. Additional
+               operations wait for a free worker.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be a positive integer')
+        super().__init__(authenticator)
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=type(self).__name__)
+        self._size_connection_pool()
+
+    def _size_connection_pool(self) -> None:
+        """Resize the connection pool of the current http adapter to `max_concurrency`."""
+        if self.get_session_factory() is not None:
+            # The pools are shared with other clients and sized by the session factory.
+            return
+        self.http_adapter.poolmanager.clear()
+        self.http_adapter.init_poolmanager(self.max_concurrency, self.max_concurrency)
+
+    def enable_retries(self, max_retries: int = 4, retry_interval: float = 30.0) -> None:
+        """Enable automatic retries, keeping the connection pool size of the client."""
+        super().enable_retries(max_retries=max_retries, retry_interval=retry_interval)
+        self._size_connection_pool()
+
+    def disable_retries(self):
+        """Disable automatic retries, keeping the connection pool size of the client."""
+        super().disable_retries()
+        self._size_connection_pool()
+
+    def set_disable_ssl_verification(self, status: bool = False) -> None:
+        """Enable or disable SSL verification, keeping the connection pool size of the client."""
+        super().set_disable_ssl_verification(status)
+        self._size_connection_pool()
+
+    async def _run(self, func: Callable, *args, **kwargs):
+        """Run a synchronous callable on the client's worker threads and await its result."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    def close(self) -> None:
+        """
+        Release the worker threads and the pooled connections of the client, unless the
+        connections are shared through a session factory.
+        """
+        self._executor.shutdown(wait=False)
+        if self.get_session_factory() is None:
+            self.http_client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _async_operation(operation: Callable) -> Callable:
+    """Return a coroutine function that runs the synchronous `operation` of a client."""
+
+    @functools.wraps(operation)
+    async def async_operation(self, *args, **kwargs):
+        return await self._run(operation, self, *args, **kwargs)
+
+    return async_operation
+
+
+def create_async_service_class(service_class: Type[BaseService]) -> Type[BaseService]:
+    """
+    Create the async variant of a service class.
+
+    Every public operation defined by `service_class` is replaced by a coroutine function
+    with the same name, signature and documentation.
+
+    :param type service_class: The synchronous service class, e.g. `ResourceControllerV2`.
+    :return: A subclass of `AsyncServiceMixin` and `service_class`.
+    :rtype: type
+    """
+    namespace: Dict[str, object] = {'__module__': __name__, '__doc__': service_class.__doc__}
+    for (name, member) in vars(service_class).items():
+        if name.startswith('_') or not callable(member) or isinstance(member, (classmethod, staticmethod)):
+            continue
+        namespace[name] = _async_operation(member)
+    return type('Async' + service_class.__name__, (AsyncServiceMixin, service_class), namespace)
+
+
+def __getattr__(name: str):
+    """
+    Create the async client class `name` on first access.
+    """
+    module_name = _ASYNC_SERVICE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    module = importlib.import_module('.' + module_name, __package__)
+    value = create_async_service_class(getattr(module, name[len('Async') :]))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ASYNC_SERVICE_MODULES))
@@ -0,0 +1,225 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides the bulk execution of the operations that take one ID per call.
+
+PlatformBaseService.map() applies an operation of a client to many items from a pool
+of worker threads, and streams the outcome of each item back in the order of the items:
+
+    with resource_controller_service.map('get_resource_instance', ids, max_workers=32) as results:
+        for result in results:
+            if result.error is None:
+                print(result.item, result.response.get_result()['state'])
+            else:
+                print(result.item, result.error)
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Deque, Iterable, Optional, Tuple
+
+from ibm_cloud_sdk_core import DetailedResponse
+
+DEFAULT_MAX_WORKERS = 16
+
+
+class BulkResult:
+    """
+    The outcome of an operation applied to one item by BulkMap.
+
+    :attr int index: The position of the item in the items of the BulkMap.
+    :attr item: The item.
+    :attr DetailedResponse response: The response of the operation, or None if it failed.
+    :attr Exception error: The exception raised by the operation, e.g. an ApiException,
+          a concurrent.futures.CancelledError if the BulkMap was cancelled before the
+          operation was invoked, or a concurrent.futures.TimeoutError if the deadline
+          passed before the operation returned; None if it succeeded.
+    """
+
+    __slots__ = ('index', 'item', 'response', 'error')
+
+    def __init__(self, index: int, item, response: Optional[DetailedResponse], error: Optional[BaseException]) -> None:
+        self.index = index
+        self.item = item
+        self.response = response
+        self.error = error
+
+    def get_result(self):
+        """
+        Return the result of the response of the operation, or raise its exception.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.response.get_result()
+
+    def __repr__(self) -> str:
+        outcome = 'error={0!r}'.format(self.error) if self.error is not None else 'response={0!r}'.format(self.response)
+        return 'BulkResult(index={0}, item={1!r}, {2})'.format(self.index, self.item, outcome)
+
+
+class BulkMap:
+    """
+    BulkMap applies an operation to the items of an iterable from a pool of worker
+    threads, and iterates over their BulkResult in the order of the items.
+
+    An item that is a dict is passed as keyword arguments, e.g.
+    `{'id': 'key-1', 'x_correlation_id': 'c1'}`; any other item is passed as the
+    first positional argument. The items are taken from the iterable as the
+    results are consumed, at most `2 * max_workers` ahead of the last result
+    returned, so the iterable can be a generator of any length.
+
+    The exception raised by the operation for an item is captured in its
+    BulkResult and does not stop the other items. cancel() and the deadline
+    stop taking new items: the items already taken are still returned, with a
+    CancelledError or TimeoutError for those whose operation was not invoked.
+    After the deadline, an item whose request is in flight is returned with a
+    TimeoutError at once, although the request can still complete.
+
+    Use a BulkMap as a context manager, or call close(), to cancel the remaining
+    items and release the worker threads when the iteration is interrupted.
+    """
+
+    def __init__(
+        self,
+        operation: Callable[..., DetailedResponse],
+        items: Iterable,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        deadline: float = None,
+        **kwargs
+    ) -> None:
+        """
+        Initialize a BulkMap object, and start applying the operation.
+        :param Callable operation: The operation, e.g. the bound method
+               `service.get_resource_instance`.
+        :param Iterable items: The items to apply the operation to.
+        :param int max_workers: (optional) The number of operations invoked at the same time.
+        :param float deadline: (optional) The number of seconds after which the remaining
+               items are returned with a TimeoutError; by default there is no deadline.
+        :param **kwargs: The keyword arguments passed to every invocation of the operation,
+               e.g. its `timeout`.
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be a positive integer')
+        self._operation = operation
+        self._items = enumerate(items)
+        self._kwargs = kwargs
+        self._window = 2 * max_workers
+        self._deadline = None if deadline is None else time.monotonic() + deadline
+        self._pending: Deque[Tuple[int, object, Future]] = deque()
+        # The exception class given to the items not run, once the map is stopped.
+        self._stopped = None
+        self._changed = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='BulkMap')
+        self._fill()
+
+    def _invoke(self, item) -> DetailedResponse:
+        if isinstance(item, dict):
+            return self._operation(**{**self._kwargs, **item})
+        return self._operation(item, **self._kwargs)
+
+    def _notify(self, _future: Future) -> None:
+        with self._changed:
+            self._changed.notify_all()
+
+    def _fill(self) -> None:
+        """Submit the next items, up to the window."""
+        while self._stopped is None and len(self._pending) < self._window:
+            entry = next(self._items, None)
+            if entry is None:
+                return
+            (index, item) = entry
+            # Each invocation runs in a copy of the context of the consumer, as a direct call would.
+            future = self._executor.submit(contextvars.copy_context().run, self._invoke, item)
+            future.add_done_callback(self._notify)
+            with self._changed:
+                self._pending.append((index, item, future))
+                if self._stopped is not None:
+                    # cancel() was called from another thread since the loop condition.
+                    future.cancel()
+
+    def _stop(self, error_class: type) -> None:
+        with self._changed:
+            if self._stopped is None:
+                self._stopped = error_class
+            self._changed.notify_all()
+            # The futures are cancelled under the lock, so the future taken by __next__
+            # is not cancelled while its result is read.
+            for (_, _, future) in self._pending:
+                future.cancel()
+
+    def cancel(self) -> None:
+        """
+        Stop taking new items and invoking the operation; can be called from any thread.
+
+        The items whose operation is running are returned with its outcome, the other
+        items already taken with a CancelledError.
+        """
+        self._stop(CancelledError)
+
+    def close(self) -> None:
+        """
+        Cancel the remaining items and release the worker threads, without waiting
+        for the operations that are running.
+        """
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self) -> 'BulkMap':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __iter__(self) -> 'BulkMap':
+        return self
+
+    def __next__(self) -> BulkResult:
+        self._fill()
+        with self._changed:
+            if not self._pending:
+                self._executor.shutdown(wait=False)
+                raise StopIteration
+            (index, item, future) = self._pending[0]
+            while not future.done() and self._stopped is None:
+                if self._deadline is None:
+                    self._changed.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+        if not future.done() and self._stopped is None:
+            self._stop(FutureTimeoutError)
+        with self._changed:
+            self._pending.popleft()
+        return self._result(index, item, future)
+
+    def _result(self, index: int, item, future: Future) -> BulkResult:
+        if future.cancelled():
+            message = 'cancelled' if self._stopped is CancelledError else 'the deadline passed before the call'
+            return BulkResult(index, item, None, self._stopped(message))
+        if not future.done() and self._stopped is FutureTimeoutError:
+            return BulkResult(index, item, None, FutureTimeoutError('the deadline passed during the call'))
+        error = future.exception()
+        if error is not None:
+            return BulkResult(index, item, None, error)
+        return BulkResult(index, item, future.result(), None)
@@ -29,19 +29,20 @@ from typing import BinaryIO, Dict, List
 import json
 import sys
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse, get_query_param
+from ibm_cloud_sdk_core import DetailedResponse, get_query_param
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_list, convert_model
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class CaseManagementV1(BaseService):
+class CaseManagementV1(PlatformBaseService):
     """The Case Management V1 service."""
 
     DEFAULT_SERVICE_URL = 'https://support-center.cloud.ibm.com/case-management/v1'
@@ -72,7 +73,7 @@ class CaseManagementV1(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # default
@@ -2332,11 +2333,14 @@ class FileWithMetadata:
 ##############################################################################
 
 
-class GetCasesPager:
+class GetCasesPager(BasePager):
     """
     GetCasesPager can be used to simplify the use of the "get_cases" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = Case
+
     def __init__(
         self,
         *,
@@ -0,0 +1,127 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides a factory that creates service clients sharing their credentials.
+
+The new_instance() method of each service class builds its own authenticator, so each
+client requests and refreshes its own IAM token. The clients created by one
+ClientFactory share one authenticator, and so one token, and one set of connection
+pools for each distinct credential in the external configuration:
+
+    factory = ClientFactory()
+    resource_controller = factory.new_instance(ResourceControllerV2)
+    global_tagging = factory.new_instance('GlobalTaggingV1')
+"""
+
+import importlib
+import threading
+from typing import Dict, Type, Union
+
+from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
+from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
+from ibm_cloud_sdk_core.utils import read_external_sources
+
+from . import _SERVICE_MODULES
+from .common import PlatformBaseService, credential_fingerprint
+from .session_factory import SessionFactory
+from .token_cache import DiskTokenCache
+
+# Maps the name of each service class that the factory can create to its module.
+_SERVICE_CLASS_MODULES = dict(_SERVICE_MODULES, ContextBasedRestrictionsV1='context_based_restrictions_v1')
+
+
+class ClientFactory:
+    """
+    ClientFactory creates service clients from the external configuration, in the same
+    way as the new_instance() method of each service class, but shares the
+    authenticator and the connection pools of the clients that use the same credential.
+    """
+
+    def __init__(self, *, session_factory: SessionFactory = None, token_cache: DiskTokenCache = None) -> None:
+        """
+        Initialize a ClientFactory object.
+        :param SessionFactory session_factory: (optional) The connection pools shared
+               by all the clients. By default the clients of each credential share a
+               SessionFactory with the default settings.
+        :param DiskTokenCache token_cache: (optional) The cache through which the
+               shared authenticators share their IAM tokens with other processes.
+        """
+        self.session_factory = session_factory
+        self.token_cache = token_cache
+        self._authenticators: Dict[str, Authenticator] = {}
+        self._session_factories: Dict[str, SessionFactory] = {}
+        self._lock = threading.Lock()
+
+    def new_instance(
+        self, service_class: Union[str, Type[PlatformBaseService]], *, service_name: str = None
+    ) -> PlatformBaseService:
+        """
+        Return a new instance of a service class, using external configuration.
+        :param service_class: The service class, e.g. `ResourceControllerV2`, or its name.
+        :param str service_name: (optional) The name of the service to configure;
+               defaults to the DEFAULT_SERVICE_NAME of the service class.
+        :rtype: PlatformBaseService
+        """
+        if isinstance(service_class, str):
+            service_class = self._load_service_class(service_class)
+        service_name = service_name or service_class.DEFAULT_SERVICE_NAME
+        fingerprint = credential_fingerprint(read_external_sources(service_name))
+        service = service_class(self._get_authenticator(fingerprint, service_name))
+        service.configure_service(service_name)
+        service.set_session_factory(self._get_session_factory(fingerprint))
+        return service
+
+    def get_authenticator(self, service_name: str) -> Authenticator:
+        """
+        Return the shared authenticator for the credential configured for `service_name`.
+        :rtype: Authenticator
+        """
+        return self._get_authenticator(credential_fingerprint(read_external_sources(service_name)), service_name)
+
+    def _get_authenticator(self, fingerprint: str, service_name: str) -> Authenticator:
+        with self._lock:
+            authenticator = self._authenticators.get(fingerprint)
+            if authenticator is None:
+                authenticator = get_authenticator_from_environment(service_name)
+                if authenticator is None:
+                    raise ValueError('No credentials are configured for service {0!r}'.format(service_name))
+                if self.token_cache is not None:
+                    self.token_cache.attach(authenticator, fingerprint)
+                self._authenticators[fingerprint] = authenticator
+            return authenticator
+
+    def _get_session_factory(self, fingerprint: str) -> SessionFactory:
+        if self.session_factory is not None:
+            return self.session_factory
+        with self._lock:
+            return self._session_factories.setdefault(fingerprint, SessionFactory())
+
+    @staticmethod
+    def _load_service_class(name: str) -> Type[PlatformBaseService]:
+        module = _SERVICE_CLASS_MODULES.get(name)
+        if module is None:
+            raise ValueError('Unknown service class: {0!r}'.format(name))
+        return getattr(importlib.import_module('.' + module, __package__), name)
+
+    def close(self) -> None:
+        """
+        Close the pooled connections of the clients created by this factory.
+        """
+        with self._lock:
+            session_factories = list(self._session_factories.values())
+        for session_factory in session_factories:
+            session_factory.close()
@@ -18,7 +18,23 @@
 This module provides common methods for use across all service modules.
 """
 
+import contextvars
+import functools
+import hashlib
+import inspect
 import platform
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from ibm_cloud_sdk_core import ApiException, BaseService, DetailedResponse
+from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
+from ibm_cloud_sdk_core.http_adapter import SSLHTTPAdapter
+from ibm_cloud_sdk_core.utils import read_external_sources, string_to_bool
+from requests.adapters import HTTPAdapter
+
+from .bulk import DEFAULT_MAX_WORKERS, BulkMap
+from .instrumentation import OperationRecord, get_observers, notify, start_attempt
+from .token_cache import DiskTokenCache
 from .version import __version__
 
 HEADER_NAME_USER_AGENT = 'User-Agent'
@@ -45,12 +61,270 @@ def get_user_agent():
 USER_AGENT = '{0}/{1} {2}'.format(SDK_NAME, __version__, get_system_info())
 
 
+# The operation ID of the request being built by the current thread (or task).
+_current_operation = contextvars.ContextVar('current_operation', default=None)
+# The time at which the current thread started building that request, if it is observed.
+_build_start = contextvars.ContextVar('build_start', default=None)
+
+
+def get_current_operation_id() -> Optional[str]:
+    """
+    Get the ID of the operation (e.g. `get_catalog_entry`) whose request was last
+    built by the current thread, as passed to get_sdk_headers().
+    """
+    return _current_operation.get()
+
+
 def get_sdk_headers(service_name, service_version, operation_id):
     # pylint: disable=unused-argument
 
     """
     Get the request headers to be sent in requests by the SDK
     """
+    _current_operation.set(operation_id)
+    if get_observers():
+        _build_start.set(time.perf_counter())
     headers = {}
     headers[HEADER_NAME_USER_AGENT] = get_user_agent()
     return headers
+
+
+# The external configuration properties that configure a service rather than its credential.
+_SERVICE_PROPERTIES = frozenset(
+    [
+        'URL',
+        'DISABLE_SSL',
+        'ENABLE_GZIP',
+        'ENABLE_RETRIES',
+        'MAX_RETRIES',
+        'RETRY_INTERVAL',
+        'TOKEN_CACHE',
+        'TOKEN_CACHE_DIR',
+    ]
+)
+
+
+def credential_fingerprint(config: Dict[str, str]) -> str:
+    """
+    Return a digest that identifies the credential described by the external
+    configuration of a service, as returned by read_external_sources().
+
+    Services configured with the same credential properties (e.g. `APIKEY` and
+    `AUTH_URL`) have the same fingerprint, whatever their service properties.
+    :param dict config: The external configuration of a service.
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    for (name, value) in sorted(config.items()):
+        if name not in _SERVICE_PROPERTIES:
+            digest.update('{0}={1}\n'.format(name, value).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PlatformBaseService(BaseService):
+    """
+    The base class of the service classes of this package.
+
+    Adds request interceptors to BaseService. An interceptor is a callable that is
+    invoked by send() for every request of the service:
+
+        def interceptor(service, operation_id, request, send, **kwargs) -> DetailedResponse
+
+    where `request` is the dict built by prepare_request() and `send(request, **kwargs)`
+    invokes the next interceptor, or BaseService.send() after the last one. An
+    interceptor can change the request, skip sending it by returning a
+    DetailedResponse, or handle the ApiException raised by `send`. Interceptors are
+    invoked in the order in which they were added; without interceptors, send() is
+    BaseService.send().
+
+    A service can also take its http adapter, and with it its connection pools, from a
+    session_factory.SessionFactory shared with other services, report its operations
+    to the observers of the instrumentation module, share the IAM tokens of its
+    authenticator with other processes through a token_cache.DiskTokenCache, and
+    apply an operation to many items at once with map().
+    """
+
+    def __init__(self, service_url: str = None, authenticator: Authenticator = None, **kwargs) -> None:
+        self._interceptors = ()
+        self._session_factory = None
+        BaseService.__init__(self, service_url=service_url, authenticator=authenticator, **kwargs)
+
+    def add_interceptor(self, interceptor: Callable[..., DetailedResponse]) -> None:
+        """
+        Add a request interceptor, which is invoked after the interceptors added before it.
+        """
+        self._interceptors = self._interceptors + (interceptor,)
+
+    def remove_interceptor(self, interceptor: Callable[..., DetailedResponse]) -> None:
+        """
+        Remove a request interceptor added by add_interceptor().
+        """
+        self._interceptors = tuple(i for i in self._interceptors if i is not interceptor)
+
+    def get_interceptors(self) -> tuple:
+        """
+        Get the request interceptors of this service, in the order in which they are invoked.
+        """
+        return self._interceptors
+
+    def map(
+        self,
+        operation_id: str,
+        items: Iterable,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        deadline: float = None,
+        **kwargs
+    ) -> BulkMap:
+        """
+        Apply an operation of this service to many items from a pool of worker threads.
+
+        For example, `service.map('get_resource_instance', ids, max_workers=32)`
+        invokes `service.get_resource_instance(id)` for each ID and returns a BulkMap,
+        which iterates over the response or exception of each ID in the order of the IDs.
+        Unless the service uses a session factory, its connection pool is enlarged to
+        `max_workers` connections.
+        The coroutine operations of the async clients (see aio) cannot be mapped.
+        :param str operation_id: The operation, e.g. `delete_resource_key`.
+        :param Iterable items: The items: each dict is passed as keyword arguments, and
+               any other item as the first positional argument of the operation.
+        :param int max_workers: (optional) The number of operations invoked at the same time.
+        :param float deadline: (optional) The number of seconds after which the remaining
+               items are returned with a TimeoutError; by default there is no deadline.
+        :param **kwargs: The keyword arguments passed to every invocation of the operation,
+               e.g. its `timeout`.
+        :rtype: BulkMap
+        """
+        operation = getattr(self, operation_id, None)
+        if operation_id.startswith('_') or hasattr(PlatformBaseService, operation_id) or not callable(operation):
+            raise ValueError('{0} is not an operation of {1}'.format(operation_id, type(self).__name__))
+        if inspect.iscoroutinefunction(operation):
+            # The worker threads would return the coroutines without awaiting them.
+            raise TypeError(
+                '{0} of {1} is a coroutine function: use map() of the synchronous client, '
+                'or asyncio.gather()'.format(operation_id, type(self).__name__)
+            )
+        adapter = self.http_adapter
+        if self._session_factory is None and getattr(adapter, '_pool_maxsize', max_workers) < max_workers:
+            adapter.poolmanager.clear()
+            adapter.init_poolmanager(adapter._pool_connections, max_workers)
+        return BulkMap(operation, items, max_workers=max_workers, deadline=deadline, **kwargs)
+
+    def set_session_factory(self, session_factory) -> None:
+        """
+        Send the requests of this service through the connection pools of `session_factory`.
+
+        The service keeps using the shared pools when its retry or SSL verification
+        settings change; services with the same settings share the same pools.
+        :param SessionFactory session_factory: The factory that owns the http adapters,
+               or None to go back to an http adapter of this service's own.
+        """
+        self._session_factory = session_factory
+        if session_factory is None:
+            self._mount_http_adapter(
+                SSLHTTPAdapter(max_retries=self.retry_config, _disable_ssl_verification=self.disable_ssl_verification)
+            )
+        else:
+            self._mount_shared_http_adapter()
+
+    def get_session_factory(self):
+        """
+        Get the SessionFactory whose connection pools are used by this service, if any.
+        """
+        return self._session_factory
+
+    def configure_service(self, service_name: str) -> None:
+        """
+        Look for external configuration of a service and set the service properties.
+
+        In addition to the properties of BaseService, `TOKEN_CACHE=true` shares the
+        IAM tokens of the authenticator through a token_cache.DiskTokenCache in the
+        `TOKEN_CACHE_DIR` directory, or in the default one.
+        :param str service_name: The service name.
+        """
+        BaseService.configure_service(self, service_name)
+        config = read_external_sources(service_name)
+        if string_to_bool(config.get('TOKEN_CACHE', 'false')):
+            DiskTokenCache(config.get('TOKEN_CACHE_DIR')).attach(self.authenticator, credential_fingerprint(config))
+
+    def enable_retries(self, max_retries: int = 4, retry_interval: float = 30.0) -> None:
+        """Enable automatic retries, keeping the shared connection pools of the service, if any."""
+        BaseService.enable_retries(self, max_retries=max_retries, retry_interval=retry_interval)
+        self._mount_shared_http_adapter()
+
+    def disable_retries(self):
+        """Disable automatic retries, keeping the shared connection pools of the service, if any."""
+        BaseService.disable_retries(self)
+        self._mount_shared_http_adapter()
+
+    def set_disable_ssl_verification(self, status: bool = False) -> None:
+        """Enable or disable SSL verification, keeping the shared connection pools of the service, if any."""
+        BaseService.set_disable_ssl_verification(self, status)
+        self._mount_shared_http_adapter()
+
+    def _mount_shared_http_adapter(self) -> None:
+        """Replace the http adapter of this service with the shared one of its session factory, if any."""
+        if self._session_factory is not None:
+            self._mount_http_adapter(
+                self._session_factory.get_adapter(
+                    retry_config=self.retry_config, disable_ssl_verification=self.disable_ssl_verification
+                )
+            )
+
+    def _mount_http_adapter(self, http_adapter: HTTPAdapter) -> None:
+        self.http_adapter = http_adapter
+        self.http_client.mount('http://', http_adapter)
+        self.http_client.mount('https://', http_adapter)
+
+    def send(self, request: dict, **kwargs) -> DetailedResponse:
+        if get_observers():
+            return self._send_observed(request, **kwargs)
+        interceptors = self._interceptors
+        if not interceptors:
+            return BaseService.send(self, request, **kwargs)
+        return self._intercept(interceptors, 0, get_current_operation_id(), None, request, **kwargs)
+
+    def _send_observed(self, request: dict, **kwargs) -> DetailedResponse:
+        """Send a request through the interceptors, recording its operation for the registered observers."""
+        start = time.perf_counter()
+        build_start = _build_start.get()
+        _build_start.set(None)
+        operation_id = get_current_operation_id()
+        record = OperationRecord(
+            self.DEFAULT_SERVICE_NAME, operation_id, None if build_start is None else start - build_start
+        )
+        notify('operation_started', record)
+        try:
+            response = self._intercept(self._interceptors, 0, operation_id, record, request, **kwargs)
+            record.status_code = response.get_status_code()
+            return response
+        except ApiException as error:
+            record.status_code = error.status_code
+            record.error = error
+            raise
+        except BaseException as error:
+            record.error = error
+            raise
+        finally:
+            record.duration = time.perf_counter() - start
+            notify('operation_finished', record)
+
+    def _intercept(
+        self,
+        interceptors: tuple,
+        index: int,
+        operation_id: str,
+        record: Optional[OperationRecord],
+        request: dict,
+        **kwargs
+    ):
+        if index == len(interceptors):
+            if record is None:
+                return BaseService.send(self, request, **kwargs)
+            attempt = start_attempt(record, kwargs)
+            try:
+                return BaseService.send(self, request, **kwargs)
+            finally:
+                attempt.finish()
+        send = functools.partial(self._intercept, interceptors, index + 1, operation_id, record)
+        return interceptors[index](self, operation_id, request, send, **kwargs)
@@ -0,0 +1,228 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides compact, lazily-decoded variants of the model classes.
+
+A compact model wraps the JSON dictionary of a response instead of copying it into
+instance attributes: from_dict() does no per-property work, instances have no
+`__dict__`, and datetime and nested-model properties are only decoded the first time
+they are read. Compact models are read-only views; use to_model() to get an instance of
+the regular model class.
+
+    CompactResourceInstance = compact_model_class(ResourceInstance)
+    instances = [CompactResourceInstance.from_dict(r) for r in result['resources']]
+"""
+
+import inspect
+import json
+import re
+import threading
+import typing
+from datetime import date, datetime
+from typing import Callable, Dict, Type
+
+from ibm_cloud_sdk_core.utils import string_to_date, string_to_datetime
+
+__all__ = ['CompactModel', 'compact_model_class']
+
+
+class _Property:
+    """Returns a property of a compact model as-is from its JSON dictionary."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance._dict.get(self.name)
+
+
+class _DecodedProperty:
+    """Decodes a property of a compact model on first access and caches the result."""
+
+    __slots__ = ('name', 'decode')
+
+    def __init__(self, name: str, decode: Callable) -> None:
+        self.name = name
+        self.decode = decode
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        decoded = instance._decoded
+        if decoded is None:
+            decoded = instance._decoded = {}
+        elif self.name in decoded:
+            return decoded[self.name]
+        value = instance._dict.get(self.name)
+        if value is not None:
+            value = self.decode(value)
+        decoded[self.name] = value
+        return value
+
+
+class CompactModel:
+    """
+    Common functionality shared by the compact model classes.
+
+    Subclasses are created by compact_model_class(); `_model_class` is the regular model
+    class that a compact model class stands in for.
+    """
+
+    __slots__ = ('_dict', '_decoded')
+
+    _model_class = None
+
+    def __init__(self, _dict: Dict) -> None:
+        self._dict = _dict
+        self._decoded = None
+
+    @classmethod
+    def from_dict(cls, _dict: Dict) -> 'CompactModel':
+        """Initialize a compact model from a json dictionary, without copying it."""
+        return cls(_dict)
+
+    @classmethod
+    def _from_dict(cls, _dict):
+        """Initialize a compact model from a json dictionary, without copying it."""
+        return cls.from_dict(_dict)
+
+    def to_dict(self) -> Dict:
+        """Return a json dictionary representing this model."""
+        return dict(self._dict)
+
+    def _to_dict(self):
+        """Return a json dictionary representing this model."""
+        return self.to_dict()
+
+    def to_model(self):
+        """Return an instance of the regular model class with the same properties."""
+        return self._model_class.from_dict(self._dict)
+
+    def __getattr__(self, name: str):
+        # Additional properties that are not declared by the model class.
+        if not name.startswith('_') and name in self._dict:
+            return self._dict[name]
+        raise AttributeError('{0!r} object has no attribute {1!r}'.format(type(self).__name__, name))
+
+    def __str__(self) -> str:
+        """Return a `str` version of this model."""
+        return json.dumps(self._dict, indent=2)
+
+    def __eq__(self, other: 'CompactModel') -> bool:
+        """Return `true` when self and other are equal, false otherwise."""
+        if not isinstance(other, self.__class__):
+            return False
+        return self._dict == other._dict
+
+    def __ne__(self, other: 'CompactModel') -> bool:
+        """Return `true` when self and other are not equal, false otherwise."""
+        return not self == other
+
+    def __reduce__(self):
+        return (_restore_compact_model, (self._model_class, self._dict))
+
+
+def _restore_compact_model(model_class: Type, _dict: Dict) -> CompactModel:
+    return compact_model_class(model_class)(_dict)
+
+
+def _list_decoder(decode: Callable) -> Callable:
+    return lambda values: [decode(v) for v in values]
+
+
+def _dict_decoder(decode: Callable) -> Callable:
+    return lambda values: {k: decode(v) for (k, v) in values.items()}
+
+
+def _decoder_for(hint) -> Callable:
+    """Return the function that decodes a json value of type `hint`, or None if it needs no decoding."""
+    origin = getattr(hint, '__origin__', None)
+    args = getattr(hint, '__args__', None) or ()
+    if origin is typing.Union:
+        # Before Python 3.11, get_type_hints() makes the parameters that default to None Optional.
+        args = [arg for arg in args if arg is not type(None)]
+        return _decoder_for(args[0]) if len(args) == 1 else None
+    if hint is datetime:
+        return string_to_datetime
+    if hint is date:
+        return string_to_date
+    if inspect.isclass(hint) and hasattr(hint, 'from_dict'):
+        return hint.from_dict
+    if origin is list and len(args) == 1:
+        decode = _decoder_for(args[0])
+        return _list_decoder(decode) if decode else None
+    if origin is dict and len(args) == 2:
+        decode = _decoder_for(args[1])
+        return _dict_decoder(decode) if decode else None
+    return None
+
+
+# Matches the statements of a generated from_dict() method that read a property, e.g.
+# "args['async_'] = _dict.get('async')", capturing the parameter name and the json key.
+_FROM_DICT_PROPERTY = re.compile(r"args\['(\w+)'\] = .*?_dict\.get\('([^']+)'\)")
+
+
+def _json_keys(model_class: Type) -> Dict[str, str]:
+    """Return the json key of each parameter of `model_class.__init__` whose key differs from its name."""
+    try:
+        source = inspect.getsource(model_class.from_dict)
+    except (OSError, TypeError):
+        # Without the source, assume the generator's convention for reserved words (e.g. `async_`).
+        return {}
+    return dict(_FROM_DICT_PROPERTY.findall(source))
+
+
+_compact_classes: Dict[type, type] = {}
+_compact_classes_lock = threading.Lock()
+
+
+def compact_model_class(model_class: Type) -> Type[CompactModel]:
+    """
+    Return the compact variant of a model class, creating it on first use.
+
+    The properties of the compact class are the parameters of `model_class.__init__`,
+    read from the same json keys as the from_dict() method of `model_class` reads them.
+    Properties annotated as `datetime`, `date`, a model class, or a list or dict of
+    model classes are decoded on first access, in the same way as the from_dict()
+    method of `model_class` decodes them; nested models are instances of the
+    regular model classes.
+
+    :param type model_class: A model class, e.g. `ResourceInstance`.
+    :return: A subclass of CompactModel named `Compact<ModelClass>`.
+    :rtype: type
+    """
+    with _compact_classes_lock:
+        compact_class = _compact_classes.get(model_class)
+        if compact_class is not None:
+            return compact_class
+        hints = typing.get_type_hints(model_class.__init__)
+        json_keys = _json_keys(model_class)
+        namespace = {'__slots__': (), '__doc__': model_class.__doc__, '_model_class': model_class}
+        for (name, parameter) in inspect.signature(model_class.__init__).parameters.items():
+            if name == 'self' or parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+                continue
+            key = json_keys.get(name, name.rstrip('_'))
+            decode = _decoder_for(hints.get(name))
+            namespace[name] = _DecodedProperty(key, decode) if decode else _Property(key)
+        compact_class = type('Compact' + model_class.__name__, (CompactModel,), namespace)
+        compact_class.__module__ = __name__
+        _compact_classes[model_class] = compact_class
+        return compact_class
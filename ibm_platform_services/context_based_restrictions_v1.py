@@ -31,19 +31,19 @@ from typing import Dict, List
 import json
 import sys
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse
+from ibm_cloud_sdk_core import DetailedResponse
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_model, datetime_to_string, string_to_datetime
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class ContextBasedRestrictionsV1(BaseService):
+class ContextBasedRestrictionsV1(PlatformBaseService):
     """The Context Based Restrictions V1 service."""
 
     DEFAULT_SERVICE_URL = 'https://cbr.cloud.ibm.com'
@@ -74,7 +74,7 @@ class ContextBasedRestrictionsV1(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Zones
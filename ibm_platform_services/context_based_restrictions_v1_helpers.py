@@ -0,0 +1,513 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides high-level helpers built on the context_based_restrictions V1 service.
+"""
+
+import ipaddress
+import re
+import socket
+import threading
+from bisect import bisect_right
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Pattern, Set, Tuple, Union
+
+from ibm_cloud_sdk_core import ApiException
+
+from .bulk import DEFAULT_MAX_WORKERS
+from .context_based_restrictions_v1 import ContextBasedRestrictionsV1, Resource, Rule, Zone, ZoneSummary
+
+IPAddress = Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+# The intervals of addresses of a zone: (IP version, first address, last address).
+_Interval = Tuple[int, int, int]
+
+_NO_ZONES: FrozenSet[str] = frozenset()
+
+
+def address_interval(address) -> Optional[_Interval]:
+    """
+    Return the interval of IP addresses of a zone address.
+    :param Address address: An AddressIPAddress, AddressIPAddressRange or AddressSubnet,
+           or the dict of one.
+    :return: (IP version, first address, last address), with the addresses as integers,
+             or None for the addresses that are not IP-based (`vpc` and `serviceRef`).
+    :rtype: Tuple[int, int, int]
+    """
+    if isinstance(address, dict):
+        (kind, value) = (address.get('type'), address.get('value'))
+    else:
+        (kind, value) = (address.type, getattr(address, 'value', None))
+    if kind == 'ipAddress':
+        ip = ipaddress.ip_address(value)
+        return (ip.version, int(ip), int(ip))
+    if kind == 'ipRange':
+        (first, last) = (ipaddress.ip_address(part.strip()) for part in value.split('-', 1))
+        if first.version != last.version or first > last:
+            raise ValueError('invalid IP address range: {0}'.format(value))
+        return (first.version, int(first), int(last))
+    if kind == 'subnet':
+        network = ipaddress.ip_network(value, strict=False)
+        return (network.version, int(network.network_address), int(network.broadcast_address))
+    return None
+
+
+def _ip_to_int(ip: IPAddress) -> Tuple[int, int]:
+    if not isinstance(ip, str):
+        return (ip.version, int(ip))
+    try:
+        return (4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big'))
+    except OSError:
+        pass
+    try:
+        return (6, int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), 'big'))
+    except OSError:
+        raise ValueError('{0!r} is not an IP address'.format(ip)) from None
+
+
+# The addresses of a zone in each IP version, as sorted disjoint half-open intervals [start, end).
+_Membership = Dict[int, List[Tuple[int, int]]]
+
+
+def _membership(included: Iterable[_Interval], excluded: Iterable[_Interval]) -> _Membership:
+    """Return the addresses of the included intervals that are in no excluded interval."""
+    membership = {}
+    for version in (4, 6):
+        merged = []
+        for (first, last) in sorted((f, l) for (v, f, l) in included if v == version):
+            if merged and first <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], last + 1)
+            else:
+                merged.append([first, last + 1])
+        for (first, last) in sorted((f, l) for (v, f, l) in excluded if v == version):
+            remaining = []
+            for (start, end) in merged:
+                if last < start or first >= end:
+                    remaining.append([start, end])
+                    continue
+                if start < first:
+                    remaining.append([start, first])
+                if last + 1 < end:
+                    remaining.append([last + 1, end])
+            merged = remaining
+        if merged:
+            membership[version] = [(start, end) for (start, end) in merged]
+    return membership
+
+
+class _Table:
+    """
+    The zones that contain the addresses of one IP version: `zones[i]` contains the
+    addresses from `starts[i]` up to `starts[i + 1]`, excluded.
+    """
+
+    __slots__ = ('starts', 'zones')
+
+    def __init__(self, starts: List[int], zones: List[FrozenSet[str]]) -> None:
+        self.starts = starts
+        self.zones = zones
+
+    def patch(self, zone_id: str, removed: List[Tuple[int, int]], added: List[Tuple[int, int]]) -> '_Table':
+        """Return a copy of the table with a zone removed from some intervals and added to others."""
+        table = _Table(list(self.starts), list(self.zones))
+        for (intervals, change) in ((removed, frozenset.difference), (added, frozenset.union)):
+            for (start, end) in intervals:
+                first = table._split(start)
+                last = table._split(end)
+                zones = table.zones
+                for index in range(first, last):
+                    zones[index] = change(zones[index], (zone_id,))
+                table._merge(last)
+                table._merge(first)
+        return table
+
+    def _split(self, address: int) -> int:
+        """Start an interval at `address`, and return its index."""
+        index = bisect_right(self.starts, address) - 1
+        if self.starts[index] == address:
+            return index
+        self.starts.insert(index + 1, address)
+        self.zones.insert(index + 1, self.zones[index])
+        return index + 1
+
+    def _merge(self, index: int) -> None:
+        """Merge the interval at `index` into the previous one if they have the same zones."""
+        if 0 < index < len(self.starts) and self.zones[index] == self.zones[index - 1]:
+            del self.starts[index]
+            del self.zones[index]
+
+
+class ZoneAddressIndex:
+    """
+    ZoneAddressIndex finds the network zones of the context-based restrictions
+    service that contain an IP address, without any request.
+
+    The `ipAddress`, `ipRange` and `subnet` addresses of the zones, less their
+    excluded addresses, are compiled into sorted tables of disjoint intervals of
+    IPv4 and IPv6 addresses, each mapped to the set of zones that contain it, so a
+    lookup is a binary search. `vpc` and `serviceRef` addresses are ignored.
+
+        index = ZoneAddressIndex()
+        index.refresh(cbr_service, account_id)
+        zone_ids = index.find_zones('169.23.56.234')
+
+    The tables are compiled on the first lookup. Updating or removing a zone
+    afterwards only parses the addresses of that zone and patches the intervals
+    they cover. The index can be read and updated from several threads.
+    """
+
+    def __init__(self, zones: Iterable[Union[Zone, ZoneSummary]] = ()) -> None:
+        """
+        Initialize a ZoneAddressIndex object.
+        :param Iterable[Zone] zones: (optional) The zones to index.
+        """
+        # The last modification time and the addresses of each zone.
+        self._zones: Dict[str, Tuple[object, _Membership]] = {}
+        self._tables: Optional[Dict[int, _Table]] = None
+        self._lock = threading.Lock()
+        for zone in zones:
+            self.update_zone(zone)
+
+    def __len__(self) -> int:
+        """Return the number of zones in the index."""
+        return len(self._zones)
+
+    def update_zone(self, zone: Union[Zone, ZoneSummary]) -> None:
+        """
+        Add a zone to the index, or replace it.
+        :param Zone zone: The zone. A ZoneSummary can be used when its address preview
+               has all its addresses, and it has no excluded addresses.
+        """
+        if isinstance(zone, ZoneSummary):
+            if len(zone.addresses_preview) < zone.address_count or zone.excluded_count:
+                raise ValueError('the summary of zone {0} does not have all its addresses'.format(zone.id))
+            (addresses, excluded) = (zone.addresses_preview, [])
+        else:
+            (addresses, excluded) = (zone.addresses, zone.excluded or [])
+        membership = _membership(
+            [i for i in map(address_interval, addresses) if i is not None],
+            [i for i in map(address_interval, excluded) if i is not None],
+        )
+        with self._lock:
+            previous = self._zones.get(zone.id)
+            self._zones[zone.id] = (zone.last_modified_at, membership)
+            self._patch(zone.id, previous[1] if previous is not None else {}, membership)
+
+    def remove_zone(self, zone_id: str) -> None:
+        """
+        Remove a zone from the index, if it is there.
+        :param str zone_id: The ID of the zone.
+        """
+        with self._lock:
+            previous = self._zones.pop(zone_id, None)
+            if previous is not None:
+                self._patch(zone_id, previous[1], {})
+
+    def _patch(self, zone_id: str, removed: _Membership, added: _Membership) -> None:
+        """Update the compiled tables, if any, for a zone whose addresses changed; called with the lock held."""
+        if self._tables is None or removed == added:
+            return
+        tables = dict(self._tables)
+        for version in set(removed) | set(added):
+            tables[version] = tables[version].patch(zone_id, removed.get(version, []), added.get(version, []))
+        self._tables = tables
+
+    def refresh(
+        self, client: ContextBasedRestrictionsV1, account_id: str, *, concurrency: int = DEFAULT_MAX_WORKERS
+    ) -> List[str]:
+        """
+        Bring the index up to date with the zones of an account.
+
+        The zones are listed, and only the zones that are new or were modified since
+        they were indexed are retrieved, in parallel; the zones that are no longer
+        listed are removed. A zone whose summary has all its addresses is not retrieved.
+        :param ContextBasedRestrictionsV1 client: The client used to list and get the zones.
+        :param str account_id: The ID of the account of the zones.
+        :param int concurrency: (optional) The number of zones retrieved at the same time.
+        :return: The IDs of the zones added, updated or removed.
+        :rtype: List[str]
+        """
+        summaries = [ZoneSummary.from_dict(z) for z in client.list_zones(account_id).get_result().get('zones', [])]
+        listed = {summary.id for summary in summaries}
+        changed = [zone_id for zone_id in list(self._zones) if zone_id not in listed]
+        for zone_id in changed:
+            self.remove_zone(zone_id)
+        stale = []
+        for summary in summaries:
+            entry = self._zones.get(summary.id)
+            if entry is not None and entry[0] == summary.last_modified_at:
+                continue
+            changed.append(summary.id)
+            if len(summary.addresses_preview) >= summary.address_count and not summary.excluded_count:
+                self.update_zone(summary)
+            else:
+                stale.append(summary.id)
+        with client.map('get_zone', stale, max_workers=concurrency) as results:
+            for result in results:
+                if isinstance(result.error, ApiException) and result.error.status_code == 404:
+                    # The zone was deleted after it was listed.
+                    self.remove_zone(result.item)
+                    continue
+                self.update_zone(Zone.from_dict(result.get_result()))
+        return changed
+
+    def find_zones(self, ip: IPAddress) -> FrozenSet[str]:
+        """
+        Return the IDs of the zones that contain an IP address.
+        :param str ip: The IPv4 or IPv6 address.
+        :rtype: FrozenSet[str]
+        """
+        (version, value) = _ip_to_int(ip)
+        tables = self._tables
+        if tables is None:
+            tables = self._build()
+        table = tables[version]
+        return table.zones[bisect_right(table.starts, value) - 1]
+
+    def _build(self) -> Dict[int, _Table]:
+        with self._lock:
+            if self._tables is None:
+                self._tables = self._compile(self._zones)
+            return self._tables
+
+    @staticmethod
+    def _compile(zones: Dict[str, Tuple[object, _Membership]]) -> Dict[int, _Table]:
+        tables = {}
+        # Identical sets of zones are shared between the intervals.
+        interned = {_NO_ZONES: _NO_ZONES}
+        for version in (4, 6):
+            # The boundaries of the intervals: (address, 1 if a zone starts there, else 0, zone).
+            boundaries = []
+            for (zone_id, (_, membership)) in zones.items():
+                for (start, end) in membership.get(version, ()):
+                    boundaries.append((start, 1, zone_id))
+                    boundaries.append((end, 0, zone_id))
+            boundaries.sort()
+            active = set()
+            starts = [0]
+            table_zones = [_NO_ZONES]
+            index = 0
+            while index < len(boundaries):
+                address = boundaries[index][0]
+                while index < len(boundaries) and boundaries[index][0] == address:
+                    (_, starting, zone_id) = boundaries[index]
+                    if starting:
+                        active.add(zone_id)
+                    else:
+                        active.discard(zone_id)
+                    index += 1
+                current = frozenset(active)
+                current = interned.setdefault(current, current)
+                if starts[-1] == address:
+                    table_zones[-1] = current
+                elif current is not table_zones[-1]:
+                    starts.append(address)
+                    table_zones.append(current)
+            tables[version] = _Table(starts, table_zones)
+        return tables
+
+
+# The resource attributes of a rule, from the most to the least selective; a rule
+# resource is indexed under its most selective attribute that has an exact value.
+RULE_ATTRIBUTE_SELECTIVITY = (
+    'serviceInstance',
+    'resource',
+    'resourceType',
+    'serviceName',
+    'serviceGroupId',
+    'serviceType',
+    'region',
+    'accountId',
+)
+
+_SELECTIVITY_RANK = {name: rank for (rank, name) in enumerate(RULE_ATTRIBUTE_SELECTIVITY)}
+# Attributes missing from RULE_ATTRIBUTE_SELECTIVITY rank just above `accountId`.
+_UNKNOWN_RANK = len(RULE_ATTRIBUTE_SELECTIVITY) - 1.5
+
+# The value of the operator of the attributes whose value can have `*` and `?` wildcards.
+_STRING_MATCH = 'stringMatch'
+
+
+def _matcher(value: str, operator: Optional[str]) -> Union[str, Pattern]:
+    """Return `value`, or the pattern it stands for when it has wildcards."""
+    if operator != _STRING_MATCH or ('*' not in value and '?' not in value):
+        return value
+    return re.compile(re.escape(value).replace(r'\*', '.*').replace(r'\?', '.'), re.DOTALL)
+
+
+def _matches(matcher: Union[str, Pattern], value: Optional[str]) -> bool:
+    if value is None:
+        return False
+    if isinstance(matcher, str):
+        return matcher == value
+    return matcher.fullmatch(value) is not None
+
+
+class _RuleResource:
+    """A resource of a rule, with the matchers of its attributes and tags."""
+
+    __slots__ = ('rule_id', 'attributes', 'tags', 'anchor')
+
+    def __init__(self, rule_id: str, resource: Resource) -> None:
+        self.rule_id = rule_id
+        self.attributes = tuple((a.name, _matcher(a.value, a.operator)) for a in resource.attributes)
+        self.tags = tuple((t.name, _matcher(t.value, t.operator)) for t in resource.tags or ())
+        # The most selective (name, value) attribute with an exact value, if any.
+        exact = [(name, matcher) for (name, matcher) in self.attributes if isinstance(matcher, str)]
+        self.anchor = min(exact, key=lambda item: _SELECTIVITY_RANK.get(item[0], _UNKNOWN_RANK)) if exact else None
+
+    def matches(self, attributes: Mapping[str, str], tags: Mapping[str, Tuple[str, ...]]) -> bool:
+        for (name, matcher) in self.attributes:
+            if not _matches(matcher, attributes.get(name)):
+                return False
+        for (name, matcher) in self.tags:
+            if not any(_matches(matcher, value) for value in tags.get(name, ())):
+                return False
+        return True
+
+
+def _tag_values(tags: Union[Mapping[str, str], Iterable[str], None]) -> Dict[str, Tuple[str, ...]]:
+    """Return the values of each tag name, from a dict or from `name:value` tags."""
+    if not tags:
+        return {}
+    if isinstance(tags, Mapping):
+        return {name: (value,) for (name, value) in tags.items()}
+    values: Dict[str, Tuple[str, ...]] = {}
+    for tag in tags:
+        (name, _, value) = tag.partition(':')
+        values[name] = values.get(name, ()) + (value,)
+    return values
+
+
+class RuleIndex:
+    """
+    RuleIndex finds the rules of the context-based restrictions service that apply
+    to a resource, without any request and without checking every rule.
+
+    A rule applies to a resource when one of its resources matches it: every
+    attribute (e.g. `serviceName`) and tag of the rule resource must match the
+    value of the resource, exactly or, with the `stringMatch` operator, with the
+    `*` and `?` wildcards. Each rule resource is indexed under its most selective
+    attribute with an exact value (see RULE_ATTRIBUTE_SELECTIVITY), so a query only
+    checks the rule resources indexed under the attributes of the resource, and
+    those without an exact attribute.
+
+        index = RuleIndex()
+        index.refresh(cbr_service, account_id)
+        rules = index.find_rules({'accountId': account_id, 'serviceName': 'cloud-object-storage',
+                                  'serviceInstance': instance_guid}, tags=['env:prod'])
+
+    The index can be read and updated from several threads.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = ()) -> None:
+        """
+        Initialize a RuleIndex object.
+        :param Iterable[Rule] rules: (optional) The rules to index.
+        """
+        self._rules: Dict[str, Rule] = {}
+        self._resources: Dict[str, List[_RuleResource]] = {}
+        self._anchored: Dict[Tuple[str, str], Set[_RuleResource]] = {}
+        self._unanchored: Set[_RuleResource] = set()
+        self._lock = threading.Lock()
+        for rule in rules:
+            self.update_rule(rule)
+
+    def __len__(self) -> int:
+        """Return the number of rules in the index."""
+        return len(self._rules)
+
+    def update_rule(self, rule: Rule) -> None:
+        """
+        Add a rule to the index, or replace it.
+        :param Rule rule: The rule.
+        """
+        resources = [_RuleResource(rule.id, resource) for resource in rule.resources]
+        with self._lock:
+            self._remove(rule.id)
+            self._rules[rule.id] = rule
+            self._resources[rule.id] = resources
+            for resource in resources:
+                if resource.anchor is None:
+                    self._unanchored.add(resource)
+                else:
+                    self._anchored.setdefault(resource.anchor, set()).add(resource)
+
+    def remove_rule(self, rule_id: str) -> None:
+        """
+        Remove a rule from the index, if it is there.
+        :param str rule_id: The ID of the rule.
+        """
+        with self._lock:
+            self._remove(rule_id)
+
+    def _remove(self, rule_id: str) -> None:
+        self._rules.pop(rule_id, None)
+        for resource in self._resources.pop(rule_id, ()):
+            if resource.anchor is None:
+                self._unanchored.discard(resource)
+                continue
+            bucket = self._anchored[resource.anchor]
+            bucket.discard(resource)
+            if not bucket:
+                del self._anchored[resource.anchor]
+
+    def refresh(self, client: ContextBasedRestrictionsV1, account_id: str, **list_params) -> List[str]:
+        """
+        Bring the index up to date with the rules of an account.
+
+        The rules are listed, and only the rules that are new or were modified since
+        they were indexed, according to their `last_modified_at`, are indexed again;
+        the rules that are no longer listed are removed.
+        :param ContextBasedRestrictionsV1 client: The client used to list the rules.
+        :param str account_id: The ID of the account of the rules.
+        :param **list_params: (optional) Any other parameters of the list_rules
+               operation, e.g. `service_name`.
+        :return: The IDs of the rules added, updated or removed.
+        :rtype: List[str]
+        """
+        listed = client.list_rules(account_id, **list_params).get_result().get('rules', [])
+        listed_ids = {rule['id'] for rule in listed}
+        changed = [rule_id for rule_id in list(self._rules) if rule_id not in listed_ids]
+        for rule_id in changed:
+            self.remove_rule(rule_id)
+        for data in listed:
+            rule = Rule.from_dict(data)
+            indexed = self._rules.get(rule.id)
+            if indexed is None or indexed.last_modified_at != rule.last_modified_at:
+                self.update_rule(rule)
+                changed.append(rule.id)
+        return changed
+
+    def find_rules(
+        self, attributes: Mapping[str, str], *, tags: Union[Mapping[str, str], Iterable[str]] = None
+    ) -> List[Rule]:
+        """
+        Return the rules that apply to a resource.
+        :param dict attributes: The attributes of the resource, e.g. `accountId`,
+               `serviceName`, `serviceInstance`, `region` or `resourceType`.
+        :param dict tags: (optional) The tags of the resource, as a dict, or as an
+               iterable of `name:value` strings.
+        :return: The rules, by ID.
+        :rtype: List[Rule]
+        """
+        tag_values = _tag_values(tags)
+        with self._lock:
+            candidates = list(self._unanchored)
+            for item in attributes.items():
+                candidates.extend(self._anchored.get(item, ()))
+            rule_ids = {c.rule_id for c in candidates if c.matches(attributes, tag_values)}
+            return [self._rules[rule_id] for rule_id in sorted(rule_ids)]
@@ -27,19 +27,20 @@ from enum import Enum
 from typing import Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse, get_query_param
+from ibm_cloud_sdk_core import DetailedResponse, get_query_param
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import datetime_to_string, string_to_datetime
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class EnterpriseBillingUnitsV1(BaseService):
+class EnterpriseBillingUnitsV1(PlatformBaseService):
     """The Enterprise Billing Units V1 service."""
 
     DEFAULT_SERVICE_URL = 'https://billing.cloud.ibm.com'
@@ -70,7 +71,7 @@ class EnterpriseBillingUnitsV1(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Billing Units
@@ -1178,11 +1179,14 @@ class TermCredits:
 ##############################################################################
 
 
-class BillingUnitsPager:
+class BillingUnitsPager(BasePager):
     """
     BillingUnitsPager can be used to simplify the use of the "list_billing_units" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = BillingUnit
+
     def __init__(
         self,
         *,
@@ -1255,11 +1259,14 @@ class BillingUnitsPager:
         return results
 
 
-class BillingOptionsPager:
+class BillingOptionsPager(BasePager):
     """
     BillingOptionsPager can be used to simplify the use of the "list_billing_options" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = BillingOption
+
     def __init__(
         self,
         *,
@@ -27,19 +27,20 @@ from datetime import datetime
 from typing import Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse, get_query_param
+from ibm_cloud_sdk_core import DetailedResponse, get_query_param
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_model, datetime_to_string, string_to_datetime
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class EnterpriseManagementV1(BaseService):
+class EnterpriseManagementV1(PlatformBaseService):
     """The Enterprise Management V1 service."""
 
     DEFAULT_SERVICE_URL = 'https://enterprise.cloud.ibm.com/v1'
@@ -70,7 +71,7 @@ class EnterpriseManagementV1(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Enterprise Operations
@@ -1896,11 +1897,14 @@ class ListEnterprisesResponse:
 ##############################################################################
 
 
-class EnterprisesPager:
+class EnterprisesPager(BasePager):
     """
     EnterprisesPager can be used to simplify the use of the "list_enterprises" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = Enterprise
+
     def __init__(
         self,
         *,
@@ -1975,11 +1979,14 @@ class EnterprisesPager:
         return results
 
 
-class AccountsPager:
+class AccountsPager(BasePager):
     """
     AccountsPager can be used to simplify the use of the "list_accounts" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = Account
+
     def __init__(
         self,
         *,
@@ -2061,11 +2068,14 @@ class AccountsPager:
         return results
 
 
-class AccountGroupsPager:
+class AccountGroupsPager(BasePager):
     """
     AccountGroupsPager can be used to simplify the use of the "list_account_groups" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = AccountGroup
+
     def __init__(
         self,
         *,
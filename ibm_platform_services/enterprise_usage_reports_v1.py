@@ -26,18 +26,19 @@ from enum import Enum
 from typing import Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse, get_query_param
+from ibm_cloud_sdk_core import DetailedResponse, get_query_param
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class EnterpriseUsageReportsV1(BaseService):
+class EnterpriseUsageReportsV1(PlatformBaseService):
     """The Enterprise Usage Reports V1 service."""
 
     DEFAULT_SERVICE_URL = 'https://enterprise.cloud.ibm.com'
@@ -68,7 +69,7 @@ class EnterpriseUsageReportsV1(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Enterprise Usage Reports
@@ -878,11 +879,14 @@ class ResourceUsageReport:
 ##############################################################################
 
 
-class GetResourceUsageReportPager:
+class GetResourceUsageReportPager(BasePager):
     """
     GetResourceUsageReportPager can be used to simplify the use of the "get_resource_usage_report" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ResourceUsageReport
+
     def __init__(
         self,
         *,
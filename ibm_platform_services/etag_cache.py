@@ -0,0 +1,200 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides a cache of the ETags of resources, for the operations that
+replace or update a resource only if it has not changed since it was read.
+
+An ETagCache is a request interceptor (see common.PlatformBaseService) that records
+the ETag of every resource it sees in a response, and sends it in the `If-Match`
+header of the operations called with `if_match=CACHED_ETAG`:
+
+    etags = ETagCache()
+    cbr_service.add_interceptor(etags)
+    zone = cbr_service.get_zone(zone_id).get_result()
+    ...
+    cbr_service.replace_zone(zone_id, if_match=CACHED_ETAG, name=zone['name'], ...)
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from ibm_cloud_sdk_core import ApiException, DetailedResponse
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_CONFLICTS = 0
+
+# The `if_match` value that stands for the cached ETag of the resource. It is not a
+# valid ETag, so a service without an ETagCache fails the request with a 412 error.
+CACHED_ETAG = '"ibm-platform-services-cached-etag"'
+
+# The request headers that do not apply to the GET request of a resource.
+_BODY_HEADERS = frozenset(['if-match', 'content-type', 'content-encoding'])
+
+
+class ETagCache:
+    """
+    ETagCache keeps the ETags of the resources returned by the operations of a
+    service, e.g. `create_zone`, `get_zone` and `replace_zone`.
+
+    The ETag of a response is cached under the URL of its resource: the URL of the
+    request, or, for a POST request that creates a resource, the URL of the request
+    followed by the `id` of the result. A request sent with `If-Match: CACHED_ETAG`
+    gets the cached ETag of its URL instead, so replacing a resource read or written
+    before costs one request. The current ETag is read with a GET request of the URL
+    when none is cached.
+
+    A request that fails with `412 Precondition Failed`, because the resource was
+    modified since its ETag was cached, raises the ApiException, so the concurrent
+    modification is not overwritten. With an `on_conflict` callback, the current
+    resource is read instead, and the request is sent again with the body returned
+    by `on_conflict(operation_id, current, body)`, up to `max_conflicts` times; e.g.
+    a callback that adds the addresses of the request to those of the current zone.
+
+    The ETags of the resources deleted, or not found, are removed; the least recently
+    used ETags are evicted beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_conflicts: int = DEFAULT_MAX_CONFLICTS,
+        on_conflict: Callable[[str, dict, Optional[dict]], dict] = None,
+    ) -> None:
+        """
+        Initialize an ETagCache object.
+        :param int max_entries: (optional) The maximum number of cached ETags.
+        :param int max_conflicts: (optional) The number of times a request sent with
+               the cached ETag is sent again after a 412 error; requires `on_conflict`.
+        :param Callable on_conflict: (optional) The function that returns the JSON body
+               of the request sent again, from the operation ID, the current resource
+               and the JSON body of the request that failed.
+        """
+        if max_conflicts and on_conflict is None:
+            raise ValueError('max_conflicts requires an on_conflict callback that rebuilds the request body')
+        self.max_entries = max_entries
+        self.max_conflicts = max_conflicts
+        self.on_conflict = on_conflict
+        self.hits = 0
+        self.misses = 0
+        self.conflicts = 0
+        self._etags = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Get the cached ETag of a resource.
+        :param str url: The URL of the resource.
+        :rtype: str
+        """
+        with self._lock:
+            etag = self._etags.get(url)
+            if etag is not None:
+                self._etags.move_to_end(url)
+            return etag
+
+    def put(self, url: str, etag: str) -> None:
+        """
+        Cache the ETag of a resource.
+        :param str url: The URL of the resource.
+        :param str etag: The ETag.
+        """
+        with self._lock:
+            self._etags[url] = etag
+            self._etags.move_to_end(url)
+            while len(self._etags) > self.max_entries:
+                self._etags.popitem(last=False)
+
+    def remove(self, url: str) -> None:
+        """
+        Remove the cached ETag of a resource, if any.
+        :param str url: The URL of the resource.
+        """
+        with self._lock:
+            self._etags.pop(url, None)
+
+    def __len__(self) -> int:
+        return len(self._etags)
+
+    def __call__(self, service, operation_id: str, request: dict, send, **kwargs) -> DetailedResponse:
+        if request['headers'].get('If-Match') == CACHED_ETAG:
+            return self._send_conditional(operation_id, request, send, kwargs)
+        return self._send(request, send, kwargs)
+
+    def _send(self, request: dict, send, kwargs: dict) -> DetailedResponse:
+        url = request['url']
+        try:
+            response = send(request, **kwargs)
+        except ApiException as error:
+            if error.status_code in (404, 410, 412):
+                self.remove(url)
+            raise
+        method = request['method']
+        if method == 'DELETE':
+            self.remove(url)
+            return response
+        etag = response.get_headers().get('ETag') if response.get_headers() is not None else None
+        if etag is None:
+            return response
+        if method == 'POST':
+            result = response.get_result()
+            if not isinstance(result, dict) or 'id' not in result:
+                return response
+            url = '{0}/{1}'.format(url.rstrip('/'), result['id'])
+        self.put(url, etag)
+        return response
+
+    def _send_conditional(self, operation_id: str, request: dict, send, kwargs: dict) -> DetailedResponse:
+        url = request['url']
+        with self._lock:
+            etag = self._etags.get(url)
+            if etag is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._etags.move_to_end(url)
+        if etag is None:
+            etag = self._etag(self._read(request, send, kwargs), url)
+        conflicts = 0
+        while True:
+            request['headers']['If-Match'] = etag
+            try:
+                return self._send(request, send, kwargs)
+            except ApiException as error:
+                if error.status_code != 412 or conflicts == self.max_conflicts:
+                    raise
+            conflicts += 1
+            with self._lock:
+                self.conflicts += 1
+            current = self._read(request, send, kwargs)
+            etag = self._etag(current, url)
+            body = json.loads(request['data']) if request.get('data') is not None else None
+            request['data'] = json.dumps(self.on_conflict(operation_id, current.get_result(), body))
+
+    def _read(self, request: dict, send, kwargs: dict) -> DetailedResponse:
+        """Read the current resource of a request with a GET request of its URL."""
+        headers = {k: v for (k, v) in request['headers'].items() if k.lower() not in _BODY_HEADERS}
+        return self._send(dict(request, method='GET', headers=headers, data=None, files=[]), send, kwargs)
+
+    @staticmethod
+    def _etag(response: DetailedResponse, url: str) -> str:
+        etag = response.get_headers().get('ETag')
+        if etag is None:
+            raise ValueError('the resource at {0} has no ETag'.format(url))
+        return etag
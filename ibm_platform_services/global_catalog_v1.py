@@ -31,19 +31,19 @@ from enum import Enum
 from typing import BinaryIO, Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse
+from ibm_cloud_sdk_core import DetailedResponse
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_model, datetime_to_string, string_to_datetime
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class GlobalCatalogV1(BaseService):
+class GlobalCatalogV1(PlatformBaseService):
     """The Global Catalog V1 service."""
 
     DEFAULT_SERVICE_URL = 'https://globalcatalog.cloud.ibm.com/api/v1'
@@ -74,7 +74,7 @@ class GlobalCatalogV1(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/master/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Object
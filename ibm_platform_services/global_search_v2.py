@@ -34,19 +34,20 @@ from enum import Enum
 from typing import Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse
+from ibm_cloud_sdk_core import DetailedResponse
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_list
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class GlobalSearchV2(BaseService):
+class GlobalSearchV2(PlatformBaseService):
     """The global_search V2 service."""
 
     DEFAULT_SERVICE_URL = 'https://api.global-search-tagging.cloud.ibm.com'
@@ -77,7 +78,7 @@ class GlobalSearchV2(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Search
@@ -451,3 +452,130 @@ class ScanResult:
     def __ne__(self, other: 'ScanResult') -> bool:
         """Return `true` when self and other are not equal, false otherwise."""
         return not self == other
+
+
+##############################################################################
+# Pagers
+##############################################################################
+
+
+class SearchPager(BasePager):
+    """
+    SearchPager can be used to simplify the use of the "search" method.
+    """
+
+    # The model class of the results returned by the pager
+    _model_class = ResultItem
+
+    def __init__(
+        self,
+        *,
+        client: GlobalSearchV2,
+        query: str = None,
+        fields: List[str] = None,
+        transaction_id: str = None,
+        account_id: str = None,
+        limit: int = None,
+        timeout: int = None,
+        sort: List[str] = None,
+        is_deleted: str = None,
+        is_reclaimed: str = None,
+        is_public: str = None,
+        impersonate_user: str = None,
+        can_tag: str = None,
+    ) -> None:
+        """
+        Initialize a SearchPager object.
+        :param str query: (optional) The Lucene-formatted query string. Default to
+               '*' if not set.
+        :param List[str] fields: (optional) The list of the fields returned by the
+               search. For all queries, `crn` is always returned.
+        :param str transaction_id: (optional) An alphanumeric string that can be
+               used to trace a request across services.
+        :param str account_id: (optional) The account ID to filter resources.
+        :param int limit: (optional) The maximum number of hits to return. Defaults
+               to 10.
+        :param int timeout: (optional) A search timeout in milliseconds.
+        :param List[str] sort: (optional) Comma separated properties names that are
+               used for sorting.
+        :param str is_deleted: (optional) Determines if deleted documents should be
+               included in result set or not.
+        :param str is_reclaimed: (optional) Determines if reclaimed documents
+               should be included in result set or not.
+        :param str is_public: (optional) Determines if public resources should be
+               included in result set or not.
+        :param str impersonate_user: (optional) The user on whose behalf the search
+               must be performed.
+        :param str can_tag: (optional) Determines if the result set must return the
+               resources that the user can tag or the resources that the user can view.
+        """
+        self._has_next = True
+        self._client = client
+        self._page_context = {'next': None}
+        self._query = query
+        self._fields = fields
+        self._transaction_id = transaction_id
+        self._account_id = account_id
+        self._limit = limit
+        self._timeout = timeout
+        self._sort = sort
+        self._is_deleted = is_deleted
+        self._is_reclaimed = is_reclaimed
+        self._is_public = is_public
+        self._impersonate_user = impersonate_user
+        self._can_tag = can_tag
+
+    def has_next(self) -> bool:
+        """
+        Returns true if there are potentially more results to be retrieved.
+        """
+        return self._has_next
+
+    def get_next(self) -> List[dict]:
+        """
+        Returns the next page of results.
+        :return: A List[dict], where each element is a dict that represents an instance of ResultItem.
+        :rtype: List[dict]
+        """
+        if not self.has_next():
+            raise StopIteration('No more results available')
+
+        result = self._client.search(
+            query=self._query,
+            fields=self._fields,
+            search_cursor=self._page_context.get('next'),
+            transaction_id=self._transaction_id,
+            account_id=self._account_id,
+            limit=self._limit,
+            timeout=self._timeout,
+            sort=self._sort,
+            is_deleted=self._is_deleted,
+            is_reclaimed=self._is_reclaimed,
+            is_public=self._is_public,
+            impersonate_user=self._impersonate_user,
+            can_tag=self._can_tag,
+        ).get_result()
+
+        items = result.get('items')
+        next = result.get('search_cursor')
+        # An empty array of items signals the end of the result set.
+        if not items:
+            next = None
+        self._page_context['next'] = next
+        if next is None:
+            self._has_next = False
+
+        return items or []
+
+    def get_all(self) -> List[dict]:
+        """
+        Returns all results by invoking get_next() repeatedly
+        until all pages of results have been retrieved.
+        :return: A List[dict], where each element is a dict that represents an instance of ResultItem.
+        :rtype: List[dict]
+        """
+        results = []
+        while self.has_next():
+            next_page = self.get_next()
+            results.extend(next_page)
+        return results
@@ -0,0 +1,251 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides high-level helpers built on the global_search V2 service.
+"""
+
+from typing import Dict, Iterable, Iterator, List
+
+from .global_search_v2 import GlobalSearchV2, ResultItem, SearchPager
+from .pagination import DEFAULT_MAX_WORKERS, iter_pages_concurrently
+
+# The facets that can be used to split a query into disjoint sub-queries.
+PARTITION_FIELDS = frozenset(['type', 'region', 'resource_group_id'])
+
+DEFAULT_CRN_BATCH_SIZE = 100
+DEFAULT_MAX_QUERY_LENGTH = 16000
+# The largest `limit` accepted by the search operation.
+MAX_SEARCH_LIMIT = 1000
+
+
+def quote_query_value(value: str) -> str:
+    """
+    Return `value` as a quoted Lucene phrase, escaping backslashes and double quotes.
+    """
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class ParallelSearchScanner:
+    """
+    ParallelSearchScanner scans all the resources that match a query by splitting the
+    query into disjoint sub-queries and paging through the sub-queries in parallel.
+
+    The query is split on the values of a facet (`type`, `region` or
+    `resource_group_id`): one sub-query per value, plus one sub-query for the resources
+    that match none of the values, so the sub-queries together return every resource
+    matched by the original query. The results of the sub-queries are merged and
+    deduplicated by CRN.
+
+        scanner = ParallelSearchScanner(client, max_concurrency=8)
+        for item in scanner.scan('family:resource_controller', partition_field='region',
+                                 partition_values=['us-south', 'us-east', 'eu-de'],
+                                 fields=['crn', 'name'], limit=1000):
+            ...
+    """
+
+    def __init__(self, client: GlobalSearchV2, *, max_concurrency: int = DEFAULT_MAX_WORKERS) -> None:
+        """
+        Initialize a ParallelSearchScanner object.
+        :param GlobalSearchV2 client: The client used to call the search operation.
+        :param int max_concurrency: (optional) The maximum number of search requests
+               that are sent at the same time.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be a positive integer')
+        self.client = client
+        self.max_concurrency = max_concurrency
+
+    @staticmethod
+    def partition_queries(query: str, partition_field: str, partition_values: List[str]) -> List[str]:
+        """
+        Split `query` into disjoint sub-queries on the values of `partition_field`.
+        :param str query: The Lucene-formatted query string.
+        :param str partition_field: The facet used to split the query; one of
+               `type`, `region` or `resource_group_id`.
+        :param List[str] partition_values: The values of the facet that get their own
+               sub-query.
+        :return: One sub-query per distinct value, followed by the sub-query for the
+                 resources that match none of the values.
+        :rtype: List[str]
+        """
+        if partition_field not in PARTITION_FIELDS:
+            raise ValueError('partition_field must be one of: {0}'.format(', '.join(sorted(PARTITION_FIELDS))))
+        if not partition_values:
+            raise ValueError('partition_values must not be empty')
+        base = '({0})'.format(query or '*')
+        terms = ['{0}:{1}'.format(partition_field, quote_query_value(v)) for v in dict.fromkeys(partition_values)]
+        queries = ['{0} AND {1}'.format(base, term) for term in terms]
+        queries.append('{0} AND NOT ({1})'.format(base, ' OR '.join(terms)))
+        return queries
+
+    def scan(
+        self,
+        query: str = '*',
+        *,
+        partition_field: str = 'type',
+        partition_values: List[str],
+        fields: List[str] = None,
+        **search_params,
+    ) -> Iterator[ResultItem]:
+        """
+        Return a generator that yields every resource matched by `query`.
+
+        Resources are yielded as the pages of the sub-queries arrive, so the order is
+        not deterministic. Each CRN is yielded at most once.
+        :param str query: (optional) The Lucene-formatted query string.
+        :param str partition_field: (optional) The facet used to split the query.
+        :param List[str] partition_values: The values of the facet that get their own
+               sub-query.
+        :param List[str] fields: (optional) The list of the fields returned by the
+               search. `crn` is always returned.
+        :param **search_params: (optional) Any other parameters of the search
+               operation, e.g. `account_id` or `limit`.
+        :rtype: Iterator[ResultItem]
+        """
+        pagers = [
+            SearchPager(client=self.client, query=sub_query, fields=fields, **search_params)
+            for sub_query in self.partition_queries(query, partition_field, partition_values)
+        ]
+        seen = set()
+        for page in iter_pages_concurrently(pagers, max_workers=self.max_concurrency):
+            for item in page:
+                crn = item.get('crn')
+                if crn in seen:
+                    continue
+                seen.add(crn)
+                yield ResultItem.from_dict(item)
+
+    def scan_all(self, query: str = '*', **kwargs) -> List[ResultItem]:
+        """
+        Return every resource matched by `query`; accepts the same arguments as scan().
+        :rtype: List[ResultItem]
+        """
+        return list(self.scan(query, **kwargs))
+
+
+class CrnResolver:
+    """
+    CrnResolver resolves many CRNs to their resources with a few search requests.
+
+    The CRNs are packed into queries of the form `crn:"<crn 1>" OR crn:"<crn 2>" ...`
+    of at most `batch_size` CRNs and `max_query_length` characters, and the queries
+    are sent in parallel, so resolving 10,000 CRNs takes 100 requests rather than
+    10,000 calls of an operation such as `get_resource_instance`:
+
+        resolver = CrnResolver(client, max_concurrency=8)
+        resources = resolver.resolve(crns, fields=['name', 'tags', 'resource_group_id'])
+    """
+
+    def __init__(
+        self,
+        client: GlobalSearchV2,
+        *,
+        batch_size: int = DEFAULT_CRN_BATCH_SIZE,
+        max_query_length: int = DEFAULT_MAX_QUERY_LENGTH,
+        max_concurrency: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        """
+        Initialize a CrnResolver object.
+        :param GlobalSearchV2 client: The client used to call the search operation.
+        :param int batch_size: (optional) The maximum number of CRNs in a query; at
+               most MAX_SEARCH_LIMIT.
+        :param int max_query_length: (optional) The maximum length of a query, unless
+               it has a single CRN.
+        :param int max_concurrency: (optional) The maximum number of search requests
+               that are sent at the same time.
+        """
+        if not 1 <= batch_size <= MAX_SEARCH_LIMIT:
+            raise ValueError('batch_size must be between 1 and {0}'.format(MAX_SEARCH_LIMIT))
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be a positive integer')
+        self.client = client
+        self.batch_size = batch_size
+        self.max_query_length = max_query_length
+        self.max_concurrency = max_concurrency
+
+    def batch_queries(self, crns: Iterable[str]) -> List[str]:
+        """
+        Pack distinct CRNs into queries that match them.
+        :param Iterable[str] crns: The CRNs.
+        :rtype: List[str]
+        """
+        return [' OR '.join(terms) for terms in self._batches(crns)]
+
+    def _batches(self, crns: Iterable[str]) -> List[List[str]]:
+        """Return the query terms of the distinct CRNs, in batches of at most `batch_size` terms."""
+        batches = []
+        terms = []
+        length = 0
+        for crn in dict.fromkeys(crns):
+            term = 'crn:' + quote_query_value(crn)
+            if terms and (len(terms) == self.batch_size or length + 4 + len(term) > self.max_query_length):
+                batches.append(terms)
+                terms = []
+                length = 0
+            length += len(term) + (4 if terms else 0)
+            terms.append(term)
+        if terms:
+            batches.append(terms)
+        return batches
+
+    def resolve(self, crns: Iterable[str], *, fields: List[str] = None, **search_params) -> Dict[str, ResultItem]:
+        """
+        Return the resources of `crns`, by CRN.
+
+        The CRNs of the resources that are not found, or not accessible by the client,
+        are missing from the map. The ApiException of a failed search is raised.
+        :param Iterable[str] crns: The CRNs.
+        :param List[str] fields: (optional) The list of the fields returned by the
+               search, to keep the responses small. `crn` is always returned.
+        :param **search_params: (optional) Any other parameters of the search
+               operation, e.g. `account_id` or `is_deleted`.
+        :return: The ResultItem of each CRN found.
+        :rtype: Dict[str, ResultItem]
+        """
+        wanted = dict.fromkeys(crns)
+        limit = search_params.setdefault('limit', self.batch_size)
+        batches = self._batches(wanted)
+        resources = {}
+        # The parameters are part of each item, so none of them is taken by map() itself.
+        queries = [{'query': ' OR '.join(terms), 'fields': fields, **search_params} for terms in batches]
+        with self.client.map('search', queries, max_workers=self.max_concurrency) as results:
+            for result in results:
+                page = result.get_result()
+                found = self._collect(page, wanted, resources)
+                # A full page is followed by others while some CRNs of the batch are not found yet,
+                # e.g. when the limit is below the batch size.
+                while (
+                    found < len(batches[result.index])
+                    and len(page.get('items') or []) >= limit
+                    and page.get('search_cursor')
+                ):
+                    page = self.client.search(
+                        query=result.item['query'], fields=fields, search_cursor=page['search_cursor'], **search_params
+                    ).get_result()
+                    found += self._collect(page, wanted, resources)
+        return resources
+
+    @staticmethod
+    def _collect(page: dict, wanted: dict, resources: Dict[str, ResultItem]) -> int:
+        """Add the wanted resources of a page to `resources`, and return their number."""
+        found = 0
+        for item in page.get('items') or []:
+            crn = item.get('crn')
+            if crn in wanted:
+                resources[crn] = ResultItem.from_dict(item)
+                found += 1
+        return found
@@ -29,23 +29,27 @@ form `key:value`.
 API Version: 1.2.0
 """
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Dict, List
 import json
+import weakref
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse
+from ibm_cloud_sdk_core import DetailedResponse
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_list, convert_model
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import DEFAULT_MAX_WORKERS, BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class GlobalTaggingV1(BaseService):
+class GlobalTaggingV1(PlatformBaseService):
     """The global_tagging V1 service."""
 
     DEFAULT_SERVICE_URL = 'https://tags.global-search-tagging.cloud.ibm.com'
@@ -76,7 +80,7 @@ class GlobalTaggingV1(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # tags
@@ -97,7 +101,7 @@ class GlobalTaggingV1(BaseService):
         timeout: int = None,
         order_by_name: str = None,
         attached_only: bool = None,
-        **kwargs
+        **kwargs,
     ) -> DetailedResponse:
         """
         Get all tags.
@@ -185,7 +189,7 @@ class GlobalTaggingV1(BaseService):
         transaction_id: str = None,
         account_id: str = None,
         tag_type: str = None,
-        **kwargs
+        **kwargs,
     ) -> DetailedResponse:
         """
         Create an access management tag.
@@ -254,7 +258,7 @@ class GlobalTaggingV1(BaseService):
         impersonate_user: str = None,
         account_id: str = None,
         tag_type: str = None,
-        **kwargs
+        **kwargs,
     ) -> DetailedResponse:
         """
         Delete all unused tags.
@@ -314,7 +318,7 @@ class GlobalTaggingV1(BaseService):
         impersonate_user: str = None,
         account_id: str = None,
         tag_type: str = None,
-        **kwargs
+        **kwargs,
     ) -> DetailedResponse:
         """
         Delete an unused tag.
@@ -383,7 +387,7 @@ class GlobalTaggingV1(BaseService):
         impersonate_user: str = None,
         account_id: str = None,
         tag_type: str = None,
-        **kwargs
+        **kwargs,
     ) -> DetailedResponse:
         """
         Attach tags.
@@ -459,7 +463,7 @@ class GlobalTaggingV1(BaseService):
         impersonate_user: str = None,
         account_id: str = None,
         tag_type: str = None,
-        **kwargs
+        **kwargs,
     ) -> DetailedResponse:
         """
         Detach tags.
@@ -1415,3 +1419,175 @@ class TagResultsItem:
     def __ne__(self, other: 'TagResultsItem') -> bool:
         """Return `true` when self and other are not equal, false otherwise."""
         return not self == other
+
+
+##############################################################################
+# Pagers
+##############################################################################
+
+
+class TagsPager(BasePager):
+    """
+    TagsPager can be used to simplify the use of the "list_tags" method.
+
+    The first page is retrieved on its own to learn the `total_count` of tags; the
+    remaining offset windows are then retrieved concurrently by up to `max_workers`
+    threads, while get_next() still returns the pages in order. Call close() (or use
+    the pager as a context manager) to stop when the remaining pages are not needed;
+    the worker threads of a pager dropped before its last page are also released.
+    """
+
+    # The model class of the results returned by the pager
+    _model_class = Tag
+
+    def __init__(
+        self,
+        *,
+        client: GlobalTaggingV1,
+        transaction_id: str = None,
+        impersonate_user: str = None,
+        account_id: str = None,
+        tag_type: str = None,
+        full_data: bool = None,
+        providers: List[str] = None,
+        attached_to: str = None,
+        limit: int = None,
+        timeout: int = None,
+        order_by_name: str = None,
+        attached_only: bool = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        """
+        Initialize a TagsPager object.
+        :param str transaction_id: (optional) An alphanumeric string that can be
+               used to trace a request across services.
+        :param str impersonate_user: (optional) The user on whose behalf the get
+               operation must be performed (_for administrators only_).
+        :param str account_id: (optional) The ID of the billing account to list the
+               tags for.
+        :param str tag_type: (optional) The type of the tag you want to list.
+               Supported values are `user`, `service` and `access`.
+        :param bool full_data: (optional) If set to `true`, this query returns the
+               provider, `ghost`, `ims` or `ghost,ims`, where the tag exists and the
+               number of attached resources.
+        :param List[str] providers: (optional) Select a provider. Supported values
+               are `ghost` and `ims`.
+        :param str attached_to: (optional) If you want to return only the list of
+               tags that are attached to a specified resource, pass the ID of the resource
+               on this parameter.
+        :param int limit: (optional) The number of tags to return per page.
+        :param int timeout: (optional) The timeout in milliseconds, bounds the
+               request to run within the specified time value.
+        :param str order_by_name: (optional) Order the output by tag name.
+        :param bool attached_only: (optional) Filter on attached tags.
+        :param int max_workers: (optional) The maximum number of pages that are
+               retrieved at the same time.
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be a positive integer')
+        self._has_next = True
+        self._client = client
+        self._page_context = {'next': 0}
+        self._transaction_id = transaction_id
+        self._impersonate_user = impersonate_user
+        self._account_id = account_id
+        self._tag_type = tag_type
+        self._full_data = full_data
+        self._providers = providers
+        self._attached_to = attached_to
+        self._limit = limit
+        self._timeout = timeout
+        self._order_by_name = order_by_name
+        self._attached_only = attached_only
+        self._max_workers = max_workers
+        self._executor = None
+        self._shutdown = None
+        self._pending = deque()
+        self._offsets = None
+
+    def has_next(self) -> bool:
+        """
+        Returns true if there are potentially more results to be retrieved.
+        """
+        return self._has_next
+
+    def _list_tags(self, offset: int) -> dict:
+        return self._client.list_tags(
+            transaction_id=self._transaction_id,
+            impersonate_user=self._impersonate_user,
+            account_id=self._account_id,
+            tag_type=self._tag_type,
+            full_data=self._full_data,
+            providers=self._providers,
+            attached_to=self._attached_to,
+            offset=offset,
+            limit=self._limit,
+            timeout=self._timeout,
+            order_by_name=self._order_by_name,
+            attached_only=self._attached_only,
+        ).get_result()
+
+    def get_next(self) -> List[dict]:
+        """
+        Returns the next page of results.
+        :return: A List[dict], where each element is a dict that represents an instance of Tag.
+        :rtype: List[dict]
+        """
+        if not self.has_next():
+            raise StopIteration('No more results available')
+
+        if self._offsets is None:
+            return self._get_first_page()
+        try:
+            items = self._pending.popleft().result().get('items') or []
+        except BaseException:
+            self.close()
+            raise
+        self._submit_pages()
+        if not self._pending:
+            self.close()
+        return items
+
+    def _get_first_page(self) -> List[dict]:
+        result = self._list_tags(self._page_context['next'])
+        items = result.get('items') or []
+        limit = self._limit or result.get('limit') or len(items)
+        total_count = result.get('total_count')
+        if not items or total_count is None or limit >= total_count:
+            self._has_next = False
+            return items
+        self._page_context['next'] = limit
+        self._offsets = iter(range(limit, total_count, limit))
+        self._limit = limit
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='TagsPager')
+        # Shuts the executor down when the pager is collected, e.g. after a `break`.
+        self._shutdown = weakref.finalize(self, self._executor.shutdown, wait=False)
+        self._submit_pages()
+        return items
+
+    def _submit_pages(self) -> None:
+        # Keep up to `max_workers` pages in flight; at most that many pages are buffered.
+        while len(self._pending) < self._max_workers:
+            offset = next(self._offsets, None)
+            if offset is None:
+                break
+            self._pending.append(self._executor.submit(self._list_tags, offset))
+            self._page_context['next'] = offset + self._limit
+
+    def close(self) -> None:
+        """
+        Stops retrieving pages; the pages being retrieved are discarded.
+        """
+        self._has_next = False
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'TagsPager':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
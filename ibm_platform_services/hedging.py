@@ -0,0 +1,197 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides hedged requests, which cut the tail latency of read operations.
+
+A RequestHedger is a request interceptor (see common.PlatformBaseService) that sends
+a second copy of a GET request when the first one has not been answered within a
+high percentile of the recent latencies of its operation, and returns the response
+that arrives first:
+
+    hedger = RequestHedger(['get_resource_instance'], percentile=95, budget=0.05)
+    resource_controller_service.add_interceptor(hedger)
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Iterable
+
+from ibm_cloud_sdk_core import DetailedResponse
+
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_BUDGET = 0.1
+DEFAULT_INITIAL_DELAY = 1.0
+DEFAULT_MIN_DELAY = 0.005
+DEFAULT_WINDOW = 1000
+DEFAULT_MAX_WORKERS = 64
+
+# The number of latencies recorded between two computations of the hedging delay.
+_DELAY_UPDATE_INTERVAL = 16
+
+
+class _Latencies:
+    """The recent latencies of one operation, and the hedging delay computed from them."""
+
+    __slots__ = ('samples', 'delay', 'pending')
+
+    def __init__(self, window: int, initial_delay: float) -> None:
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.delay = initial_delay
+        self.pending = 0
+
+
+class RequestHedger:
+    """
+    RequestHedger hedges the requests of GET operations.
+
+    The request is sent by a worker thread. If it has not been answered after the
+    hedging delay of its operation, a second copy is sent, and the first successful
+    response is returned; the other one is discarded when it arrives. The exception
+    of the first request is raised if both fail.
+
+    The hedging delay of an operation is the `percentile` of its last `window`
+    latencies, or `initial_delay` until `_DELAY_UPDATE_INTERVAL` latencies are known,
+    and at least `min_delay`. Hedges are limited by a budget: each request earns
+    `budget` of a hedge and each hedge spends one, so hedging adds at most a
+    fraction `budget` to the number of requests sent. At most `max(100 * budget, 1)`
+    hedges are saved up for the bursts of slow requests.
+
+    Both copies of a request are sent by the worker threads of the hedger, so
+    `max_workers` bounds the number of hedged requests in flight; set it above
+    the number of threads that call the hedged operations.
+    """
+
+    def __init__(
+        self,
+        operations: Iterable[str] = None,
+        *,
+        percentile: float = DEFAULT_PERCENTILE,
+        budget: float = DEFAULT_BUDGET,
+        initial_delay: float = DEFAULT_INITIAL_DELAY,
+        min_delay: float = DEFAULT_MIN_DELAY,
+        window: int = DEFAULT_WINDOW,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        """
+        Initialize a RequestHedger object.
+        :param Iterable[str] operations: (optional) The IDs of the operations whose
+               requests are hedged; by default the requests of all the GET
+               operations are.
+        :param float percentile: (optional) The percentile of the latencies of an
+               operation after which its requests are hedged.
+        :param float budget: (optional) The maximum number of hedges per request.
+        :param float initial_delay: (optional) The hedging delay, in seconds, of an
+               operation whose latencies are not known yet.
+        :param float min_delay: (optional) The shortest hedging delay, in seconds.
+        :param int window: (optional) The number of recent latencies of each
+               operation from which its hedging delay is computed.
+        :param int max_workers: (optional) The number of threads that send the requests.
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError('percentile must be between 0 and 100')
+        if not 0 <= budget <= 1:
+            raise ValueError('budget must be between 0 and 1')
+        self.operations = frozenset(operations) if operations is not None else None
+        self.percentile = percentile
+        self.budget = budget
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.window = window
+        self.requests = 0
+        self.hedges = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+        self._tokens = 0.0
+        self._max_tokens = max(budget * 100, 1.0)
+        self._latencies: Dict[str, _Latencies] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='RequestHedger')
+
+    def get_delay(self, operation_id: str) -> float:
+        """
+        Get the current hedging delay of an operation, in seconds.
+        :rtype: float
+        """
+        latencies = self._latencies.get(operation_id)
+        return max(latencies.delay if latencies is not None else self.initial_delay, self.min_delay)
+
+    def _record(self, operation_id: str, latency: float) -> None:
+        with self._lock:
+            latencies = self._latencies.get(operation_id)
+            if latencies is None:
+                latencies = self._latencies[operation_id] = _Latencies(self.window, self.initial_delay)
+            latencies.samples.append(latency)
+            latencies.pending += 1
+            if latencies.pending < _DELAY_UPDATE_INTERVAL:
+                return
+            latencies.pending = 0
+            samples = sorted(latencies.samples)
+        index = min(len(samples) - 1, max(0, math.ceil(self.percentile / 100 * len(samples)) - 1))
+        latencies.delay = samples[index]
+
+    def _send(self, send, operation_id: str, request: dict, kwargs: dict) -> DetailedResponse:
+        start = time.monotonic()
+        response = send(request, **kwargs)
+        self._record(operation_id, time.monotonic() - start)
+        return response
+
+    def _take_hedge(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.hedges += 1
+                return True
+            self.hedges_denied += 1
+            return False
+
+    def __call__(self, service, operation_id: str, request: dict, send, **kwargs) -> DetailedResponse:
+        if (
+            request['method'] != 'GET'
+            or kwargs.get('stream')
+            or (self.operations is not None and operation_id not in self.operations)
+        ):
+            return send(request, **kwargs)
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self._max_tokens, self._tokens + self.budget)
+        primary = self._executor.submit(self._send, send, operation_id, request, kwargs)
+        done, _ = wait([primary], timeout=self.get_delay(operation_id))
+        if done or not self._take_hedge():
+            return primary.result()
+        hedge = self._executor.submit(self._send, send, operation_id, request, kwargs)
+        return self._first_success(primary, hedge)
+
+    def _first_success(self, primary: Future, hedge: Future) -> DetailedResponse:
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary, hedge):
+                if future in done and future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.hedges_won += 1
+                    return future.result()
+        return primary.result()
+
+    def close(self) -> None:
+        """
+        Stop the worker threads once the requests in flight are answered.
+        """
+        self._executor.shutdown(wait=False)
@@ -29,19 +29,20 @@ from enum import Enum
 from typing import Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse, get_query_param
+from ibm_cloud_sdk_core import DetailedResponse, get_query_param
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_model, datetime_to_string, string_to_datetime
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class IamAccessGroupsV2(BaseService):
+class IamAccessGroupsV2(PlatformBaseService):
     """The iam-access-groups V2 service."""
 
     DEFAULT_SERVICE_URL = 'https://iam.cloud.ibm.com'
@@ -72,7 +73,7 @@ class IamAccessGroupsV2(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Access group operations
@@ -2899,11 +2900,14 @@ class RulesList:
 ##############################################################################
 
 
-class AccessGroupsPager:
+class AccessGroupsPager(BasePager):
     """
     AccessGroupsPager can be used to simplify the use of the "list_access_groups" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = Group
+
     def __init__(
         self,
         *,
@@ -3009,11 +3013,14 @@ class AccessGroupsPager:
         return results
 
 
-class AccessGroupMembersPager:
+class AccessGroupMembersPager(BasePager):
     """
     AccessGroupMembersPager can be used to simplify the use of the "list_access_group_members" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ListGroupMembersResponseMember
+
     def __init__(
         self,
         *,
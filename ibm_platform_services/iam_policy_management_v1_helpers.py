@@ -0,0 +1,587 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides high-level helpers built on the iam_policy_management V1 service.
+"""
+
+import operator
+import re
+import sys
+import threading
+from datetime import datetime, time, timedelta, timezone
+from time import monotonic
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Pattern, Set, Tuple, Union
+
+from ibm_cloud_sdk_core import string_to_datetime
+
+from .bulk import DEFAULT_MAX_WORKERS
+from .iam_policy_management_v1 import CustomRole, IamPolicyManagementV1, Role, V2Policy
+
+# The subject attributes of the access policies, whose values identify the subject.
+SUBJECT_ATTRIBUTES = frozenset(['iam_id', 'access_group_id'])
+
+DEFAULT_ROLE_CATALOG_TTL = 300.0
+
+# The lists of roles of a RoleList.
+_ROLE_LISTS = ('system_roles', 'service_roles', 'custom_roles')
+
+_STRING_EQUALS = 'stringEquals'
+_STRING_MATCH = 'stringMatch'
+_STRING_EXISTS = 'stringExists'
+
+_COMPARISONS = {
+    'LessThan': operator.lt,
+    'LessThanOrEquals': operator.le,
+    'GreaterThan': operator.gt,
+    'GreaterThanOrEquals': operator.ge,
+}
+
+# A condition of a policy rule, evaluated at a point in time.
+_Condition = Callable[[datetime], bool]
+
+# The scope of a policy in the policies of its subject: (serviceName, serviceInstance).
+_Scope = Tuple[Optional[str], Optional[str]]
+
+_NO_POLICIES: Tuple = ()
+
+
+def _field(model, name: str):
+    """Return a property of a model object, or of the dict of a model; None when it is not set."""
+    if isinstance(model, dict):
+        return model.get(name)
+    return getattr(model, name, None)
+
+
+def _last_modified_at(policy: Union[V2Policy, dict]) -> Optional[datetime]:
+    value = _field(policy, 'last_modified_at')
+    return string_to_datetime(value) if isinstance(value, str) else value
+
+
+def _matcher(value, operator_: Optional[str]) -> Union[str, Pattern, bool]:
+    if operator_ == _STRING_EXISTS:
+        return value is True or str(value).lower() == 'true'
+    if operator_ == _STRING_MATCH:
+        return re.compile('.*'.join(re.escape(part).replace('\\?', '.') for part in str(value).split('*')) + r'\Z')
+    return value
+
+
+def _matches(matcher: Union[str, Pattern, bool], operator_: Optional[str], value) -> bool:
+    if operator_ == _STRING_EXISTS:
+        return (value is not None) == matcher
+    if value is None:
+        return False
+    if operator_ == _STRING_MATCH:
+        return matcher.match(str(value)) is not None
+    return matcher == value
+
+
+def _parse_offset(value: str) -> timezone:
+    sign = -1 if value[0] == '-' else 1
+    (hours, minutes) = value[1:].split(':')
+    return timezone(sign * timedelta(hours=int(hours), minutes=int(minutes)))
+
+
+def _condition(attribute: Mapping) -> _Condition:
+    """
+    Compile a time-based condition of a policy rule, e.g. `dateTimeGreaterThan`,
+    `timeLessThan` or `dayOfWeekAnyOf`. Unknown operators are never satisfied.
+    """
+    operator_ = _field(attribute, 'operator') or ''
+    value = _field(attribute, 'value')
+    if operator_.startswith('dateTime') and operator_[8:] in _COMPARISONS:
+        compare = _COMPARISONS[operator_[8:]]
+        bound = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        return lambda at: compare(at, bound)
+    if operator_.startswith('time') and operator_[4:] in _COMPARISONS:
+        compare = _COMPARISONS[operator_[4:]]
+        bound = time.fromisoformat(str(value).replace('Z', '+00:00'))
+        (zone, bound) = (bound.tzinfo or timezone.utc, bound.replace(tzinfo=None))
+        return lambda at: compare(at.astimezone(zone).time(), bound)
+    if operator_ in ('dayOfWeekEquals', 'dayOfWeekAnyOf'):
+        days = []
+        for day in [value] if isinstance(value, str) else value:
+            match = re.match(r'(\d)(?:([+-])(\d\d:\d\d))?\Z', str(day))
+            if match is None:
+                raise ValueError('invalid day of week in a {0} condition: {1!r}'.format(operator_, day))
+            (number, sign, offset) = match.groups()
+            days.append((int(number), _parse_offset(sign + offset) if sign else timezone.utc))
+        return lambda at: any(at.astimezone(zone).isoweekday() == number for (number, zone) in days)
+    return lambda at: False
+
+
+def _rule_condition(rule: Optional[Mapping]) -> Optional[_Condition]:
+    if not rule:
+        return None
+    if _field(rule, 'conditions') is None:
+        return _condition(rule)
+    conditions = [_condition(condition) for condition in _field(rule, 'conditions')]
+    if _field(rule, 'operator') == 'or':
+        return lambda at: any(condition(at) for condition in conditions)
+    return lambda at: all(condition(at) for condition in conditions)
+
+
+def _tag_values(tags: Union[Mapping[str, str], Iterable[str], None]) -> Dict[str, str]:
+    if tags is None:
+        return {}
+    if isinstance(tags, Mapping):
+        return dict(tags)
+    return dict(tag.split(':', 1) if ':' in tag else (tag, '') for tag in tags)
+
+
+class _Policy:
+    """The compiled form of an access policy."""
+
+    __slots__ = (
+        'policy_id',
+        'policy',
+        'subject',
+        'service',
+        'instance',
+        'attributes',
+        'tags',
+        'condition',
+        'roles',
+        'actions',
+    )
+
+    def __init__(self, policy: Union[V2Policy, dict], subject: str) -> None:
+        self.policy_id = _field(policy, 'id')
+        self.policy = policy
+        self.subject = subject
+        self.service = None
+        self.instance = None
+        self.attributes = []
+        resource = _field(policy, 'resource')
+        for attribute in _field(resource, 'attributes') or []:
+            (key, value) = (_field(attribute, 'key'), _field(attribute, 'value'))
+            operator_ = _field(attribute, 'operator')
+            if operator_ in (None, _STRING_EQUALS) and key == 'serviceName':
+                self.service = value
+            elif operator_ in (None, _STRING_EQUALS) and key == 'serviceInstance':
+                self.instance = value
+            else:
+                self.attributes.append((key, operator_, _matcher(value, operator_)))
+        self.tags = []
+        for tag in _field(resource, 'tags') or []:
+            operator_ = _field(tag, 'operator')
+            self.tags.append((_field(tag, 'key'), operator_, _matcher(_field(tag, 'value'), operator_)))
+        self.condition = _rule_condition(_field(policy, 'rule'))
+        # The actions listed with the roles of the policy (format=display), by role.
+        self.roles = {}
+        for role in _field(_field(_field(policy, 'control'), 'grant'), 'roles') or []:
+            actions = _field(role, 'actions') or []
+            self.roles[_field(role, 'role_id')] = frozenset(_field(action, 'id') for action in actions)
+        self.actions = frozenset()
+
+    @property
+    def scope(self) -> _Scope:
+        return (self.service, self.instance)
+
+    def matches(self, attributes: Mapping[str, str], tags: Optional[Mapping[str, str]]) -> bool:
+        for (key, operator_, matcher) in self.attributes:
+            if not _matches(matcher, operator_, attributes.get(key)):
+                return False
+        for (key, operator_, matcher) in self.tags:
+            if not _matches(matcher, operator_, tags.get(key)):
+                return False
+        return True
+
+
+class PolicyDecisionEngine:
+    """
+    PolicyDecisionEngine decides whether the access policies of an account allow a
+    subject to perform an action on a resource, without any request.
+
+    A policy allows an action when its subject is the IAM ID of the subject or one
+    of its access groups, when one of its roles grants the action, when every
+    resource attribute and tag of the policy matches the resource (exactly, with the
+    `*` and `?` wildcards of `stringMatch`, or by presence with `stringExists`), and
+    when the time-based conditions of its rule are satisfied. Policies are compiled
+    when they are added, and indexed by subject, `serviceName` and `serviceInstance`,
+    so a decision only checks the policies of the subject on the service or the
+    instance of the resource.
+
+    The actions of a role are those listed with the role in the policy, when it is
+    listed with `format=display`, and those of the roles given to `update_roles`,
+    e.g. the roles returned by the list_roles operation:
+
+        engine = PolicyDecisionEngine(roles=system_roles + service_roles + custom_roles)
+        engine.refresh(iam_policy_service, account_id, format='display')
+        if engine.is_allowed(iam_id, 'cloud-object-storage.object.get',
+                             {'accountId': account_id, 'serviceName': 'cloud-object-storage',
+                              'serviceInstance': instance_guid}, access_group_ids=groups):
+            ...
+
+    Only the active access policies whose subject is an `iam_id` or an
+    `access_group_id` are indexed; the other policies are ignored. The engine can be
+    read and updated from several threads.
+    """
+
+    def __init__(
+        self, policies: Iterable[Union[V2Policy, dict]] = (), *, roles: Iterable[Union[Role, CustomRole, dict]] = ()
+    ) -> None:
+        """
+        Initialize a PolicyDecisionEngine object.
+        :param Iterable[V2Policy] policies: (optional) The policies to index.
+        :param Iterable[Role] roles: (optional) The roles granted by the policies,
+               with their actions.
+        """
+        self._policies: Dict[str, Union[V2Policy, dict]] = {}
+        self._compiled: Dict[str, _Policy] = {}
+        self._index: Dict[str, Dict[_Scope, Tuple[_Policy, ...]]] = {}
+        self._role_actions: Dict[str, FrozenSet[str]] = {}
+        self._policies_by_role: Dict[str, Set[str]] = {}
+        # The actions of the roles granted by the policies, shared by the policies granting the same roles.
+        self._grants: Dict[Tuple, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+        self.update_roles(roles)
+        for policy in policies:
+            self.update_policy(policy)
+
+    def __len__(self) -> int:
+        """Return the number of policies indexed by the engine."""
+        return len(self._compiled)
+
+    def update_roles(self, roles: Iterable[Union[Role, CustomRole, dict]]) -> None:
+        """
+        Set the actions of roles, and recompile the policies that grant them.
+
+        The actions of the roles listed more than once, e.g. the system roles
+        returned for each service, are merged.
+        :param Iterable[Role] roles: The roles, with their `crn` and `actions`.
+        """
+        role_actions: Dict[str, Set[str]] = {}
+        for role in roles:
+            role_actions.setdefault(_field(role, 'crn'), set()).update(_field(role, 'actions') or ())
+        with self._lock:
+            for (crn, actions) in role_actions.items():
+                self._role_actions[crn] = frozenset(actions)
+            self._grants.clear()
+            changed = set()
+            for crn in role_actions:
+                changed.update(self._policies_by_role.get(crn, ()))
+            for policy_id in changed:
+                compiled = self._compiled[policy_id]
+                self._discard(policy_id)
+                self._add(compiled)
+
+    def update_policy(self, policy: Union[V2Policy, dict]) -> None:
+        """
+        Add a policy to the engine, or replace it.
+        :param V2Policy policy: The policy, or the dict of a policy.
+        """
+        policy_id = _field(policy, 'id')
+        subjects = [
+            _field(attribute, 'value')
+            for attribute in _field(_field(policy, 'subject'), 'attributes') or []
+            if _field(attribute, 'key') in SUBJECT_ATTRIBUTES
+            and _field(attribute, 'operator') in (None, _STRING_EQUALS)
+        ]
+        compiled = None
+        if _field(policy, 'type') == 'access' and _field(policy, 'state') in (None, 'active') and len(subjects) == 1:
+            compiled = _Policy(policy, subjects[0])
+        with self._lock:
+            self._discard(policy_id)
+            self._policies[policy_id] = policy
+            if compiled is not None:
+                self._add(compiled)
+
+    def remove_policy(self, policy_id: str) -> None:
+        """
+        Remove a policy from the engine, if it is there.
+        :param str policy_id: The ID of the policy.
+        """
+        with self._lock:
+            self._policies.pop(policy_id, None)
+            self._discard(policy_id)
+
+    def _add(self, compiled: _Policy) -> None:
+        grant = tuple(sorted(compiled.roles.items()))
+        actions = self._grants.get(grant)
+        if actions is None:
+            actions = set()
+            for (crn, listed) in grant:
+                actions.update(listed)
+                actions.update(self._role_actions.get(crn, ()))
+            actions = self._grants[grant] = frozenset(actions)
+        for crn in compiled.roles:
+            self._policies_by_role.setdefault(crn, set()).add(compiled.policy_id)
+        compiled.actions = actions
+        self._compiled[compiled.policy_id] = compiled
+        # The policies of a subject are replaced, never modified, so the decisions need no lock.
+        scopes = dict(self._index.get(compiled.subject, ()))
+        scopes[compiled.scope] = scopes.get(compiled.scope, _NO_POLICIES) + (compiled,)
+        self._index[compiled.subject] = scopes
+
+    def _discard(self, policy_id: str) -> None:
+        compiled = self._compiled.pop(policy_id, None)
+        if compiled is None:
+            return
+        for crn in compiled.roles:
+            policy_ids = self._policies_by_role[crn]
+            policy_ids.discard(policy_id)
+            if not policy_ids:
+                del self._policies_by_role[crn]
+        scopes = dict(self._index[compiled.subject])
+        bucket = tuple(other for other in scopes[compiled.scope] if other is not compiled)
+        if bucket:
+            scopes[compiled.scope] = bucket
+        else:
+            del scopes[compiled.scope]
+        if scopes:
+            self._index[compiled.subject] = scopes
+        else:
+            del self._index[compiled.subject]
+
+    def refresh(self, client: IamPolicyManagementV1, account_id: str, **list_params) -> List[str]:
+        """
+        Bring the engine up to date with the policies of an account.
+
+        The policies are listed, and only the policies that are new or were modified
+        since they were indexed, according to their `last_modified_at`, are compiled
+        again; the policies that are no longer listed are removed.
+        :param IamPolicyManagementV1 client: The client used to list the policies.
+        :param str account_id: The ID of the account of the policies.
+        :param **list_params: (optional) Any other parameters of the
+               list_v2_policies operation, e.g. `format='display'` to list the
+               actions of the roles.
+        :return: The IDs of the policies added, updated or removed.
+        :rtype: List[str]
+        """
+        listed = client.list_v2_policies(account_id, **list_params).get_result().get('policies', [])
+        listed_ids = {policy['id'] for policy in listed}
+        changed = [policy_id for policy_id in list(self._policies) if policy_id not in listed_ids]
+        for policy_id in changed:
+            self.remove_policy(policy_id)
+        for data in listed:
+            indexed = self._policies.get(data['id'])
+            if indexed is None or _last_modified_at(indexed) != _last_modified_at(data):
+                self.update_policy(V2Policy.from_dict(data))
+                changed.append(data['id'])
+        return changed
+
+    def find_policy(
+        self,
+        iam_id: str,
+        action: str,
+        attributes: Mapping[str, str],
+        *,
+        access_group_ids: Iterable[str] = (),
+        tags: Union[Mapping[str, str], Iterable[str]] = None,
+        at: datetime = None,
+    ) -> Optional[V2Policy]:
+        """
+        Return a policy that allows a subject to perform an action on a resource.
+        :param str iam_id: The IAM ID of the subject.
+        :param str action: The action, e.g. `iam.policy.read`.
+        :param dict attributes: The attributes of the resource, e.g. `accountId`,
+               `serviceName`, `serviceInstance`, `region` or `resourceType`.
+        :param Iterable[str] access_group_ids: (optional) The IDs of the access
+               groups of the subject.
+        :param dict tags: (optional) The access management tags of the resource, as
+               a dict, or as an iterable of `name:value` strings.
+        :param datetime at: (optional) The time of the request, for the time-based
+               conditions; the current time by default.
+        :return: The policy, or None when the action is not allowed.
+        :rtype: V2Policy
+        """
+        service = attributes.get('serviceName')
+        instance = attributes.get('serviceInstance')
+        scopes = dict.fromkeys(((service, instance), (service, None), (None, instance), (None, None)))
+        index = self._index
+        tag_values = None
+        for subject in (iam_id, *access_group_ids):
+            policies = index.get(subject)
+            if policies is None:
+                continue
+            for scope in scopes:
+                for compiled in policies.get(scope, _NO_POLICIES):
+                    if action not in compiled.actions:
+                        continue
+                    if compiled.tags and tag_values is None:
+                        tag_values = _tag_values(tags)
+                    if not compiled.matches(attributes, tag_values):
+                        continue
+                    if compiled.condition is not None:
+                        if at is None:
+                            at = datetime.now(timezone.utc)
+                        elif at.tzinfo is None:
+                            at = at.replace(tzinfo=timezone.utc)
+                        if not compiled.condition(at):
+                            continue
+                    return compiled.policy
+        return None
+
+    def is_allowed(
+        self,
+        iam_id: str,
+        action: str,
+        attributes: Mapping[str, str],
+        *,
+        access_group_ids: Iterable[str] = (),
+        tags: Union[Mapping[str, str], Iterable[str]] = None,
+        at: datetime = None,
+    ) -> bool:
+        """
+        Return whether the policies allow a subject to perform an action on a resource.
+        The parameters are those of find_policy.
+        :rtype: bool
+        """
+        return (
+            self.find_policy(iam_id, action, attributes, access_group_ids=access_group_ids, tags=tags, at=at)
+            is not None
+        )
+
+
+def _share(shared: Dict[FrozenSet[str], FrozenSet[str]], values: Iterable[str]) -> FrozenSet[str]:
+    values = frozenset(values)
+    return shared.setdefault(values, values)
+
+
+class _RoleIndex:
+    """The action-to-roles and role-to-actions indexes of the roles listed by a refresh of a RoleCatalog."""
+
+    __slots__ = ('actions', 'roles', 'expires')
+
+    def __init__(self, role_lists: Iterable[dict], expires: float) -> None:
+        role_actions: Dict[str, Set[str]] = {}
+        for role_list in role_lists:
+            for name in _ROLE_LISTS:
+                for role in role_list.get(name) or []:
+                    if role.get('crn') is None:
+                        continue
+                    actions = role_actions.setdefault(sys.intern(role['crn']), set())
+                    actions.update(sys.intern(action) for action in role.get('actions') or [])
+        action_roles: Dict[str, Set[str]] = {}
+        for (crn, actions) in role_actions.items():
+            for action in actions:
+                action_roles.setdefault(action, set()).add(crn)
+        # Most actions are granted by the same few sets of roles, so equal sets are shared.
+        shared = {}
+        self.actions = {crn: _share(shared, actions) for (crn, actions) in role_actions.items()}
+        self.roles = {action: _share(shared, crns) for (action, crns) in action_roles.items()}
+        self.expires = expires
+
+
+class RoleCatalog:
+    """
+    RoleCatalog caches the roles of the IAM services, and indexes the actions they
+    grant, to find the roles that grant an action and the actions of a role without
+    any request.
+
+    The roles are listed with the list_roles operation: once for the system roles
+    and the custom roles of the account, and once for each of `service_names`, for
+    their service roles and the actions of the system roles on the service. The
+    actions of a role listed for several services are merged. The catalog lists the
+    roles again, on the first query after `ttl` seconds; meanwhile, the other
+    threads keep using the expired roles. Role CRNs and actions are interned, and
+    equal sets of roles or actions are stored once.
+
+        catalog = RoleCatalog(iam_policy_service, account_id=account_id,
+                              service_names=['cloud-object-storage', 'kms'])
+        writers = catalog.roles_for_action('cloud-object-storage.object.put')
+        engine = PolicyDecisionEngine(roles=catalog.roles())
+    """
+
+    def __init__(
+        self,
+        client: IamPolicyManagementV1,
+        *,
+        account_id: str = None,
+        service_names: Iterable[str] = (),
+        ttl: float = DEFAULT_ROLE_CATALOG_TTL,
+        concurrency: int = DEFAULT_MAX_WORKERS,
+        **list_params,
+    ) -> None:
+        """
+        Initialize a RoleCatalog object.
+        :param IamPolicyManagementV1 client: The client used to list the roles.
+        :param str account_id: (optional) The ID of the account of the custom roles.
+        :param Iterable[str] service_names: (optional) The names of the services
+               whose service roles are listed, e.g. `cloud-object-storage`.
+        :param float ttl: (optional) The number of seconds for which the listed
+               roles are used.
+        :param int concurrency: (optional) The maximum number of list_roles
+               requests in flight.
+        :param **list_params: (optional) Any other parameters of the list_roles
+               operation, e.g. `policy_type`.
+        """
+        if ttl < 0:
+            raise ValueError('ttl must not be negative')
+        self.client = client
+        self.account_id = account_id
+        self.service_names = list(service_names)
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.list_params = list_params
+        self._index: Optional[_RoleIndex] = None
+        self._refreshing = threading.Lock()
+
+    def refresh(self) -> None:
+        """
+        List the roles, and replace the indexes of the catalog.
+        """
+        items = [{}] + [{'service_name': name} for name in self.service_names]
+        with self.client.map(
+            'list_roles', items, max_workers=self.concurrency, account_id=self.account_id, **self.list_params
+        ) as results:
+            role_lists = [result.get_result() for result in results]
+        self._index = _RoleIndex(role_lists, monotonic() + self.ttl)
+
+    def _current(self) -> _RoleIndex:
+        index = self._index
+        if index is not None and index.expires > monotonic():
+            return index
+        # One thread lists the roles; the others use the expired roles meanwhile, if there are any.
+        if not self._refreshing.acquire(blocking=index is None):
+            return index
+        try:
+            if self._index is index:
+                self.refresh()
+            return self._index
+        finally:
+            self._refreshing.release()
+
+    def __len__(self) -> int:
+        """Return the number of roles in the catalog."""
+        return len(self._current().actions)
+
+    def roles_for_action(self, action: str) -> FrozenSet[str]:
+        """
+        Return the roles that grant an action.
+        :param str action: The action, e.g. `iam.policy.read`.
+        :return: The CRNs of the roles.
+        :rtype: FrozenSet[str]
+        """
+        return self._current().roles.get(action, frozenset())
+
+    def actions_for_role(self, role_crn: str) -> FrozenSet[str]:
+        """
+        Return the actions that a role grants.
+        :param str role_crn: The CRN of the role.
+        :return: The actions.
+        :rtype: FrozenSet[str]
+        """
+        return self._current().actions.get(role_crn, frozenset())
+
+    def roles(self) -> List[dict]:
+        """
+        Return the roles of the catalog, e.g. for PolicyDecisionEngine.update_roles.
+        :return: The roles, as dicts with their `crn` and `actions`.
+        :rtype: List[dict]
+        """
+        return [{'crn': crn, 'actions': actions} for (crn, actions) in self._current().actions.items()]
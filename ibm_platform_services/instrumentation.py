@@ -0,0 +1,220 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides the observers of the operations of all service clients.
+
+An OperationObserver registered with add_observer() is notified when an operation of
+any service client starts and finishes sending its request, with an OperationRecord
+of its timings and sizes, and when the results of a list operation are turned into
+models by a pager:
+
+    class SlowOperations(OperationObserver):
+        def operation_finished(self, record):
+            if record.duration > 1.0:
+                print(record.service_name, record.operation_id, record.network_time)
+
+    add_observer(SlowOperations())
+
+Without registered observers, the operations only check that there are none.
+"""
+
+import logging
+import time
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The registered observers, replaced as a whole when an observer is added or removed.
+_observers = ()
+
+
+class OperationRecord:
+    """
+    The timings and sizes of one operation of a service client.
+
+    All the times are in seconds. The request of an operation can be sent more than
+    once, by the automatic retries of the client or by a request interceptor; the
+    network and decode times and the byte counts are the sums over all the attempts,
+    and `status_code` is the status of the last response.
+
+    :attr str service_name: The DEFAULT_SERVICE_NAME of the service client.
+    :attr str operation_id: The ID of the operation, e.g. `list_tags`.
+    :attr float build_time: The time spent building the request, including getting
+          the access token, or None if not known.
+    :attr float network_time: The time spent sending the request and receiving the
+          response, including its body.
+    :attr float decode_time: The time spent decoding the response.
+    :attr float duration: The time from the start of send() to its end, including
+          the time spent in request interceptors.
+    :attr int request_bytes: The size of the request bodies.
+    :attr int response_bytes: The size of the (decompressed) response bodies.
+    :attr int status_code: The HTTP status of the response, or None if no response
+          was received.
+    :attr int retries: The number of times the request was sent again.
+    :attr BaseException error: The exception raised by the operation, if any.
+    """
+
+    __slots__ = (
+        'service_name',
+        'operation_id',
+        'build_time',
+        'network_time',
+        'decode_time',
+        'duration',
+        'request_bytes',
+        'response_bytes',
+        'status_code',
+        'retries',
+        'error',
+        '_attempts',
+    )
+
+    def __init__(self, service_name: str, operation_id: str, build_time: float = None) -> None:
+        self.service_name = service_name
+        self.operation_id = operation_id
+        self.build_time = build_time
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.duration = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status_code = None
+        self.retries = 0
+        self.error = None
+        self._attempts = 0
+
+    def __repr__(self) -> str:
+        return '<OperationRecord {0}.{1} status={2} duration={3}>'.format(
+            self.service_name, self.operation_id, self.status_code, self.duration
+        )
+
+
+class OperationObserver:
+    """
+    The base class of the observers of the operations; each method does nothing by
+    default. The methods are called by the threads that run the operations, so they
+    must be thread-safe and quick; the exceptions they raise are logged and ignored.
+    """
+
+    def operation_started(self, record: OperationRecord) -> None:
+        """
+        Called when an operation starts sending its request; only the names and
+        `build_time` of the record are set.
+        """
+
+    def operation_finished(self, record: OperationRecord) -> None:
+        """
+        Called when an operation returns its response or raises an exception.
+        """
+
+    def models_constructed(self, service_name: str, operation_id: str, count: int, seconds: float) -> None:
+        """
+        Called when a pager has built `count` models from one page of results of
+        an operation, in `seconds`.
+        """
+
+
+def add_observer(observer: OperationObserver) -> None:
+    """
+    Register an observer of the operations of all the service clients.
+    """
+    global _observers  # pylint: disable=global-statement
+    _observers = _observers + (observer,)
+
+
+def remove_observer(observer: OperationObserver) -> None:
+    """
+    Unregister an observer registered with add_observer().
+    """
+    global _observers  # pylint: disable=global-statement
+    _observers = tuple(o for o in _observers if o is not observer)
+
+
+def get_observers() -> Tuple[OperationObserver, ...]:
+    """
+    Get the registered observers, in the order in which they are notified.
+    """
+    return _observers
+
+
+def notify(method: str, *args) -> None:
+    """Call `method` of each registered observer, logging the exceptions it raises."""
+    for observer in _observers:
+        try:
+            getattr(observer, method)(*args)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Operation observer %r failed', observer)
+
+
+class _Attempt:
+    """Measures one sending of the request of an operation, as a `requests` response hook."""
+
+    __slots__ = ('record', 'stream', 'start', 'received')
+
+    def __init__(self, record: OperationRecord, stream: bool) -> None:
+        self.record = record
+        self.stream = stream
+        self.start = time.perf_counter()
+        self.received = None
+
+    def __call__(self, response, **kwargs):
+        # Read the body here, unless it is streamed to the caller, so that the
+        # network time includes it and the decode time does not.
+        record = self.record
+        if not self.stream:
+            record.response_bytes += len(response.content or b'')
+        body = response.request.body
+        if isinstance(body, (bytes, str)):
+            record.request_bytes += len(body)
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None:
+            record.retries += len(retries.history)
+        self.received = time.perf_counter()
+        return response
+
+    def finish(self) -> None:
+        record = self.record
+        end = time.perf_counter()
+        if self.received is None:
+            record.network_time += end - self.start
+        else:
+            record.network_time += self.received - self.start
+            record.decode_time += end - self.received
+        if record._attempts:
+            record.retries += 1
+        record._attempts += 1
+
+
+def start_attempt(record: OperationRecord, kwargs: dict) -> _Attempt:
+    """
+    Start measuring one sending of the request of an operation: add a response hook to
+    the keyword arguments of BaseService.send() and return it. Call its finish() method
+    when BaseService.send() returns or raises.
+    """
+    attempt = _Attempt(record, bool(kwargs.get('stream')))
+    hooks = dict(kwargs.get('hooks') or {})
+    response_hooks = hooks.get('response') or []
+    if callable(response_hooks):
+        response_hooks = [response_hooks]
+    hooks['response'] = list(response_hooks) + [attempt]
+    kwargs['hooks'] = hooks
+    return attempt
+
+
+def notify_models(service_name: Optional[str], operation_id: Optional[str], count: int, seconds: float) -> None:
+    """Notify the registered observers that `count` models were built from a page of results."""
+    notify('models_constructed', service_name, operation_id, count, seconds)
@@ -0,0 +1,254 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides a collector of metrics of the operations of all service clients,
+exported in the Prometheus text format.
+
+    metrics = PrometheusMetrics()
+    add_observer(metrics)
+    ...
+    print(metrics.render())
+    metrics.write_to_file('/var/lib/node_exporter/textfile/platform_services.prom')
+
+The metrics are labelled with the DEFAULT_SERVICE_NAME of the service client and the
+ID of the operation:
+
+- `<namespace>_operation_duration_seconds`: histogram of the operation durations.
+- `<namespace>_operations_in_flight`: gauge of the operations sending their request.
+- `<namespace>_operations_total`: counter of the finished operations.
+- `<namespace>_operation_errors_total`: counter of the failed operations, also
+  labelled with the HTTP `status` of the error (`none` if there was no response).
+- `<namespace>_operation_retries_total`: counter of the requests sent again.
+- `<namespace>_request_bytes_total` and `<namespace>_response_bytes_total`: counters
+  of the bytes of the request and response bodies.
+"""
+
+import bisect
+import contextlib
+import os
+import tempfile
+import threading
+import weakref
+from typing import Dict, Iterable, Tuple
+
+from .instrumentation import OperationObserver, OperationRecord
+
+DEFAULT_NAMESPACE = 'ibm_platform_services'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _OperationStats:
+    """The statistics of one operation collected by one thread."""
+
+    __slots__ = (
+        'in_flight',
+        'count',
+        'duration_sum',
+        'buckets',
+        'errors',
+        'retries',
+        'request_bytes',
+        'response_bytes',
+    )
+
+    def __init__(self, bucket_count: int) -> None:
+        self.in_flight = 0
+        self.count = 0
+        self.duration_sum = 0.0
+        # The number of durations in each bucket, not cumulative; the last one is +Inf.
+        self.buckets = [0] * (bucket_count + 1)
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class _Shard:
+    """The statistics of the operations observed by one thread, kept in its threading.local."""
+
+    __slots__ = ('stats', '__weakref__')
+
+    def __init__(self) -> None:
+        self.stats: Dict[Tuple[str, str], _OperationStats] = {}
+
+
+def _add(totals: Dict[Tuple[str, str], _OperationStats], shard: dict, bucket_count: int) -> None:
+    """Add the statistics of a shard to `totals`."""
+    for key, stats in list(shard.items()):
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = _OperationStats(bucket_count)
+        total.in_flight += stats.in_flight
+        total.count += stats.count
+        total.duration_sum += stats.duration_sum
+        for index, count in enumerate(list(stats.buckets)):
+            total.buckets[index] += count
+        for status, count in list(stats.errors.items()):
+            total.errors[status] = total.errors.get(status, 0) + count
+        total.retries += stats.retries
+        total.request_bytes += stats.request_bytes
+        total.response_bytes += stats.response_bytes
+
+
+def _retire(metrics_ref: weakref.ref, shard: dict) -> None:
+    """Fold the statistics of a thread that has ended into those of the finished threads."""
+    metrics = metrics_ref()
+    if metrics is None:
+        return
+    with metrics._lock:
+        del metrics._shards[id(shard)]
+        _add(metrics._finished, shard, len(metrics.buckets))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class PrometheusMetrics(OperationObserver):
+    """
+    PrometheusMetrics collects the metrics of the operations it observes.
+
+    Each thread updates statistics of its own, so observing an operation takes no
+    lock; render() adds up the statistics of all the threads. When a thread ends,
+    its statistics are added to those of the finished threads, so short-lived
+    threads do not accumulate. Register it with instrumentation.add_observer().
+    """
+
+    def __init__(self, *, namespace: str = DEFAULT_NAMESPACE, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize a PrometheusMetrics object.
+        :param str namespace: (optional) The prefix of the names of the metrics.
+        :param Iterable[float] buckets: (optional) The upper bounds, in seconds, of
+               the buckets of the duration histogram.
+        """
+        self.namespace = namespace
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets))
+        if not self.buckets:
+            raise ValueError('buckets must not be empty')
+        self._local = threading.local()
+        # The statistics of the running threads by id, and the total of the threads that have ended.
+        self._shards: Dict[int, Dict[Tuple[str, str], _OperationStats]] = {}
+        self._finished: Dict[Tuple[str, str], _OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, record: OperationRecord) -> _OperationStats:
+        try:
+            shard = self._local.shard.stats
+        except AttributeError:
+            holder = self._local.shard = _Shard()
+            shard = holder.stats
+            with self._lock:
+                self._shards[id(shard)] = shard
+            # The threading.local drops the holder when the thread ends.
+            weakref.finalize(holder, _retire, weakref.ref(self), shard)
+        key = (record.service_name or '', record.operation_id or '')
+        stats = shard.get(key)
+        if stats is None:
+            stats = shard[key] = _OperationStats(len(self.buckets))
+        return stats
+
+    def operation_started(self, record: OperationRecord) -> None:
+        self._stats(record).in_flight += 1
+
+    def operation_finished(self, record: OperationRecord) -> None:
+        stats = self._stats(record)
+        stats.in_flight -= 1
+        stats.count += 1
+        duration = record.duration or 0.0
+        stats.duration_sum += duration
+        stats.buckets[bisect.bisect_left(self.buckets, duration)] += 1
+        if record.error is not None:
+            status = str(record.status_code) if record.status_code is not None else 'none'
+            stats.errors[status] = stats.errors.get(status, 0) + 1
+        stats.retries += record.retries
+        stats.request_bytes += record.request_bytes
+        stats.response_bytes += record.response_bytes
+
+    def _merge(self) -> Dict[Tuple[str, str], _OperationStats]:
+        merged: Dict[Tuple[str, str], _OperationStats] = {}
+        with self._lock:
+            shards = list(self._shards.values())
+            _add(merged, self._finished, len(self.buckets))
+        for shard in shards:
+            _add(merged, shard, len(self.buckets))
+        return merged
+
+    def render(self) -> str:
+        """
+        Return the metrics in the Prometheus text exposition format.
+        :rtype: str
+        """
+        merged = sorted(self._merge().items())
+        lines = []
+        name = self.namespace + '_operation_duration_seconds'
+        lines.append('# HELP {0} The duration of the operations of the service clients.'.format(name))
+        lines.append('# TYPE {0} histogram'.format(name))
+        for (service, operation), stats in merged:
+            labels = 'service="{0}",operation="{1}"'.format(_escape(service), _escape(operation))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (None,), stats.buckets):
+                cumulative += count
+                le = '+Inf' if bound is None else repr(bound)
+                lines.append('{0}_bucket{{{1},le="{2}"}} {3}'.format(name, labels, le, cumulative))
+            lines.append('{0}_sum{{{1}}} {2}'.format(name, labels, repr(stats.duration_sum)))
+            lines.append('{0}_count{{{1}}} {2}'.format(name, labels, stats.count))
+        simple_metrics = (
+            ('operations_in_flight', 'gauge', 'The operations sending their request.', 'in_flight'),
+            ('operations_total', 'counter', 'The finished operations.', 'count'),
+            ('operation_retries_total', 'counter', 'The requests sent again.', 'retries'),
+            ('request_bytes_total', 'counter', 'The bytes of the request bodies.', 'request_bytes'),
+            ('response_bytes_total', 'counter', 'The bytes of the response bodies.', 'response_bytes'),
+        )
+        for suffix, metric_type, description, attribute in simple_metrics:
+            name = '{0}_{1}'.format(self.namespace, suffix)
+            lines.append('# HELP {0} {1}'.format(name, description))
+            lines.append('# TYPE {0} {1}'.format(name, metric_type))
+            for (service, operation), stats in merged:
+                lines.append(
+                    '{0}{{service="{1}",operation="{2}"}} {3}'.format(
+                        name, _escape(service), _escape(operation), getattr(stats, attribute)
+                    )
+                )
+        name = self.namespace + '_operation_errors_total'
+        lines.append('# HELP {0} The failed operations, by HTTP status.'.format(name))
+        lines.append('# TYPE {0} counter'.format(name))
+        for (service, operation), stats in merged:
+            for status, count in sorted(stats.errors.items()):
+                lines.append(
+                    '{0}{{service="{1}",operation="{2}",status="{3}"}} {4}'.format(
+                        name, _escape(service), _escape(operation), status, count
+                    )
+                )
+        return '\n'.join(lines) + '\n'
+
+    def write_to_file(self, path: str) -> None:
+        """
+        Write the metrics to a file, e.g. for the textfile collector of the node
+        exporter. The file is replaced atomically, so readers never see a partial file.
+        :param str path: The path of the file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.metrics', suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as metrics_file:
+                metrics_file.write(self.render())
+            os.chmod(temporary_path, 0o644)
+            os.replace(temporary_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temporary_path)
+            raise
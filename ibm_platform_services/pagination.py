@@ -0,0 +1,328 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides functionality shared by the pager classes of all service modules.
+"""
+
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .common import get_current_operation_id
+from .compact_models import compact_model_class
+from .instrumentation import get_observers, notify_models
+
+DEFAULT_PREFETCH_DEPTH = 2
+DEFAULT_MAX_WORKERS = 4
+
+# Marks the end of the pages put on the queue of a PrefetchingPager.
+_DONE = object()
+# Marks that a PrefetchingPager has not taken the next item off its queue yet.
+_NOT_TAKEN = object()
+
+
+class _Failure:
+    """Wraps an exception raised while a PrefetchingPager fetched a page."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _put(pages: queue.Queue, item, closed: threading.Event) -> bool:
+    """Put `item` on the bounded `pages` queue unless `closed` is set first; return whether it was put."""
+    while not closed.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class BasePager:
+    """
+    Common functionality shared by the pager classes.
+
+    Subclasses implement has_next() and get_next() for a specific list operation.
+    Pagers are iterable: iterating a pager yields one result item at a time and
+    retrieves the next page only when the items of the current page are consumed.
+    Subclasses set `_model_class` to the model class of their result items.
+    """
+
+    _model_class = None
+
+    def has_next(self) -> bool:
+        """
+        Returns true if there are potentially more results to be retrieved.
+        """
+        raise NotImplementedError()
+
+    def get_next(self) -> List[dict]:
+        """
+        Returns the next page of results.
+        """
+        raise NotImplementedError()
+
+    def get_all(self) -> List[dict]:
+        """
+        Returns all results by invoking get_next() repeatedly
+        until all pages of results have been retrieved.
+        :return: A List[dict], where each element is a dict that represents a result item.
+        :rtype: List[dict]
+        """
+        results = []
+        while self.has_next():
+            results.extend(self.get_next())
+        return results
+
+    def iter_pages(self) -> Iterator[List[dict]]:
+        """
+        Returns a generator that yields the remaining pages of results one at a time.
+        Only the page being yielded is held by the pager, so memory stays bounded
+        by the size of one page regardless of the total number of results.
+        :rtype: Iterator[List[dict]]
+        """
+        while self.has_next():
+            yield self.get_next() or []
+
+    def __iter__(self) -> Iterator[dict]:
+        """
+        Returns a generator that yields the remaining results one at a time,
+        retrieving pages lazily.
+        :rtype: Iterator[dict]
+        """
+        for page in self.iter_pages():
+            yield from page
+
+    def _model_from_dict(self, compact: bool) -> Callable:
+        if self._model_class is None:
+            raise TypeError('{0} does not declare the model class of its results'.format(type(self).__name__))
+        return compact_model_class(self._model_class).from_dict if compact else self._model_class.from_dict
+
+    def iter_models(self, *, compact: bool = False) -> Iterator[object]:
+        """
+        Returns a generator that yields the remaining results one at a time as
+        instances of the pager's model class, built directly from each retrieved
+        page, which is retrieved lazily as in __iter__().
+        :param bool compact: (optional) If true, yield the compact, lazily-decoded
+               variant of the model class (see compact_models.compact_model_class).
+        :rtype: Iterator[object]
+        """
+        from_dict = self._model_from_dict(compact)
+        for page in self.iter_pages():
+            if get_observers():
+                start = time.perf_counter()
+                models = [from_dict(item) for item in page]
+                notify_models(*self._operation(), len(models), time.perf_counter() - start)
+                yield from models
+            else:
+                for item in page:
+                    yield from_dict(item)
+
+    def _operation(self) -> Tuple[Optional[str], Optional[str]]:
+        """Return the service name and ID of the operation that retrieved the last page."""
+        client = getattr(self, '_client', None)
+        return getattr(client, 'DEFAULT_SERVICE_NAME', None), get_current_operation_id()
+
+    def get_all_models(self, *, compact: bool = False) -> List[object]:
+        """
+        Returns all results as instances of the pager's model class.
+        :param bool compact: (optional) If true, return the compact, lazily-decoded
+               variant of the model class.
+        :rtype: List[object]
+        """
+        return list(self.iter_models(compact=compact))
+
+    def prefetch(self, depth: int = DEFAULT_PREFETCH_DEPTH) -> 'PrefetchingPager':
+        """
+        Returns a pager that retrieves the pages of this pager in a background thread,
+        so that page N+1 is requested while the caller is still processing page N.
+        :param int depth: (optional) The maximum number of retrieved pages that are
+               buffered while waiting for the caller.
+        :rtype: PrefetchingPager
+        """
+        return PrefetchingPager(self, depth=depth)
+
+
+def _prefetch_pages(
+    prefetching_pager: 'weakref.ReferenceType[PrefetchingPager]',
+    pager: BasePager,
+    pages: queue.Queue,
+    closed: threading.Event,
+) -> None:
+    """Put the pages of `pager` on the queue of a PrefetchingPager, until it is closed or collected."""
+    try:
+        while not closed.is_set() and pager.has_next():
+            page = pager.get_next()
+            owner = prefetching_pager()
+            if owner is not None:
+                owner._operation_id = get_current_operation_id()
+            del owner
+            _put(pages, page, closed)
+    except BaseException as error:  # pylint: disable=broad-except
+        _put(pages, _Failure(error), closed)
+        return
+    _put(pages, _DONE, closed)
+
+
+class PrefetchingPager(BasePager):
+    """
+    PrefetchingPager retrieves the pages of another pager in a background thread.
+
+    Pages are buffered in a queue of at most `depth` pages; the background thread waits
+    when the buffer is full, so at most `depth` + 1 pages are held in memory at any time.
+    An exception raised while retrieving a page is raised by the get_next() call that
+    would have returned that page. Call close() (or use the pager as a context manager)
+    to stop the background thread when the remaining pages are not needed.
+    """
+
+    def __init__(self, pager: BasePager, *, depth: int = DEFAULT_PREFETCH_DEPTH) -> None:
+        """
+        Initialize a PrefetchingPager object.
+        :param BasePager pager: The pager whose pages are retrieved in the background.
+        :param int depth: (optional) The maximum number of buffered pages.
+        """
+        if depth < 1:
+            raise ValueError('depth must be a positive integer')
+        self._pager = pager
+        self._model_class = pager._model_class
+        self._queue = queue.Queue(maxsize=depth)
+        self._closed = threading.Event()
+        self._thread = None
+        self._pending = _NOT_TAKEN
+        self._finished = False
+        self._operation_id = None
+
+    def _start(self) -> None:
+        if self._thread is None:
+            # The thread only holds a weak reference to this pager, so a pager dropped
+            # without close() is collected, and its finalizer stops the thread.
+            weakref.finalize(self, self._closed.set)
+            self._thread = threading.Thread(
+                target=_prefetch_pages,
+                args=(weakref.ref(self), self._pager, self._queue, self._closed),
+                name='PrefetchingPager',
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _peek(self):
+        if self._pending is _NOT_TAKEN:
+            self._start()
+            self._pending = self._queue.get()
+        return self._pending
+
+    def has_next(self) -> bool:
+        """
+        Returns true if there are more results to be retrieved.
+        Waits for the background thread if the next page has not been retrieved yet.
+        """
+        if self._finished or self._closed.is_set():
+            return False
+        if self._peek() is _DONE:
+            self._finished = True
+            return False
+        return True
+
+    def get_next(self) -> List[dict]:
+        """
+        Returns the next page of results.
+        :rtype: List[dict]
+        """
+        if not self.has_next():
+            raise StopIteration('No more results available')
+        item, self._pending = self._pending, _NOT_TAKEN
+        if isinstance(item, _Failure):
+            self._finished = True
+            raise item.error
+        return item
+
+    def _operation(self) -> Tuple[Optional[str], Optional[str]]:
+        client = getattr(self._pager, '_client', None)
+        return getattr(client, 'DEFAULT_SERVICE_NAME', None), self._operation_id
+
+    def close(self) -> None:
+        """
+        Stops retrieving pages and discards the buffered pages.
+        """
+        self._closed.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._pending = _NOT_TAKEN
+
+    def __enter__(self) -> 'PrefetchingPager':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def iter_pages_concurrently(
+    pagers: Iterable[BasePager], *, max_workers: int = DEFAULT_MAX_WORKERS, depth: int = None
+) -> Iterator[List[dict]]:
+    """
+    Retrieves the pages of several pagers at the same time and yields each page as soon
+    as it has been retrieved.
+
+    Pages of the same pager are yielded in order; pages of different pagers are
+    interleaved in the order in which they arrive. An exception raised by any pager is
+    raised by the generator, which then stops the remaining pagers. Closing the
+    generator early also stops them.
+
+    :param Iterable[BasePager] pagers: The pagers whose pages are retrieved.
+    :param int max_workers: (optional) The maximum number of pagers that retrieve a
+           page at the same time.
+    :param int depth: (optional) The maximum number of retrieved pages that are buffered
+           while waiting for the caller. Defaults to twice `max_workers`.
+    :rtype: Iterator[List[dict]]
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers must be a positive integer')
+    pagers = list(pagers)
+    pages = queue.Queue(maxsize=depth or 2 * max_workers)
+    closed = threading.Event()
+
+    def fetch_pages(pager: BasePager) -> None:
+        try:
+            while not closed.is_set() and pager.has_next():
+                _put(pages, pager.get_next() or [], closed)
+        except BaseException as error:  # pylint: disable=broad-except
+            _put(pages, _Failure(error), closed)
+            return
+        _put(pages, _DONE, closed)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='iter_pages_concurrently') as executor:
+        for pager in pagers:
+            executor.submit(fetch_pages, pager)
+        remaining = len(pagers)
+        try:
+            while remaining:
+                item = pages.get()
+                if item is _DONE:
+                    remaining -= 1
+                elif isinstance(item, _Failure):
+                    raise item.error
+                else:
+                    yield item
+        finally:
+            closed.set()
@@ -0,0 +1,266 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides an adaptive client-side rate limiter for the service clients.
+
+When many threads call a service, the service throttles them with 429 (or 503)
+responses, and retrying each throttled request on its own keeps the service
+saturated. An AdaptiveRateLimiter paces the requests of all the clients of a service
+URL instead: it sends them at most at a fixed rate, with at most a limited number in
+flight, halves that limit when the service throttles a request and raises it again
+while the requests succeed (additive increase, multiplicative decrease), and stops
+sending for the time given by the Retry-After header of a throttled response.
+Throttled requests are retried through the limiter.
+
+    limiter = enable_rate_limiting(tagging_service, rate=50, max_concurrency=16)
+    enable_rate_limiting(other_tagging_service)  # shares `limiter`
+"""
+
+import email.utils
+import random
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from ibm_cloud_sdk_core import ApiException, DetailedResponse
+
+from .common import PlatformBaseService
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_THROTTLE_STATUSES = frozenset([429, 503])
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.1
+DEFAULT_MAX_RETRY_AFTER = 60.0
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the number of seconds to wait given by a Retry-After header, if any."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_time = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_time.timestamp() - time.time(), 0.0)
+
+
+class AdaptiveRateLimiter:
+    """
+    AdaptiveRateLimiter is a request interceptor that paces the requests of the
+    services it is added to.
+
+    A request waits until all of the following hold:
+    - the token bucket has a token: tokens are added at `rate` per second, up to `burst`;
+    - fewer requests than the concurrency limit are in flight;
+    - no Retry-After delay is pending.
+
+    The concurrency limit starts at `initial_concurrency`. A throttled response
+    multiplies it by `decrease_factor`, at most once for the requests that were in
+    flight together, down to `min_concurrency`. Each successful response adds
+    1/limit to it, i.e. about one per round of requests, up to `max_concurrency`.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = None,
+        burst: int = None,
+        initial_concurrency: int = None,
+        min_concurrency: int = 1,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        decrease_factor: float = 0.5,
+        throttle_statuses: Iterable[int] = DEFAULT_THROTTLE_STATUSES,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+    ) -> None:
+        """
+        Initialize an AdaptiveRateLimiter object.
+        :param float rate: (optional) The maximum number of requests per second; by
+               default the rate is not limited.
+        :param int burst: (optional) The number of requests that can be sent at once
+               after an idle period; defaults to `rate`, and to at least 1.
+        :param int initial_concurrency: (optional) The initial concurrency limit;
+               defaults to `max_concurrency`.
+        :param int min_concurrency: (optional) The lowest concurrency limit.
+        :param int max_concurrency: (optional) The highest concurrency limit.
+        :param float decrease_factor: (optional) The factor applied to the
+               concurrency limit when a request is throttled.
+        :param Iterable[int] throttle_statuses: (optional) The HTTP statuses of the
+               throttled responses.
+        :param int max_retries: (optional) The maximum number of times a throttled
+               request is sent again before its ApiException is raised.
+        :param float backoff: (optional) The base delay, in seconds, before retrying
+               a throttled response without Retry-After; it doubles with each retry.
+        :param float max_retry_after: (optional) The longest Retry-After delay, in
+               seconds, that is honored.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError('rate must be positive')
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError('min_concurrency must be between 1 and max_concurrency')
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor must be between 0 and 1')
+        self.rate = rate
+        self.burst = max(burst if burst is not None else (rate or 1), 1)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease_factor = decrease_factor
+        self.throttle_statuses = frozenset(throttle_statuses)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self.throttled = 0
+        self.retried = 0
+        self._limit = float(min(max(initial_concurrency or max_concurrency, min_concurrency), max_concurrency))
+        self._in_flight = 0
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased = 0.0
+        self._condition = threading.Condition()
+
+    def get_concurrency_limit(self) -> int:
+        """
+        Get the current concurrency limit.
+        :rtype: int
+        """
+        return int(self._limit)
+
+    def _wait_time(self, now: float) -> Optional[float]:
+        """Return how long to wait before a request can be sent, 0 to send it now, or None to wait for a release."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self._limit):
+            return None
+        if self.rate is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+        return 0
+
+    def acquire(self) -> float:
+        """
+        Wait until a request can be sent and count it as in flight; call release() when
+        its response is received.
+        :return: The time at which the request was sent, to pass to release().
+        :rtype: float
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait == 0:
+                    if self.rate is not None:
+                        self._tokens -= 1
+                    self._in_flight += 1
+                    return now
+                self._condition.wait(wait)
+
+    def release(self, sent: float, *, throttled: bool = False, retry_after: float = None) -> None:
+        """
+        Count a request as no longer in flight and adapt the concurrency limit.
+        :param float sent: The time returned by acquire() for the request.
+        :param bool throttled: (optional) True if the service throttled the request.
+        :param float retry_after: (optional) The Retry-After delay of the response, in seconds.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                self.throttled += 1
+                # The requests that were in flight together are throttled together: only
+                # decrease the limit once for them.
+                if sent >= self._decreased:
+                    self._limit = max(self.min_concurrency, self._limit * self.decrease_factor)
+                    self._decreased = now
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + min(retry_after, self.max_retry_after))
+            else:
+                self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def __call__(
+        self, service: PlatformBaseService, operation_id: str, request: dict, send, **kwargs
+    ) -> DetailedResponse:
+        attempt = 0
+        while True:
+            sent = self.acquire()
+            try:
+                response = send(request, **kwargs)
+            except ApiException as error:
+                if error.status_code not in self.throttle_statuses:
+                    self.release(sent)
+                    raise
+                # An ApiException raised by another interceptor may have no http response.
+                headers = getattr(error.http_response, 'headers', None) or {}
+                retry_after = _parse_retry_after(headers.get('Retry-After'))
+                self.release(sent, throttled=True, retry_after=retry_after)
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                with self._condition:
+                    self.retried += 1
+                if retry_after is None:
+                    time.sleep(self.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0))
+                continue
+            except BaseException:
+                self.release(sent)
+                raise
+            self.release(sent)
+            return response
+
+
+# The limiters shared by the services with the same service URL.
+_shared_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(service_url: str, **settings) -> AdaptiveRateLimiter:
+    """
+    Get the rate limiter shared by the services with the given service URL, creating it
+    with `settings` (the arguments of AdaptiveRateLimiter) if there is none yet; the
+    settings of an existing limiter are not changed.
+    :param str service_url: The service URL.
+    :rtype: AdaptiveRateLimiter
+    """
+    key = service_url.rstrip('/')
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = _shared_limiters[key] = AdaptiveRateLimiter(**settings)
+        return limiter
+
+
+def enable_rate_limiting(service: PlatformBaseService, **settings) -> AdaptiveRateLimiter:
+    """
+    Pace the requests of a service with the rate limiter shared by all the services with
+    its service URL (see get_shared_rate_limiter()). Set the service URL of the service
+    before calling this method.
+    :param PlatformBaseService service: The service client.
+    :return: The rate limiter.
+    :rtype: AdaptiveRateLimiter
+    """
+    limiter = get_shared_rate_limiter(service.service_url, **settings)
+    if limiter not in service.get_interceptors():
+        service.add_interceptor(limiter)
+    return limiter
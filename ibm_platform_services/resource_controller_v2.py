@@ -29,19 +29,20 @@ from enum import Enum
 from typing import Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse, get_query_param
+from ibm_cloud_sdk_core import DetailedResponse, get_query_param
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_model, datetime_to_string, string_to_datetime
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class ResourceControllerV2(BaseService):
+class ResourceControllerV2(PlatformBaseService):
     """The resource_controller V2 service."""
 
     DEFAULT_SERVICE_URL = 'https://resource-controller.cloud.ibm.com'
@@ -72,7 +73,7 @@ class ResourceControllerV2(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Resource Instances
@@ -3872,11 +3873,14 @@ class ResourceKeysList:
 ##############################################################################
 
 
-class ResourceInstancesPager:
+class ResourceInstancesPager(BasePager):
     """
     ResourceInstancesPager can be used to simplify the use of the "list_resource_instances" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ResourceInstance
+
     def __init__(
         self,
         *,
@@ -3982,11 +3986,14 @@ class ResourceInstancesPager:
         return results
 
 
-class ResourceAliasesForInstancePager:
+class ResourceAliasesForInstancePager(BasePager):
     """
     ResourceAliasesForInstancePager can be used to simplify the use of the "list_resource_aliases_for_instance" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ResourceAlias
+
     def __init__(
         self,
         *,
@@ -4050,11 +4057,14 @@ class ResourceAliasesForInstancePager:
         return results
 
 
-class ResourceKeysForInstancePager:
+class ResourceKeysForInstancePager(BasePager):
     """
     ResourceKeysForInstancePager can be used to simplify the use of the "list_resource_keys_for_instance" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ResourceKey
+
     def __init__(
         self,
         *,
@@ -4118,11 +4128,14 @@ class ResourceKeysForInstancePager:
         return results
 
 
-class ResourceKeysPager:
+class ResourceKeysPager(BasePager):
     """
     ResourceKeysPager can be used to simplify the use of the "list_resource_keys" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ResourceKey
+
     def __init__(
         self,
         *,
@@ -4207,11 +4220,14 @@ class ResourceKeysPager:
         return results
 
 
-class ResourceBindingsPager:
+class ResourceBindingsPager(BasePager):
     """
     ResourceBindingsPager can be used to simplify the use of the "list_resource_bindings" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ResourceBinding
+
     def __init__(
         self,
         *,
@@ -4302,11 +4318,14 @@ class ResourceBindingsPager:
         return results
 
 
-class ResourceAliasesPager:
+class ResourceAliasesPager(BasePager):
     """
     ResourceAliasesPager can be used to simplify the use of the "list_resource_aliases" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ResourceAlias
+
     def __init__(
         self,
         *,
@@ -4402,11 +4421,14 @@ class ResourceAliasesPager:
         return results
 
 
-class ResourceBindingsForAliasPager:
+class ResourceBindingsForAliasPager(BasePager):
     """
     ResourceBindingsForAliasPager can be used to simplify the use of the "list_resource_bindings_for_alias" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = ResourceBinding
+
     def __init__(
         self,
         *,
@@ -0,0 +1,183 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides a cache for the responses of read-only operations.
+
+A ResponseCache is a request interceptor (see common.PlatformBaseService) that
+caches the results of the GET operations listed in its `ttls`:
+
+    cache = ResponseCache(ResponseCache.CATALOG_TTLS, max_bytes=32 * 1024 * 1024)
+    global_catalog_service.add_interceptor(cache)
+    resource_manager_service.add_interceptor(cache)
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from ibm_cloud_sdk_core import ApiException, DetailedResponse
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# The request headers that select the representation returned by an operation.
+_VARY_HEADERS = ('Accept', 'Accept-Language')
+
+
+class _Entry(NamedTuple):
+    body: str
+    headers: dict
+    status_code: int
+    etag: Optional[str]
+    expires: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def response(self) -> DetailedResponse:
+        # Every caller gets its own copy of the result.
+        return DetailedResponse(
+            response=json.loads(self.body), headers=CaseInsensitiveDict(self.headers), status_code=self.status_code
+        )
+
+
+class ResponseCache:
+    """
+    ResponseCache caches the JSON results of GET operations for a per-operation time.
+
+    Results are cached by URL, query parameters and the Accept and Accept-Language
+    headers, and returned from the cache until their TTL has expired. An expired result
+    that came with an ETag is revalidated with an `If-None-Match` request; a
+    `304 Not Modified` response renews the cached result without transferring it again.
+    The least recently used results are evicted when the size of the cached results
+    exceeds `max_bytes`.
+
+    Credentials are not part of the cache key, so use one cache per account or
+    credential when the results depend on the caller.
+    """
+
+    # The TTLs of the catalog lookups, which return data that rarely changes.
+    CATALOG_TTLS = {
+        'get_catalog_entry': 300.0,
+        'get_child_objects': 300.0,
+        'get_pricing': 300.0,
+        'get_resource_group': 60.0,
+    }
+
+    def __init__(self, ttls: Dict[str, float], *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initialize a ResponseCache object.
+        :param Dict[str, float] ttls: The number of seconds for which the result of
+               each cached operation is reused, by operation ID (e.g.
+               `get_catalog_entry`). Operations that are not listed are not cached.
+        :param int max_bytes: (optional) The maximum total size of the cached results,
+               in bytes of JSON.
+        """
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be a positive integer')
+        self.ttls = dict(ttls)
+        self.max_bytes = max_bytes
+        # The number of results returned from the cache, fetched from the service,
+        # renewed by a 304 response, and evicted to stay below max_bytes.
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, service, operation_id: str, request: dict, send, **kwargs) -> DetailedResponse:
+        ttl = self.ttls.get(operation_id)
+        if ttl is None or request['method'] != 'GET' or kwargs.get('stream'):
+            return send(request, **kwargs)
+        key = self._key(request)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.expires > now:
+                    self.hits += 1
+                    return entry.response()
+        if entry is not None and entry.etag:
+            request = dict(request, headers=request['headers'].copy())
+            request['headers']['If-None-Match'] = entry.etag
+            try:
+                response = send(request, **kwargs)
+            except ApiException as error:
+                if error.status_code != 304:
+                    raise
+                entry = entry._replace(expires=time.monotonic() + ttl)
+                with self._lock:
+                    self.revalidations += 1
+                    self._store(key, entry)
+                return entry.response()
+        else:
+            response = send(request, **kwargs)
+        with self._lock:
+            self.misses += 1
+        result = response.get_result()
+        if response.get_status_code() == 200 and isinstance(result, (dict, list)):
+            headers = response.get_headers()
+            entry = _Entry(json.dumps(result), dict(headers), 200, headers.get('ETag'), time.monotonic() + ttl)
+            with self._lock:
+                self._store(key, entry)
+        return response
+
+    @staticmethod
+    def _key(request: dict) -> tuple:
+        params = request.get('params') or {}
+        headers = request['headers']
+        return (
+            request['url'],
+            tuple(sorted((k, str(v)) for (k, v) in params.items())),
+            tuple(headers.get(name) for name in _VARY_HEADERS),
+        )
+
+    def _store(self, key: tuple, entry: _Entry) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old.size
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._size += entry.size
+        while self._size > self.max_bytes:
+            (_, evicted) = self._entries.popitem(last=False)
+            self._size -= evicted.size
+            self.evictions += 1
+
+    def get_size(self) -> int:
+        """
+        Get the total size of the cached results, in bytes of JSON.
+        """
+        return self._size
+
+    def clear(self) -> None:
+        """
+        Remove every cached result; the counters are not reset.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,183 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides connection pools that can be tuned and shared by service clients.
+
+By default each client has its own `requests` session with urllib3's default pool of
+10 connections per host; connections beyond that are opened and closed for every
+request. A SessionFactory sizes the pools and shares them between clients:
+
+    factory = SessionFactory(pool_maxsize=64, max_retries=3)
+    tagging_service = GlobalTaggingV1.new_instance()
+    access_groups_service = IamAccessGroupsV2.new_instance()
+    factory.configure_service(tagging_service)
+    factory.configure_service(access_groups_service)
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from ibm_cloud_sdk_core.http_adapter import SSLHTTPAdapter
+from urllib3.util.retry import Retry
+
+from .common import PlatformBaseService
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
+DEFAULT_RETRY_INTERVAL = 30.0
+
+
+class PooledHTTPAdapter(SSLHTTPAdapter):
+    """
+    An SSLHTTPAdapter with configurable connection pools and keep-alive.
+    """
+
+    def __init__(self, *args, keep_alive: bool = True, **kwargs) -> None:
+        self.keep_alive = keep_alive
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        if not self.keep_alive:
+            request.headers['Connection'] = 'close'
+        return super().send(request, **kwargs)
+
+
+def _retry_key(retry_config: Optional[Retry]) -> Optional[tuple]:
+    """Return a hashable value that identifies the settings of `retry_config`."""
+    if retry_config is None:
+        return None
+    return (
+        retry_config.total,
+        retry_config.backoff_factor,
+        getattr(retry_config, 'backoff_max', None),
+        tuple(retry_config.status_forcelist or ()),
+        tuple(sorted(retry_config.allowed_methods or ())),
+    )
+
+
+class SessionFactory:
+    """
+    SessionFactory owns the http adapters, and so the connection pools, shared by the
+    services configured with it.
+
+    Services with the same retry and SSL verification settings share one adapter; an
+    adapter keeps a pool of up to `pool_maxsize` connections for each of up to
+    `pool_connections` hosts. Changing the retry or SSL verification settings of a
+    service moves it to the adapter for its new settings, so the settings of the other
+    services are not affected.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        max_retries: int = None,
+        retry_interval: float = DEFAULT_RETRY_INTERVAL,
+    ) -> None:
+        """
+        Initialize a SessionFactory object.
+        :param int pool_connections: (optional) The number of hosts for which
+               connection pools are kept.
+        :param int pool_maxsize: (optional) The maximum number of connections kept
+               open for each host.
+        :param bool pool_block: (optional) If true, a request waits for a free
+               connection when `pool_maxsize` connections to its host are in use,
+               instead of opening a connection that is closed after the request.
+        :param bool keep_alive: (optional) If false, every connection is closed after
+               one request.
+        :param int max_retries: (optional) If set, configure_service() enables
+               automatic retries with this maximum number of retries.
+        :param float retry_interval: (optional) The maximum wait time, in seconds,
+               between the automatic retries enabled by configure_service().
+        """
+        if pool_connections < 1:
+            raise ValueError('pool_connections must be a positive integer')
+        if pool_maxsize < 1:
+            raise ValueError('pool_maxsize must be a positive integer')
+        if max_retries is not None and max_retries < 0:
+            raise ValueError('max_retries must not be negative')
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self._adapters: Dict[tuple, PooledHTTPAdapter] = {}
+        self._lock = threading.Lock()
+
+    def get_adapter(self, *, retry_config: Retry = None, disable_ssl_verification: bool = False) -> PooledHTTPAdapter:
+        """
+        Get the shared http adapter for the given retry and SSL verification settings.
+        :param Retry retry_config: (optional) The retry settings of the adapter.
+        :param bool disable_ssl_verification: (optional) If true, the adapter does
+               not verify the certificates of the servers.
+        :rtype: PooledHTTPAdapter
+        """
+        key = (_retry_key(retry_config), bool(disable_ssl_verification))
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is None:
+                adapter = PooledHTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    pool_block=self.pool_block,
+                    max_retries=retry_config if retry_config is not None else 0,
+                    keep_alive=self.keep_alive,
+                    _disable_ssl_verification=disable_ssl_verification,
+                )
+                self._adapters[key] = adapter
+            return adapter
+
+    def create_session(self, *, disable_ssl_verification: bool = False) -> requests.Session:
+        """
+        Create a `requests` session that uses the shared connection pools, e.g. for
+        requests that are not sent through a service client.
+        :param bool disable_ssl_verification: (optional) If true, the session does
+               not verify the certificates of the servers.
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        adapter = self.get_adapter(disable_ssl_verification=disable_ssl_verification)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def configure_service(self, service: PlatformBaseService) -> PlatformBaseService:
+        """
+        Send the requests of `service` through the shared connection pools and, if
+        `max_retries` is set, enable automatic retries for it.
+        :param PlatformBaseService service: The service client to configure.
+        :return: The service client.
+        :rtype: PlatformBaseService
+        """
+        service.set_session_factory(self)
+        if self.max_retries is not None:
+            service.enable_retries(max_retries=self.max_retries, retry_interval=self.retry_interval)
+        return service
+
+    def close(self) -> None:
+        """
+        Close the pooled connections. The pools are reopened by the next request.
+        """
+        with self._lock:
+            adapters = list(self._adapters.values())
+        for adapter in adapters:
+            adapter.close()
@@ -0,0 +1,140 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides the coalescing of identical concurrent GET requests.
+
+A RequestCoalescer is a request interceptor (see common.PlatformBaseService) that
+lets the threads that send the same GET request at the same time share one request
+and its result:
+
+    coalescer = RequestCoalescer()
+    resource_manager_service.add_interceptor(coalescer)
+"""
+
+import copy
+import json
+import threading
+from typing import Dict, Iterable
+
+from ibm_cloud_sdk_core import DetailedResponse
+from requests.structures import CaseInsensitiveDict
+
+# The request headers that select the representation returned by an operation, or
+# the caller it is returned to.
+_KEY_HEADERS = ('Accept', 'Accept-Language', 'Authorization')
+
+
+class _Call:
+    """A request in flight, and the number of threads waiting for its result."""
+
+    __slots__ = ('done', 'waiters', 'response', 'body', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.waiters = 0
+        self.response = None
+        self.body = None
+        self.error = None
+
+    def result(self) -> DetailedResponse:
+        """Return a copy of the response of the call for a waiting thread, or raise a copy of its exception."""
+        if self.error is not None:
+            raise copy.copy(self.error)
+        response = self.response
+        result = json.loads(self.body) if self.body is not None else response.get_result()
+        return DetailedResponse(
+            response=result, headers=CaseInsensitiveDict(response.get_headers()), status_code=response.get_status_code()
+        )
+
+
+class RequestCoalescer:
+    """
+    RequestCoalescer shares one request among the threads that send identical GET
+    requests at the same time.
+
+    Requests are identical when they have the same URL, query parameters and Accept,
+    Accept-Language and Authorization headers. The first thread sends the request;
+    the threads that send an identical request before it is answered wait for it and
+    get a copy of its result, or of the exception it raised. Nothing is cached: a
+    request sent after the answer is sent again.
+    """
+
+    def __init__(self, operations: Iterable[str] = None) -> None:
+        """
+        Initialize a RequestCoalescer object.
+        :param Iterable[str] operations: (optional) The IDs of the operations whose
+               requests are coalesced, e.g. `get_resource_group`; by default the
+               requests of all the GET operations are.
+        """
+        self.operations = frozenset(operations) if operations is not None else None
+        self.sent = 0
+        self.coalesced = 0
+        self._calls: Dict[tuple, _Call] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, service, operation_id: str, request: dict, send, **kwargs) -> DetailedResponse:
+        if (
+            request['method'] != 'GET'
+            or kwargs.get('stream')
+            or (self.operations is not None and operation_id not in self.operations)
+        ):
+            return send(request, **kwargs)
+        key = self._key(request)
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.sent += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            return call.result()
+        try:
+            response = send(request, **kwargs)
+        except BaseException as error:
+            with self._lock:
+                del self._calls[key]
+            call.error = error
+            call.done.set()
+            raise
+        with self._lock:
+            # No thread can join the call once it is removed, so `waiters` is final.
+            del self._calls[key]
+            waiters = call.waiters
+        call.response = response
+        if waiters and isinstance(response.get_result(), (dict, list)):
+            call.body = json.dumps(response.get_result())
+        call.done.set()
+        return response
+
+    @staticmethod
+    def _key(request: dict) -> tuple:
+        params = request.get('params') or {}
+        headers = request['headers']
+        return (
+            request['url'],
+            tuple(sorted((k, str(v)) for (k, v) in params.items())),
+            tuple(headers.get(name) for name in _KEY_HEADERS),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of distinct requests in flight."""
+        return len(self._calls)
@@ -0,0 +1,209 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides an on-disk cache of IAM access tokens shared by processes.
+
+Each process that authenticates with IAM requests its own access token, so short-lived
+processes such as scripts and cron jobs pay for a token request every time they
+start. A DiskTokenCache stores the token responses of the authenticators attached to
+it in files keyed by the fingerprint of their credential, so that the next process
+that uses the same credential starts with a valid token:
+
+    cache = DiskTokenCache()
+    cache.attach(authenticator, credential_fingerprint(read_external_sources('resource_controller')))
+
+The cache is enabled for the clients created by new_instance() with the
+`<SERVICE_NAME>_TOKEN_CACHE=true` property of the external configuration, and for the
+clients created by a client_factory.ClientFactory with its `token_cache` argument.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Iterator, Optional
+
+import jwt
+from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
+from ibm_cloud_sdk_core.token_managers.jwt_token_manager import JWTTokenManager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+# The fraction of the lifetime of a token after which the token managers of the core
+# library refresh it. Cached tokens are only reused before that point.
+_REFRESH_FRACTION = 0.8
+
+
+def default_token_cache_directory() -> str:
+    """
+    Return the default directory of a DiskTokenCache: `ibm-platform-services/tokens`
+    in the user's cache directory ($XDG_CACHE_HOME, or ~/.cache).
+    :rtype: str
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'ibm-platform-services', 'tokens')
+
+
+def _refresh_time(token_response: dict, token_name: str) -> Optional[float]:
+    """Return the time after which the token of `token_response` should be refreshed, if it is valid."""
+    try:
+        claims = jwt.decode(
+            token_response[token_name],
+            algorithms=['RS256'],
+            options={'verify_signature': False, 'verify_aud': False},
+        )
+        exp, iat = claims['exp'], claims['iat']
+        return exp - (exp - iat) * (1 - _REFRESH_FRACTION)
+    except (KeyError, TypeError, jwt.PyJWTError):
+        return None
+
+
+class DiskTokenCache:
+    """
+    DiskTokenCache stores token responses in files of one directory, one file for each
+    credential fingerprint.
+
+    The files are only readable by their owner. The requests of the token managers
+    attached to the cache are serialized by a lock file for each fingerprint, so the
+    processes that start together with an empty cache request one token between them;
+    a cached token is reused until the time at which its token manager would refresh it.
+    """
+
+    def __init__(self, directory: str = None) -> None:
+        """
+        Initialize a DiskTokenCache object.
+        :param str directory: (optional) The directory of the cache files; it is
+               created if needed. Defaults to default_token_cache_directory().
+        """
+        self.directory = directory or default_token_cache_directory()
+
+    def load(self, fingerprint: str, *, token_name: str = 'access_token') -> Optional[dict]:
+        """
+        Get the cached token response of a credential, if its token is still fresh.
+        :param str fingerprint: The fingerprint of the credential.
+        :param str token_name: (optional) The name of the token in the token response.
+        :return: The token response, or None.
+        :rtype: dict
+        """
+        try:
+            with open(self._path(fingerprint, '.json'), encoding='utf-8') as token_file:
+                token_response = json.load(token_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            logger.debug('Ignoring unreadable token cache file: %s', error)
+            return None
+        if not isinstance(token_response, dict):
+            return None
+        refresh_time = _refresh_time(token_response, token_name)
+        if refresh_time is None or refresh_time <= time.time():
+            return None
+        return token_response
+
+    def store(self, fingerprint: str, token_response: dict) -> None:
+        """
+        Cache the token response of a credential.
+        :param str fingerprint: The fingerprint of the credential.
+        :param dict token_response: The response of the token service.
+        """
+        self._make_directory()
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix='.' + fingerprint, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as token_file:
+                json.dump(token_response, token_file)
+            os.replace(temporary_path, self._path(fingerprint, '.json'))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temporary_path)
+            raise
+
+    def remove(self, fingerprint: str) -> None:
+        """
+        Remove the cached token response of a credential, if any.
+        :param str fingerprint: The fingerprint of the credential.
+        """
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._path(fingerprint, '.json'))
+
+    def attach(self, authenticator: Authenticator, fingerprint: str) -> bool:
+        """
+        Share the tokens of an authenticator through this cache.
+
+        If the cache has a fresh token for the credential, the authenticator starts with
+        it; the tokens that the authenticator requests later are stored in the cache.
+        Authenticators without a JWT token manager, e.g. BasicAuthenticator, are left
+        unchanged. Attaching an authenticator more than once has no effect.
+        :param Authenticator authenticator: The authenticator.
+        :param str fingerprint: The fingerprint of the credential of the authenticator.
+        :return: True if the tokens of the authenticator are cached.
+        :rtype: bool
+        """
+        token_manager = getattr(authenticator, 'token_manager', None)
+        if not isinstance(token_manager, JWTTokenManager):
+            return False
+        if getattr(token_manager, '_disk_token_cache', None) is not None:
+            return True
+        request_token = token_manager.request_token
+
+        def request_cached_token() -> dict:
+            # Another process may have requested a token while this one waited for the lock.
+            with self._locked(fingerprint):
+                token_response = self.load(fingerprint, token_name=token_manager.token_name)
+                if token_response is None:
+                    token_response = request_token()
+                    self.store(fingerprint, token_response)
+                return token_response
+
+        token_manager.request_token = request_cached_token
+        token_manager._disk_token_cache = self
+        if token_manager.access_token is None:
+            token_response = self.load(fingerprint, token_name=token_manager.token_name)
+            if token_response is not None:
+                token_manager._save_token_info(token_response)
+        return True
+
+    def _path(self, fingerprint: str, suffix: str) -> str:
+        return os.path.join(self.directory, fingerprint + suffix)
+
+    def _make_directory(self) -> None:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    @contextlib.contextmanager
+    def _locked(self, fingerprint: str) -> Iterator[None]:
+        """Hold the lock file of `fingerprint`, which serializes the token requests of all processes."""
+        self._make_directory()
+        descriptor = os.open(self._path(fingerprint, '.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(descriptor, fcntl.LOCK_EX)
+            elif msvcrt is not None:  # pragma: no cover
+                msvcrt.locking(descriptor, msvcrt.LK_LOCK, 1)
+            yield
+        finally:
+            # Closing the file releases the lock.
+            os.close(descriptor)
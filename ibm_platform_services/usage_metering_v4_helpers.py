@@ -0,0 +1,268 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides high-level helpers built on the usage_metering V4 service.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Union
+
+from ibm_cloud_sdk_core import ApiException
+
+from .usage_metering_v4 import ResourceInstanceUsage, ResourceUsageDetails, ResponseAccepted, UsageMeteringV4
+
+# The maximum number of usage records accepted by one report_resource_usage request.
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_INTERVAL = 1.0
+# The per-record (and per-request) statuses that are worth submitting again.
+DEFAULT_RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class UsageBatchSubmitter:
+    """
+    UsageBatchSubmitter reports usage records in batches from background threads.
+
+    Records passed to submit() are buffered per resource ID. The buffer of a resource
+    is sent in one report_resource_usage request as soon as it holds `max_batch_size`
+    records, or once its oldest record has waited `flush_interval` seconds. Up to
+    `max_concurrency` requests are sent at the same time; submit() blocks while that
+    many batches are in flight and as many more are waiting.
+
+    The per-record results of each request (ResponseAccepted.resources, in the order of
+    the submitted records) decide what happens next: records with a 2xx status are
+    done, records with a status in `retry_statuses` are submitted again, on their own,
+    up to `max_attempts` times, and the other records have failed. A request that
+    fails as a whole with a status in `retry_statuses` (or without a response) is
+    retried in the same way. Every record ends in exactly one call of `on_result`, if
+    given, with the record and its ResourceUsageDetails; an exception raised by
+    `on_result` does not stop the other calls, and is raised by the next flush() or
+    close().
+
+        with UsageBatchSubmitter(client, flush_interval=10) as submitter:
+            for (resource_id, usage) in records:
+                submitter.submit(resource_id, usage)
+    """
+
+    def __init__(
+        self,
+        client: UsageMeteringV4,
+        *,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_interval: float = DEFAULT_RETRY_INTERVAL,
+        retry_statuses: frozenset = DEFAULT_RETRY_STATUSES,
+        on_result: Callable[[str, Union[ResourceInstanceUsage, dict], ResourceUsageDetails], None] = None,
+    ) -> None:
+        """
+        Initialize a UsageBatchSubmitter object.
+        :param UsageMeteringV4 client: The client used to report the usage.
+        :param int max_batch_size: (optional) The maximum number of records sent in
+               one request.
+        :param float flush_interval: (optional) The maximum number of seconds that a
+               record is buffered before its batch is sent.
+        :param int max_concurrency: (optional) The maximum number of requests that
+               are sent at the same time.
+        :param int max_attempts: (optional) The maximum number of times a record is
+               submitted.
+        :param float retry_interval: (optional) The number of seconds to wait before
+               the first retry; the wait doubles with each further retry.
+        :param frozenset retry_statuses: (optional) The statuses of the records that
+               are submitted again.
+        :param Callable on_result: (optional) Called with the resource ID, the record
+               and its final ResourceUsageDetails once the record is done, from a
+               background thread.
+        """
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be a positive integer')
+        if flush_interval <= 0:
+            raise ValueError('flush_interval must be positive')
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be a positive integer')
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be a positive integer')
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.retry_interval = retry_interval
+        self.retry_statuses = frozenset(retry_statuses)
+        self.on_result = on_result
+        # The number of records that were accepted, that failed, and that were submitted again.
+        self.accepted = 0
+        self.failed = 0
+        self.retried = 0
+        self._lock = threading.Lock()
+        # resource_id -> (time of the oldest record, records)
+        self._buffers: Dict[str, tuple] = {}
+        self._futures = set()
+        # The exceptions raised by on_result and by the batches, raised by the next flush().
+        self._errors: List[BaseException] = []
+        self._slots = threading.BoundedSemaphore(2 * max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='UsageBatchSubmitter')
+        self._closed = threading.Event()
+        self._timer = threading.Thread(target=self._flush_periodically, name='UsageBatchSubmitter', daemon=True)
+        self._timer.start()
+
+    def submit(self, resource_id: str, usage: Union[ResourceInstanceUsage, dict]) -> None:
+        """
+        Buffer a usage record to be reported for the resource `resource_id`.
+        :param str resource_id: The resource for which the usage is submitted.
+        :param ResourceInstanceUsage usage: The usage record, as a model or a dict.
+        """
+        if not resource_id:
+            raise ValueError('resource_id must be provided')
+        if usage is None:
+            raise ValueError('usage must be provided')
+        if self._closed.is_set():
+            raise RuntimeError('UsageBatchSubmitter is closed')
+        with self._lock:
+            (started, records) = self._buffers.setdefault(resource_id, (time.monotonic(), []))
+            records.append(usage)
+            if len(records) < self.max_batch_size:
+                return
+            del self._buffers[resource_id]
+        self._dispatch(resource_id, records)
+
+    def flush(self) -> None:
+        """
+        Send every buffered record and wait until all the batches in flight are done.
+
+        The first exception raised by `on_result` since the previous flush() is raised
+        once the batches are done.
+        """
+        with self._lock:
+            buffers, self._buffers = self._buffers, {}
+        for (resource_id, (_, records)) in buffers.items():
+            self._dispatch(resource_id, records)
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self) -> None:
+        """
+        Flush the buffered records and stop the background threads.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._timer.join()
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'UsageBatchSubmitter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(min(self.flush_interval, 0.5)):
+            deadline = time.monotonic() - self.flush_interval
+            with self._lock:
+                expired = [r for (r, (started, _)) in self._buffers.items() if started <= deadline]
+                batches = [(r, self._buffers.pop(r)[1]) for r in expired]
+            for (resource_id, records) in batches:
+                self._dispatch(resource_id, records)
+
+    def _dispatch(self, resource_id: str, records: List) -> None:
+        self._slots.acquire()
+        future = self._executor.submit(self._send_batch, resource_id, records)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._batch_done)
+
+    def _batch_done(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+            if future.exception() is not None:
+                self._errors.append(future.exception())
+        self._slots.release()
+
+    def _send_batch(self, resource_id: str, records: List) -> None:
+        pending = records
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                with self._lock:
+                    self.retried += len(pending)
+                time.sleep(self.retry_interval * 2 ** (attempt - 2))
+            last_attempt = attempt == self.max_attempts
+            try:
+                response = self.client.report_resource_usage(resource_id, pending)
+                details = ResponseAccepted.from_dict(response.get_result()).resources
+            except ApiException as error:
+                if error.status_code in self.retry_statuses and not last_attempt:
+                    continue
+                self._finish(resource_id, pending, _request_failure(error, resource_id))
+                return
+            except Exception as error:  # pylint: disable=broad-except
+                if not last_attempt:
+                    continue
+                self._finish(resource_id, pending, _request_failure(error, resource_id))
+                return
+            if len(details) != len(pending):
+                # The results cannot be matched with the records; don't guess which ones to resend.
+                failure = ResourceUsageDetails(
+                    500,
+                    resource_id,
+                    code='unmatched_results',
+                    message='Expected {0} results, got {1}'.format(len(pending), len(details)),
+                )
+                self._finish(resource_id, pending, failure)
+                return
+            retry = []
+            for (record, result) in zip(pending, details):
+                if result.status in self.retry_statuses and not last_attempt:
+                    retry.append(record)
+                else:
+                    self._finish(resource_id, [record], result)
+            if not retry:
+                return
+            pending = retry
+
+    def _finish(self, resource_id: str, records: List, result: ResourceUsageDetails) -> None:
+        with self._lock:
+            if 200 <= result.status < 300:
+                self.accepted += len(records)
+            else:
+                self.failed += len(records)
+        if self.on_result is not None:
+            for record in records:
+                try:
+                    self.on_result(resource_id, record, result)
+                except Exception as error:  # pylint: disable=broad-except
+                    with self._lock:
+                        self._errors.append(error)
+
+
+def _request_failure(error: Exception, resource_id: str) -> ResourceUsageDetails:
+    """Return the result of the records of a request that failed as a whole."""
+    if isinstance(error, ApiException):
+        return ResourceUsageDetails(error.status_code, resource_id, code='request_failed', message=error.message)
+    return ResourceUsageDetails(0, resource_id, code='request_failed', message=str(error))
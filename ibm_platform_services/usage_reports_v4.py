@@ -26,19 +26,20 @@ from datetime import datetime
 from typing import Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse, get_query_param
+from ibm_cloud_sdk_core import DetailedResponse, get_query_param
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import datetime_to_string, string_to_datetime
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class UsageReportsV4(BaseService):
+class UsageReportsV4(PlatformBaseService):
     """The Usage Reports V4 service."""
 
     DEFAULT_SERVICE_URL = 'https://billing.cloud.ibm.com'
@@ -69,7 +70,7 @@ class UsageReportsV4(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Account operations
@@ -2885,11 +2886,14 @@ class SupportSummary:
 ##############################################################################
 
 
-class GetResourceUsageAccountPager:
+class GetResourceUsageAccountPager(BasePager):
     """
     GetResourceUsageAccountPager can be used to simplify the use of the "get_resource_usage_account" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = InstanceUsage
+
     def __init__(
         self,
         *,
@@ -2994,11 +2998,14 @@ class GetResourceUsageAccountPager:
         return results
 
 
-class GetResourceUsageResourceGroupPager:
+class GetResourceUsageResourceGroupPager(BasePager):
     """
     GetResourceUsageResourceGroupPager can be used to simplify the use of the "get_resource_usage_resource_group" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = InstanceUsage
+
     def __init__(
         self,
         *,
@@ -3100,11 +3107,14 @@ class GetResourceUsageResourceGroupPager:
         return results
 
 
-class GetResourceUsageOrgPager:
+class GetResourceUsageOrgPager(BasePager):
     """
     GetResourceUsageOrgPager can be used to simplify the use of the "get_resource_usage_org" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = InstanceUsage
+
     def __init__(
         self,
         *,
@@ -25,19 +25,20 @@ API Version: 1.0
 from typing import Dict, List
 import json
 
-from ibm_cloud_sdk_core import BaseService, DetailedResponse, get_query_param
+from ibm_cloud_sdk_core import DetailedResponse, get_query_param
 from ibm_cloud_sdk_core.authenticators.authenticator import Authenticator
 from ibm_cloud_sdk_core.get_authenticator import get_authenticator_from_environment
 from ibm_cloud_sdk_core.utils import convert_model
 
-from .common import get_sdk_headers
+from .common import PlatformBaseService, get_sdk_headers
+from .pagination import BasePager
 
 ##############################################################################
 # Service
 ##############################################################################
 
 
-class UserManagementV1(BaseService):
+class UserManagementV1(PlatformBaseService):
     """The User Management V1 service."""
 
     DEFAULT_SERVICE_URL = 'https://user-management.cloud.ibm.com'
@@ -68,7 +69,7 @@ class UserManagementV1(BaseService):
                Get up to date information from https://github.com/IBM/python-sdk-core/blob/main/README.md
                about initializing the authenticator of your choice.
         """
-        BaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
+        PlatformBaseService.__init__(self, service_url=self.DEFAULT_SERVICE_URL, authenticator=authenticator)
 
     #########################
     # Users
@@ -1550,11 +1551,14 @@ class Role:
 ##############################################################################
 
 
-class UsersPager:
+class UsersPager(BasePager):
     """
     UsersPager can be used to simplify the use of the "list_users" method.
     """
 
+    # The model class of the results returned by the pager
+    _model_class = UserProfile
+
     def __init__(
         self,
         *,
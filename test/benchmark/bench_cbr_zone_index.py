@@ -0,0 +1,149 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the lookups of a ZoneAddressIndex against the parsing of the addresses of
+every zone on every check.
+
+`--zones` random zones, each with a few IPv4 addresses, ranges and subnets and some
+IPv6 subnets and excluded addresses, are indexed; the benchmark reports the time to
+build the index, to update one zone, and the time per lookup of
+`--lookups` random addresses, compared with `--naive-lookups` lookups that parse the
+addresses of every zone.
+
+    python test/benchmark/bench_cbr_zone_index.py [--zones 10000] [--lookups 1000000]
+"""
+
+import argparse
+import ipaddress
+import random
+import time
+
+from ibm_platform_services.context_based_restrictions_v1 import Zone
+from ibm_platform_services.context_based_restrictions_v1_helpers import ZoneAddressIndex
+
+
+def _ipv4(rng: random.Random) -> str:
+    return str(ipaddress.IPv4Address(rng.getrandbits(32)))
+
+
+def _address(rng: random.Random) -> dict:
+    kind = rng.random()
+    if kind < 0.4:
+        return {'type': 'ipAddress', 'value': _ipv4(rng)}
+    if kind < 0.6:
+        first = rng.getrandbits(32) & ~0xFFF
+        return {
+            'type': 'ipRange',
+            'value': '{0}-{1}'.format(ipaddress.IPv4Address(first), ipaddress.IPv4Address(first + rng.randrange(4096))),
+        }
+    if kind < 0.9:
+        return {
+            'type': 'subnet',
+            'value': str(ipaddress.ip_network((rng.getrandbits(32), 16 + rng.randrange(16)), False)),
+        }
+    return {'type': 'subnet', 'value': str(ipaddress.ip_network(('2001:db8:{0:x}::'.format(rng.randrange(65536)), 48)))}
+
+
+def _zone(rng: random.Random, index: int, modified: str = '2023-01-01T00:00:00Z') -> Zone:
+    addresses = [_address(rng) for _ in range(rng.randrange(1, 6))]
+    excluded = [{'type': 'ipAddress', 'value': _ipv4(rng)}] if rng.random() < 0.1 else []
+    return Zone.from_dict(
+        {
+            'id': 'zone-{0}'.format(index),
+            'crn': 'crn:zone-{0}'.format(index),
+            'address_count': len(addresses),
+            'excluded_count': len(excluded),
+            'name': 'zone-{0}'.format(index),
+            'account_id': 'acct',
+            'description': '',
+            'addresses': addresses,
+            'excluded': excluded,
+            'href': 'https://cbr.cloud.ibm.com/v1/zones/zone-{0}'.format(index),
+            'created_at': '2023-01-01T00:00:00Z',
+            'created_by_id': 'IBMid-1',
+            'last_modified_at': modified,
+            'last_modified_by_id': 'IBMid-1',
+        }
+    )
+
+
+def naive_find_zones(zones: list, ip: str) -> set:
+    """Parse the addresses of every zone, as a check without an index does."""
+    address = ipaddress.ip_address(ip)
+    found = set()
+    for zone in zones:
+        contained = False
+        for entry in zone.addresses:
+            if entry.type == 'ipAddress':
+                contained = address == ipaddress.ip_address(entry.value)
+            elif entry.type == 'ipRange':
+                (first, last) = entry.value.split('-')
+                contained = ipaddress.ip_address(first) <= address <= ipaddress.ip_address(last)
+            elif entry.type == 'subnet':
+                contained = address in ipaddress.ip_network(entry.value)
+            if contained:
+                break
+        if contained and not any(address == ipaddress.ip_address(e.value) for e in zone.excluded):
+            found.add(zone.id)
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--zones', type=int, default=10000, help='number of zones')
+    parser.add_argument('--lookups', type=int, default=1000000, help='number of index lookups')
+    parser.add_argument('--naive-lookups', type=int, default=20, help='number of lookups without an index')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    zones = [_zone(rng, i) for i in range(args.zones)]
+    ips = [_ipv4(rng) for _ in range(args.lookups)]
+
+    start = time.perf_counter()
+    index = ZoneAddressIndex(zones)
+    index.find_zones('10.0.0.1')
+    print('build: {0:.1f} ms'.format((time.perf_counter() - start) * 1000))
+
+    start = time.perf_counter()
+    for i in range(100):
+        zones[i] = _zone(rng, i, modified='2023-02-01T00:00:00Z')
+        index.update_zone(zones[i])
+    print('update of one zone: {0:.2f} ms'.format((time.perf_counter() - start) * 10))
+
+    start = time.perf_counter()
+    matched = 0
+    for ip in ips:
+        if index.find_zones(ip):
+            matched += 1
+    elapsed = time.perf_counter() - start
+    print(
+        'index: {0} lookups in {1:.2f} s, {2:.2f} us per lookup, {3} matched'.format(
+            len(ips), elapsed, elapsed / len(ips) * 1e6, matched
+        )
+    )
+
+    sample = ips[: args.naive_lookups]
+    start = time.perf_counter()
+    for ip in sample:
+        assert naive_find_zones(zones, ip) == index.find_zones(ip)
+    elapsed = time.perf_counter() - start
+    print('parsing every zone: {0:.0f} us per lookup'.format(elapsed / len(sample) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
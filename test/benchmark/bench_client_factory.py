@@ -0,0 +1,113 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the cold start of a worker that uses four service clients, created with the
+new_instance() method of each service class or with one ClientFactory.
+
+A local IAM stub answers token requests after `--iam-delay` seconds and a local service
+stub answers every operation. Each worker creates its clients and calls one operation
+of each; the benchmark reports the number of token requests and the time until the
+first call of every client has completed.
+
+    python test/benchmark/bench_client_factory.py [--workers 10] [--iam-delay 0.1]
+"""
+
+import argparse
+import os
+import time
+
+import jwt
+
+from ibm_platform_services.client_factory import ClientFactory
+from ibm_platform_services.global_search_v2 import GlobalSearchV2
+from ibm_platform_services.global_tagging_v1 import GlobalTaggingV1
+from ibm_platform_services.iam_access_groups_v2 import IamAccessGroupsV2
+from ibm_platform_services.resource_controller_v2 import ResourceControllerV2
+from stub_server import StubHandler, StubServer
+
+
+class _IamHandler(StubHandler):
+    def respond(self, body: bytes):
+        time.sleep(self.server.delay)
+        now = int(time.time())
+        access_token = jwt.encode(
+            {'iat': now, 'exp': now + 3600}, 'benchmark-signing-key-of-32-bytes', algorithm='HS256'
+        )
+        return (
+            200,
+            {'access_token': access_token, 'refresh_token': 'r', 'token_type': 'Bearer', 'expires_in': 3600},
+            None,
+        )
+
+
+class _ServiceHandler(StubHandler):
+    def respond(self, body: bytes):
+        return (200, {'items': [], 'resources': [], 'groups': []}, None)
+
+
+def first_calls(clients) -> None:
+    """Call one operation of each client."""
+    (resource_controller, global_tagging, global_search, access_groups) = clients
+    resource_controller.get_resource_instance('abc')
+    global_tagging.list_tags()
+    global_search.search(query='*')
+    access_groups.list_access_groups(account_id='abc')
+
+
+SERVICE_CLASSES = (ResourceControllerV2, GlobalTaggingV1, GlobalSearchV2, IamAccessGroupsV2)
+
+
+def with_new_instance():
+    return [service_class.new_instance() for service_class in SERVICE_CLASSES]
+
+
+def with_client_factory():
+    factory = ClientFactory()
+    return [factory.new_instance(service_class) for service_class in SERVICE_CLASSES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--iam-delay', type=float, default=0.1)
+    options = parser.parse_args()
+
+    with StubServer(_IamHandler, delay=options.iam_delay) as iam, StubServer(_ServiceHandler) as service:
+        for service_class in SERVICE_CLASSES:
+            prefix = service_class.DEFAULT_SERVICE_NAME.upper()
+            os.environ[prefix + '_APIKEY'] = 'benchmark-apikey'
+            os.environ[prefix + '_AUTH_URL'] = iam.url
+            os.environ[prefix + '_URL'] = service.url
+
+        print(
+            '{0} workers, each calling {1} clients; {2:.0f} ms IAM latency'.format(
+                options.workers, len(SERVICE_CLASSES), options.iam_delay * 1000
+            )
+        )
+        print('{0:<24}{1:>18}{2:>20}'.format('', 'token requests', 'cold start'))
+        for (label, create_clients) in (('new_instance()', with_new_instance), ('ClientFactory', with_client_factory)):
+            iam.reset()
+            elapsed = 0.0
+            for _ in range(options.workers):
+                start = time.perf_counter()
+                first_calls(create_clients())
+                elapsed += time.perf_counter() - start
+            print('{0:<24}{1:>18}{2:>17.1f} ms'.format(label, iam.requests, elapsed / options.workers * 1000))
+
+
+if __name__ == '__main__':
+    main()
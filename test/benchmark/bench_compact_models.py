@@ -0,0 +1,126 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark ResourceInstance.from_dict against its compact, lazily-decoded variant.
+
+For each representation the benchmark reports the time to deserialize a list response
+of N instances, the time to then read a few plain properties plus one datetime of every
+instance, and the memory retained by the deserialized objects (on top of the json
+dictionaries, which a caller holds in either case).
+
+    python test/benchmark/bench_compact_models.py [--count N]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from ibm_platform_services.compact_models import compact_model_class
+from ibm_platform_services.resource_controller_v2 import ResourceInstance
+
+INSTANCE_TEMPLATE = {
+    'id': 'crn:v1:bluemix:public:cloud-object-storage:global:a/1234:{0}::',
+    'guid': '{0}',
+    'url': '/v2/resource_instances/{0}',
+    'created_at': '2023-01-01T12:00:00.000Z',
+    'updated_at': '2023-02-01T12:00:00.000Z',
+    'created_by': 'IBMid-1234',
+    'updated_by': 'IBMid-1234',
+    'scheduled_reclaim_at': '2023-03-01T12:00:00.000Z',
+    'restored_at': '2023-04-01T12:00:00.000Z',
+    'name': 'instance-{0}',
+    'region_id': 'global',
+    'account_id': '1234',
+    'resource_plan_id': 'plan',
+    'resource_group_id': 'group',
+    'resource_group_crn': 'crn:v1:bluemix:public:resource-controller::a/1234::resource-group:group',
+    'target_crn': 'crn:v1:bluemix:public:globalcatalog::::deployment:plan-global',
+    'parameters': {'key': 'value'},
+    'allow_cleanup': False,
+    'crn': 'crn:v1:bluemix:public:cloud-object-storage:global:a/1234:{0}::',
+    'state': 'active',
+    'type': 'service_instance',
+    'resource_id': 'resource',
+    'dashboard_url': 'https://cloud.ibm.com/{0}',
+    'last_operation': {
+        'type': 'create',
+        'state': 'succeeded',
+        'async': False,
+        'description': 'done',
+        'cancelable': False,
+        'poll': False,
+    },
+    'resource_aliases_url': '/v2/resource_instances/{0}/resource_aliases',
+    'resource_bindings_url': '/v2/resource_instances/{0}/resource_bindings',
+    'resource_keys_url': '/v2/resource_instances/{0}/resource_keys',
+    'plan_history': [{'resource_plan_id': 'plan', 'start_date': '2023-01-01T12:00:00.000Z'}],
+    'migrated': False,
+    'extensions': {},
+    'locked': False,
+}
+
+
+def make_resources(count: int) -> list:
+    """Return `count` distinct resource instance dictionaries, as decoded from a json response."""
+    template = json.dumps(INSTANCE_TEMPLATE)
+    return [json.loads(template.replace('{0}', 'guid-{0}'.format(i))) for i in range(count)]
+
+
+def measure(from_dict, resources: list):
+    """Return (deserialize seconds, access seconds, retained bytes) for `from_dict` over `resources`."""
+    start = time.perf_counter()
+    models = [from_dict(r) for r in resources]
+    deserialize = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for model in models:
+        (model.guid, model.name, model.state, model.created_at)
+    access = time.perf_counter() - start
+    del models
+
+    # Memory is measured in a separate pass because tracing allocations slows everything down.
+    tracemalloc.start()
+    models = [from_dict(r) for r in resources]
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return deserialize, access, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=50000)
+    options = parser.parse_args()
+
+    resources = make_resources(options.count)
+    compact_class = compact_model_class(ResourceInstance)
+    print('{0} resource instances'.format(options.count))
+    print('{0:<28}{1:>14}{2:>14}{3:>14}'.format('', 'from_dict', 'access', 'memory'))
+    for (label, from_dict) in (
+        ('ResourceInstance', ResourceInstance.from_dict),
+        ('CompactResourceInstance', compact_class.from_dict),
+    ):
+        deserialize, access, retained = measure(from_dict, resources)
+        print(
+            '{0:<28}{1:>11.1f} ms{2:>11.1f} ms{3:>11.1f} MB'.format(
+                label, deserialize * 1000, access * 1000, retained / 1e6
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
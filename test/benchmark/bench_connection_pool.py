@@ -0,0 +1,112 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark GlobalTaggingV1.attach_tag driven from many threads with the default
+connection pools against the shared, sized pools of a SessionFactory.
+
+Each thread uses one of `--clients` clients, and the local stub server answers every
+request after `--delay` seconds. The benchmark reports the throughput, the 50th and
+99th percentile latencies, and the number of TCP connections the server accepted. The
+client and the server share one interpreter, so the throughput is bounded by the GIL;
+the connection count shows the connections opened and closed by an undersized pool,
+each of which costs a TLS handshake against a real endpoint.
+
+    python test/benchmark/bench_connection_pool.py [--threads 64] [--requests 6400]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.global_tagging_v1 import GlobalTaggingV1, Resource
+from ibm_platform_services.session_factory import SessionFactory
+from stub_server import StubHandler, StubServer
+
+
+class _AttachHandler(StubHandler):
+    def respond(self, body: bytes):
+        time.sleep(self.server.delay)
+        return (200, {'results': [{'resource_id': 'crn:v1:abc', 'is_error': False}]}, None)
+
+
+def run(server: StubServer, clients: list, threads: int, requests: int):
+    """Return (seconds, sorted latencies) of `requests` attach_tag calls spread over `threads` threads."""
+    resources = [Resource(resource_id='crn:v1:abc')]
+
+    def attach(i: int) -> float:
+        start = time.perf_counter()
+        clients[i % len(clients)].attach_tag(resources, tag_names=['env:bench'])
+        return time.perf_counter() - start
+
+    server.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(attach, range(requests)))
+    return time.perf_counter() - start, latencies
+
+
+def new_clients(server: StubServer, count: int, factory: SessionFactory = None) -> list:
+    clients = []
+    for _ in range(count):
+        client = GlobalTaggingV1(authenticator=NoAuthAuthenticator())
+        client.set_service_url(server.url)
+        if factory is not None:
+            factory.configure_service(client)
+        clients.append(client)
+    return clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=6400)
+    parser.add_argument('--clients', type=int, default=1)
+    parser.add_argument('--delay', type=float, default=0.005)
+    options = parser.parse_args()
+
+    with StubServer(_AttachHandler, delay=options.delay) as server:
+        scenarios = [
+            ('default pools', new_clients(server, options.clients)),
+            (
+                'SessionFactory(pool_maxsize={0})'.format(options.threads),
+                new_clients(server, options.clients, SessionFactory(pool_maxsize=options.threads)),
+            ),
+        ]
+        print(
+            '{0} attach_tag calls from {1} threads over {2} clients, {3:.0f} ms server delay'.format(
+                options.requests, options.threads, options.clients, options.delay * 1000
+            )
+        )
+        print('{0:<32}{1:>12}{2:>12}{3:>12}{4:>14}'.format('', 'req/s', 'p50', 'p99', 'connections'))
+        for (label, clients) in scenarios:
+            run(server, clients, options.threads, options.threads)  # Warm up the pools.
+            seconds, latencies = run(server, clients, options.threads, options.requests)
+            print(
+                '{0:<32}{1:>12.0f}{2:>9.1f} ms{3:>9.1f} ms{4:>14}'.format(
+                    label,
+                    options.requests / seconds,
+                    latencies[len(latencies) // 2] * 1000,
+                    latencies[int(len(latencies) * 0.99)] * 1000,
+                    server.connections,
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the latency of get_resource_group calls against a stub with a slow tail,
+with and without a RequestHedger.
+
+A local stub answers a request after `--latency` seconds, or after `--slow-latency`
+seconds with probability `--slow-fraction`. `--threads` threads share `--count`
+calls through one client; the benchmark reports the requests received by the stub
+and the median, 99th percentile and maximum latency of the calls.
+
+The hedging percentile must stay below the fraction of fast requests: with 5% of
+slow requests, a 95th percentile delay falls among the slow latencies and hedges
+too late.
+
+    python test/benchmark/bench_hedging.py [--count 2000] [--threads 8] [--percentile 90]
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.hedging import RequestHedger
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
+from ibm_platform_services.session_factory import SessionFactory
+from stub_server import StubHandler, StubServer
+
+
+class _SlowTailHandler(StubHandler):
+    def respond(self, body: bytes):
+        server = self.server
+        time.sleep(server.slow_latency if random.random() < server.slow_fraction else server.latency)
+        return (200, {'id': self.path.rsplit('/', 1)[1], 'name': 'group', 'state': 'ACTIVE'}, None)
+
+
+def run(server: StubServer, hedger: RequestHedger, threads: int, count: int) -> tuple:
+    service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+    service.set_service_url(server.url)
+    SessionFactory(pool_maxsize=2 * threads).configure_service(service)
+    if hedger is not None:
+        service.add_interceptor(hedger)
+
+    def call(index: int) -> float:
+        start = time.perf_counter()
+        service.get_resource_group('group-{0}'.format(index))
+        return time.perf_counter() - start
+
+    server.reset()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(call, range(count)))
+    return (server.requests, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)], latencies[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=2000, help='number of get_resource_group calls')
+    parser.add_argument('--threads', type=int, default=8, help='number of calling threads')
+    parser.add_argument('--latency', type=float, default=0.01, help='seconds to answer most requests')
+    parser.add_argument('--slow-latency', type=float, default=0.2, help='seconds to answer the slow requests')
+    parser.add_argument('--slow-fraction', type=float, default=0.05, help='fraction of slow requests')
+    parser.add_argument('--percentile', type=float, default=90, help='hedging percentile')
+    parser.add_argument('--budget', type=float, default=0.1, help='hedging budget')
+    args = parser.parse_args()
+
+    with StubServer(
+        _SlowTailHandler, latency=args.latency, slow_latency=args.slow_latency, slow_fraction=args.slow_fraction
+    ) as server:
+        hedger = RequestHedger(percentile=args.percentile, budget=args.budget, initial_delay=args.latency * 2)
+        print('{0:<16} {1:>10} {2:>10} {3:>10} {4:>10}'.format('', 'requests', 'p50 ms', 'p99 ms', 'max ms'))
+        for (name, interceptor) in (('no hedging', None), ('RequestHedger', hedger)):
+            (requests, p50, p99, slowest) = run(server, interceptor, args.threads, args.count)
+            print(
+                '{0:<16} {1:>10} {2:>10.1f} {3:>10.1f} {4:>10.1f}'.format(
+                    name, requests, p50 * 1000, p99 * 1000, slowest * 1000
+                )
+            )
+        print(
+            'delay: {0:.1f} ms, hedges: {1}, won: {2}, denied: {3}'.format(
+                hedger.get_delay('get_resource_group') * 1000, hedger.hedges, hedger.hedges_won, hedger.hedges_denied
+            )
+        )
+        hedger.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the decisions of a PolicyDecisionEngine against a scan of the listed
+policies on every check.
+
+`--policies` random access policies of `--users` users and `--groups` access groups
+are compiled; each grants one or two roles on a service, an instance of a service,
+or the resources of a type, and some are restricted by tags or to working hours.
+The benchmark reports the time to compile the policies, to update one policy, and
+the time per decision of `--decisions` random checks (a user in three access groups
+performing an action on an instance), compared with `--naive-decisions` checks that
+scan every policy.
+
+    python test/benchmark/bench_iam_policy_engine.py [--policies 100000] [--decisions 1000000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from ibm_platform_services.iam_policy_management_v1 import V2Policy
+from ibm_platform_services.iam_policy_management_v1_helpers import PolicyDecisionEngine
+
+_ROLES = ['Viewer', 'Operator', 'Editor', 'Administrator', 'Reader', 'Writer', 'Manager']
+_WORKING_HOURS = {
+    'operator': 'and',
+    'conditions': [
+        {
+            'key': '{{environment.attributes.current_time}}',
+            'operator': 'timeGreaterThanOrEquals',
+            'value': '09:00:00+00:00',
+        },
+        {'key': '{{environment.attributes.current_time}}', 'operator': 'timeLessThan', 'value': '17:00:00+00:00'},
+    ],
+}
+
+
+def _role_crn(role: str) -> str:
+    return 'crn:v1:bluemix:public:iam::::role:' + role
+
+
+def _roles(services: int) -> list:
+    """Return the roles, each granting a few actions on every service."""
+    roles = []
+    for (rank, role) in enumerate(_ROLES):
+        actions = ['svc-{0}.{1}.{2}'.format(s, role.lower(), a) for s in range(services) for a in range(rank + 2)]
+        roles.append({'crn': _role_crn(role), 'display_name': role, 'actions': actions})
+    return roles
+
+
+def _policy(rng: random.Random, index: int, args, modified: str = '2023-01-01T00:00:00Z') -> V2Policy:
+    if rng.random() < 0.3:
+        subject = {
+            'key': 'access_group_id',
+            'operator': 'stringEquals',
+            'value': 'AccessGroupId-{0}'.format(rng.randrange(args.groups)),
+        }
+    else:
+        subject = {'key': 'iam_id', 'operator': 'stringEquals', 'value': 'IBMid-{0}'.format(rng.randrange(args.users))}
+    service = rng.randrange(args.services)
+    attributes = [
+        {'key': 'accountId', 'operator': 'stringEquals', 'value': 'acct'},
+        {'key': 'serviceName', 'operator': 'stringEquals', 'value': 'svc-{0}'.format(service)},
+    ]
+    scope = rng.random()
+    if scope < 0.5:
+        instance = 'instance-{0}-{1}'.format(service, rng.randrange(args.instances))
+        attributes.append({'key': 'serviceInstance', 'operator': 'stringEquals', 'value': instance})
+    elif scope < 0.6:
+        attributes.append({'key': 'resourceType', 'operator': 'stringMatch', 'value': 'bucket*'})
+    data = {
+        'id': 'policy-{0}'.format(index),
+        'type': 'access',
+        'state': 'active',
+        'subject': {'attributes': [subject]},
+        'resource': {'attributes': attributes},
+        'control': {
+            'grant': {'roles': [{'role_id': _role_crn(role)} for role in rng.sample(_ROLES, rng.randint(1, 2))]}
+        },
+        'last_modified_at': modified,
+    }
+    if rng.random() < 0.05:
+        data['resource']['tags'] = [{'key': 'env', 'operator': 'stringEquals', 'value': 'prod'}]
+    if rng.random() < 0.05:
+        data['rule'] = _WORKING_HOURS
+    return V2Policy.from_dict(data)
+
+
+def _check(rng: random.Random, args) -> tuple:
+    user = 'IBMid-{0}'.format(rng.randrange(args.users))
+    groups = ['AccessGroupId-{0}'.format(rng.randrange(args.groups)) for _ in range(3)]
+    service = rng.randrange(args.services)
+    action = 'svc-{0}.{1}.{2}'.format(service, rng.choice(_ROLES).lower(), rng.randrange(3))
+    resource = {
+        'accountId': 'acct',
+        'serviceName': 'svc-{0}'.format(service),
+        'serviceInstance': 'instance-{0}-{1}'.format(service, rng.randrange(args.instances)),
+        'resourceType': rng.choice(['bucket', 'object']),
+    }
+    return (user, groups, action, resource)
+
+
+def naive_is_allowed(
+    policies: list, role_actions: dict, user: str, groups: list, action: str, resource: dict, at
+) -> bool:
+    """Scan every policy, as a check over the listed policies without an engine does."""
+    subjects = {user, *groups}
+    for policy in policies:
+        if policy.subject.attributes[0].value not in subjects:
+            continue
+        if not any(action in role_actions[role['role_id']] for role in policy.control['grant']['roles']):
+            continue
+        matched = True
+        for attribute in policy.resource.attributes:
+            value = resource.get(attribute.key)
+            if attribute.operator == 'stringMatch':
+                matched = value is not None and value.startswith(attribute.value.rstrip('*'))
+            else:
+                matched = value == attribute.value
+            if not matched:
+                break
+        if not matched or policy.resource.tags:
+            continue
+        if policy.rule is not None and not 9 <= at.hour < 17:
+            continue
+        return True
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--policies', type=int, default=100000, help='number of policies')
+    parser.add_argument('--users', type=int, default=20000, help='number of users')
+    parser.add_argument('--groups', type=int, default=1000, help='number of access groups')
+    parser.add_argument('--services', type=int, default=50, help='number of services')
+    parser.add_argument('--instances', type=int, default=20, help='number of instances of each service')
+    parser.add_argument('--decisions', type=int, default=1000000, help='number of engine decisions')
+    parser.add_argument('--naive-decisions', type=int, default=100, help='number of decisions scanning every policy')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    roles = _roles(args.services)
+    role_actions = {role['crn']: set(role['actions']) for role in roles}
+    policies = [_policy(rng, i, args) for i in range(args.policies)]
+    checks = [_check(rng, args) for _ in range(args.decisions)]
+    at = datetime(2023, 6, 5, 12, 0, tzinfo=timezone.utc)
+
+    start = time.perf_counter()
+    engine = PolicyDecisionEngine(policies, roles=roles)
+    print('compile: {0:.0f} ms'.format((time.perf_counter() - start) * 1000))
+
+    policies[:1000] = [_policy(rng, i, args, modified='2023-02-01T00:00:00Z') for i in range(1000)]
+    start = time.perf_counter()
+    for policy in policies[:1000]:
+        engine.update_policy(policy)
+    print('update of one policy: {0:.1f} us'.format((time.perf_counter() - start) * 1000))
+
+    start = time.perf_counter()
+    allowed = 0
+    for (user, groups, action, resource) in checks:
+        if engine.is_allowed(user, action, resource, access_group_ids=groups, at=at):
+            allowed += 1
+    elapsed = time.perf_counter() - start
+    print(
+        'engine: {0} decisions in {1:.2f} s, {2:.2f} us per decision, {3} allowed'.format(
+            len(checks), elapsed, elapsed / len(checks) * 1e6, allowed
+        )
+    )
+
+    sample = checks[: args.naive_decisions]
+    start = time.perf_counter()
+    for (user, groups, action, resource) in sample:
+        expected = engine.is_allowed(user, action, resource, access_group_ids=groups, at=at)
+        assert naive_is_allowed(policies, role_actions, user, groups, action, resource, at) == expected
+    elapsed = time.perf_counter() - start
+    print('scanning every policy: {0:.0f} us per decision'.format(elapsed / len(sample) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
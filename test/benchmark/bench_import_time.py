@@ -0,0 +1,77 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the cost of `from ibm_platform_services import ResourceControllerV2`.
+
+The "eager" case imports every service module, which is what the package __init__
+did before service classes were loaded lazily. Each sample runs in a fresh
+interpreter; pass --no-bytecode to also include compilation of the modules.
+
+    python test/benchmark/bench_import_time.py [--runs N] [--no-bytecode]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import ibm_platform_services
+
+LAZY = 'from ibm_platform_services import ResourceControllerV2'
+EAGER = (
+    LAZY
+    + '\n'
+    + '\n'.join(
+        'import ibm_platform_services.{0}'.format(module) for module in ibm_platform_services._SERVICE_MODULES.values()
+    )
+)
+
+
+def time_import(code: str, runs: int, no_bytecode: bool) -> float:
+    """Return the median wall time in milliseconds of running `code` in a new interpreter."""
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as pycache:
+            args = [sys.executable]
+            if no_bytecode:
+                # An empty bytecode cache forces every module to be compiled again.
+                args += ['-X', 'pycache_prefix=' + pycache]
+            start = time.perf_counter()
+            subprocess.run(args + ['-c', code], check=True)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--no-bytecode', action='store_true', help='ignore cached bytecode')
+    options = parser.parse_args()
+
+    baseline = time_import('pass', options.runs, options.no_bytecode)
+    eager = time_import(EAGER, options.runs, options.no_bytecode)
+    lazy = time_import(LAZY, options.runs, options.no_bytecode)
+    print('interpreter startup:   {0:8.1f} ms'.format(baseline))
+    print('eager (all services):  {0:8.1f} ms'.format(eager))
+    print('lazy (one service):    {0:8.1f} ms'.format(lazy))
+    print('speedup (net of startup): {0:.1f}x'.format((eager - baseline) / max(lazy - baseline, 0.001)))
+
+
+if __name__ == '__main__':
+    main()
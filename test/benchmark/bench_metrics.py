@@ -0,0 +1,101 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the cost of observing operations with PrometheusMetrics from many threads.
+
+Each thread reports --count operations to the collector, spread over a few operation
+IDs. The per-thread statistics of PrometheusMetrics are compared with a collector
+that updates shared statistics under one lock, the usual way of making a collector
+thread-safe.
+
+    python test/benchmark/bench_metrics.py [--count N] [--threads 1,8,32]
+"""
+
+import argparse
+import threading
+import time
+
+from ibm_platform_services.instrumentation import OperationRecord
+from ibm_platform_services.metrics import PrometheusMetrics, _OperationStats
+
+OPERATIONS = ('get_resource_instance', 'list_resource_instances', 'update_resource_instance', 'list_tags')
+
+
+class LockedMetrics(PrometheusMetrics):
+    """PrometheusMetrics with one set of statistics shared by all threads under a lock."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._shared = {}
+        self._shards[id(self._shared)] = self._shared
+
+    def _stats(self, record):
+        key = (record.service_name, record.operation_id)
+        stats = self._shared.get(key)
+        if stats is None:
+            stats = self._shared[key] = _OperationStats(len(self.buckets))
+        return stats
+
+    def operation_started(self, record):
+        with self._lock:
+            super().operation_started(record)
+
+    def operation_finished(self, record):
+        with self._lock:
+            super().operation_finished(record)
+
+
+def observe(metrics: PrometheusMetrics, records: list, count: int) -> None:
+    for index in range(count):
+        record = records[index % len(records)]
+        metrics.operation_started(record)
+        metrics.operation_finished(record)
+
+
+def run(metrics: PrometheusMetrics, threads: int, count: int) -> float:
+    records = []
+    for operation_id in OPERATIONS:
+        record = OperationRecord('resource_controller', operation_id)
+        record.duration = 0.05
+        records.append(record)
+    workers = [threading.Thread(target=observe, args=(metrics, records, count)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    metrics.render()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000, help='operations observed by each thread')
+    parser.add_argument('--threads', default='1,8,32', help='comma-separated numbers of threads')
+    args = parser.parse_args()
+
+    print('{0:>8} {1:>20} {2:>20}'.format('threads', 'per-thread (ns/op)', 'one lock (ns/op)'))
+    for threads in (int(value) for value in args.threads.split(',')):
+        operations = threads * args.count
+        sharded = run(PrometheusMetrics(), threads, args.count)
+        locked = run(LockedMetrics(), threads, args.count)
+        print('{0:>8} {1:>20.0f} {2:>20.0f}'.format(threads, sharded / operations * 1e9, locked / operations * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark bulk attach_tag calls against a stub service that throttles its clients.
+
+The stub answers requests in `--latency` seconds while it has capacity: it accepts
+`--capacity` requests per second and at most `--max-in-flight` requests at once, and
+answers the others at once with 429 (and Retry-After: 1 with --retry-after). Like
+many API gateways, with --count-rejected the stub also counts the throttled requests
+against its capacity.
+`--threads` threads share `--count` attach_tag calls, through several clients of the
+same service URL, with:
+
+- blind retries: every throttled request is retried after a short random delay;
+- the AdaptiveRateLimiter shared by the clients, with its default settings;
+- the AdaptiveRateLimiter with its rate set to the capacity of the stub.
+
+Throttled requests are retried up to 20 times. The benchmark reports the throughput of
+the successful calls, the number of failed calls and the share of throttled requests.
+
+    python test/benchmark/bench_rate_limiter.py [--count 2000] [--threads 32] [--capacity 200]
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.global_tagging_v1 import GlobalTaggingV1, Resource
+from ibm_platform_services.rate_limiter import AdaptiveRateLimiter
+from stub_server import StubHandler, StubServer
+
+CLIENTS = 4
+MAX_RETRIES = 20
+
+
+class _ThrottlingHandler(StubHandler):
+    def respond(self, body: bytes):
+        server = self.server
+        with server.lock:
+            now = time.monotonic()
+            server.tokens = min(server.capacity / 10, server.tokens + (now - server.refilled) * server.capacity)
+            server.refilled = now
+            accepted = server.tokens >= 1 and server.in_flight < server.max_in_flight
+            if accepted:
+                server.tokens -= 1
+                server.in_flight += 1
+            else:
+                server.throttled += 1
+                if server.count_rejected:
+                    # Rejected requests use up the quota too, down to one second of deficit.
+                    server.tokens = max(server.tokens - 1, -server.capacity)
+        if not accepted:
+            return (429, {'errors': [{'code': 'too_many_requests'}]}, server.throttle_headers)
+        time.sleep(server.latency)
+        with server.lock:
+            server.in_flight -= 1
+        return (200, {'results': [{'resource_id': 'r', 'is_error': False}]}, None)
+
+
+def blind_retries(service, operation_id, request, send, **kwargs):
+    """Retry each throttled request on its own, after a short random delay."""
+    for _ in range(MAX_RETRIES):
+        try:
+            return send(request, **kwargs)
+        except ApiException as error:
+            if error.status_code != 429:
+                raise
+            time.sleep(random.uniform(0.01, 0.05))
+    return send(request, **kwargs)
+
+
+def attach_tag(client: GlobalTaggingV1, resources: list) -> bool:
+    """Call attach_tag and return whether it succeeded."""
+    try:
+        client.attach_tag(resources, tag_names=['env:test'])
+        return True
+    except ApiException:
+        return False
+
+
+def run(server: StubServer, interceptor, threads: int, count: int) -> tuple:
+    clients = []
+    for _ in range(CLIENTS):
+        client = GlobalTaggingV1(authenticator=NoAuthAuthenticator())
+        client.set_service_url(server.url)
+        client.add_interceptor(interceptor)
+        clients.append(client)
+    resources = [Resource(resource_id='crn:v1:bluemix:public:resource:us-south:a/1::instance:1')]
+    stub = server._server
+    server.reset()
+    stub.throttled = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        succeeded = sum(executor.map(lambda index: attach_tag(clients[index % CLIENTS], resources), range(count)))
+    elapsed = time.perf_counter() - start
+    return (succeeded / elapsed, count - succeeded, stub.throttled / server.requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=2000, help='number of attach_tag calls')
+    parser.add_argument('--threads', type=int, default=32, help='number of calling threads')
+    parser.add_argument('--capacity', type=float, default=200, help='requests per second accepted by the stub')
+    parser.add_argument('--max-in-flight', type=int, default=8, help='requests processed at once by the stub')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds to process a request')
+    parser.add_argument('--retry-after', action='store_true', help='send Retry-After: 1 with the 429 responses')
+    parser.add_argument(
+        '--count-rejected', action='store_true', help='count the throttled requests against the capacity of the stub'
+    )
+    args = parser.parse_args()
+
+    attributes = {
+        'capacity': args.capacity,
+        'max_in_flight': args.max_in_flight,
+        'latency': args.latency,
+        'tokens': args.capacity / 10,
+        'refilled': time.monotonic(),
+        'in_flight': 0,
+        'throttled': 0,
+        'throttle_headers': {'Retry-After': '1'} if args.retry_after else None,
+        'count_rejected': args.count_rejected,
+    }
+    with StubServer(_ThrottlingHandler, **attributes) as server:
+        print('{0:<36} {1:>12} {2:>8} {3:>12}'.format('', 'calls/s', 'failed', 'throttled'))
+        for (name, interceptor) in (
+            ('blind retries', blind_retries),
+            ('adaptive limiter', AdaptiveRateLimiter(max_retries=MAX_RETRIES)),
+            ('adaptive limiter, rate=capacity', AdaptiveRateLimiter(rate=args.capacity, max_retries=MAX_RETRIES)),
+        ):
+            (throughput, failed, throttled) = run(server, interceptor, args.threads, args.count)
+            print('{0:<36} {1:>12.0f} {2:>8} {3:>11.0%}'.format(name, throughput, failed, throttled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark get_resource_group calls on a few hot IDs from many threads, with and
+without a RequestCoalescer.
+
+A local stub answers every request after `--latency` seconds. `--threads` threads
+share `--count` calls spread over `--ids` resource group IDs through one client; the
+benchmark reports the requests received by the stub and the throughput of the calls.
+
+    python test/benchmark/bench_single_flight.py [--count 5000] [--threads 64] [--ids 8]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
+from ibm_platform_services.session_factory import SessionFactory
+from ibm_platform_services.single_flight import RequestCoalescer
+from stub_server import StubHandler, StubServer
+
+
+class _GroupHandler(StubHandler):
+    def respond(self, body: bytes):
+        time.sleep(self.server.latency)
+        return (200, {'id': self.path.rsplit('/', 1)[1], 'name': 'group', 'state': 'ACTIVE'}, None)
+
+
+def run(server: StubServer, coalescer: RequestCoalescer, threads: int, count: int, ids: int) -> tuple:
+    service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+    service.set_service_url(server.url)
+    SessionFactory(pool_maxsize=threads).configure_service(service)
+    if coalescer is not None:
+        service.add_interceptor(coalescer)
+    server.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda index: service.get_resource_group('group-{0}'.format(index % ids)), range(count)))
+    return (server.requests, count / (time.perf_counter() - start))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=5000, help='number of get_resource_group calls')
+    parser.add_argument('--threads', type=int, default=64, help='number of calling threads')
+    parser.add_argument('--ids', type=int, default=8, help='number of distinct resource group IDs')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds to answer a request')
+    args = parser.parse_args()
+
+    with StubServer(_GroupHandler, latency=args.latency) as server:
+        print('{0:<20} {1:>10} {2:>10}'.format('', 'requests', 'calls/s'))
+        for (name, coalescer) in (('no coalescing', None), ('RequestCoalescer', RequestCoalescer())):
+            (requests, throughput) = run(server, coalescer, args.threads, args.count, args.ids)
+            print('{0:<20} {1:>10} {2:>10.0f}'.format(name, requests, throughput))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local HTTP server that the benchmarks send their requests to.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Base class of the request handlers of the stub servers.
+
+    Subclasses implement respond(), which returns (status, body, headers); the handler
+    counts the requests and the connections of its server.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # The headers and the body are written separately; without TCP_NODELAY the body
+    # waits for the delayed ACK of the headers.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def respond(self, body: bytes):
+        """Return the (status, json body, headers) of the response to the current request."""
+        raise NotImplementedError()
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        with self.server.lock:
+            self.server.requests += 1
+        (status, result, headers) = self.respond(body)
+        payload = json.dumps(result).encode('utf-8') if result is not None else b''
+        self.send_response(status)
+        for (name, value) in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for the connections of all the benchmark threads at once.
+    request_queue_size = 1024
+
+
+class StubServer:
+    """
+    Runs a ThreadingHTTPServer with `handler_class` on a free local port.
+
+        with StubServer(MyHandler) as server:
+            service.set_service_url(server.url)
+    """
+
+    def __init__(self, handler_class: type, **attributes) -> None:
+        self._server = _Server(('127.0.0.1', 0), handler_class)
+        self._server.lock = threading.Lock()
+        self._server.requests = 0
+        self._server.connections = 0
+        for (name, value) in attributes.items():
+            setattr(self._server, name, value)
+        self.url = 'http://127.0.0.1:{0}'.format(self._server.server_address[1])
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        """The number of requests received."""
+        return self._server.requests
+
+    @property
+    def connections(self) -> int:
+        """The number of connections accepted."""
+        return self._server.connections
+
+    def __getattr__(self, name: str):
+        # The attributes given to the constructor, which the handlers may update.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._server, name)
+
+    def reset(self) -> None:
+        """Reset the request and connection counts."""
+        with self._server.lock:
+            self._server.requests = 0
+            self._server.connections = 0
+
+    def __enter__(self) -> 'StubServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._server.shutdown()
+        self._server.server_close()
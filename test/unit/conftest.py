@@ -0,0 +1,37 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Fixtures shared by the unit tests.
+"""
+
+from contextlib import ExitStack
+
+import pytest
+
+# test/ is on sys.path: test/unit is a package and test/ is not.
+from benchmark.stub_server import StubServer
+
+
+@pytest.fixture(name='start_stub_server')
+def fixture_start_stub_server():
+    """
+    Start the StubServer of a handler class (see test/benchmark/stub_server.py);
+    the servers are shut down at the end of the test.
+    """
+    with ExitStack() as stack:
+        yield lambda handler_class, **attributes: stack.enter_context(StubServer(handler_class, **attributes))
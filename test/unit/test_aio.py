@@ -0,0 +1,195 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the async service clients, run against a local stub server
+"""
+
+import asyncio
+import inspect
+import time
+
+import pytest
+from ibm_cloud_sdk_core import ApiException, DetailedResponse
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from benchmark.stub_server import StubHandler
+from ibm_platform_services import aio
+from ibm_platform_services.aio import AsyncGlobalTaggingV1, AsyncResourceControllerV2
+from ibm_platform_services.resource_controller_v2 import ResourceControllerV2, ResourceInstance
+
+RESPONSE_DELAY = 0.2
+
+
+class _StubHandler(StubHandler):
+    """Answers every GET after RESPONSE_DELAY seconds, tracking the number of requests in flight."""
+
+    def respond(self, body):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(RESPONSE_DELAY)
+        with server.lock:
+            server.in_flight -= 1
+        instance_id = self.path.rsplit('/', 1)[-1]
+        if instance_id == 'missing':
+            return (404, {'message': 'not found'}, None)
+        return (200, {'id': instance_id, 'guid': instance_id, 'name': 'instance-' + instance_id}, None)
+
+
+@pytest.fixture(name='stub_server')
+def fixture_stub_server(start_stub_server):
+    """A stub server answering after RESPONSE_DELAY seconds."""
+    return start_stub_server(_StubHandler, in_flight=0, max_in_flight=0)
+
+
+def _new_client(server, **kwargs):
+    service = AsyncResourceControllerV2(NoAuthAuthenticator(), **kwargs)
+    service.set_service_url(server.url)
+    return service
+
+
+class TestAsyncClientClasses:
+    """
+    Test Class for the generated async client classes
+    """
+
+    def test_operations_are_coroutines_with_same_signature(self):
+        """
+        Every public operation is a coroutine function with the synchronous signature
+        """
+        assert issubclass(AsyncResourceControllerV2, ResourceControllerV2)
+        for name in ('list_resource_instances', 'get_resource_instance', 'update_resource_instance'):
+            async_method = getattr(AsyncResourceControllerV2, name)
+            sync_method = getattr(ResourceControllerV2, name)
+            assert inspect.iscoroutinefunction(async_method)
+            assert inspect.signature(async_method) == inspect.signature(sync_method)
+            assert async_method.__doc__ == sync_method.__doc__
+
+    def test_class_is_cached(self):
+        """
+        Each async class is created only once
+        """
+        assert aio.AsyncGlobalTaggingV1 is AsyncGlobalTaggingV1
+        assert 'AsyncContextBasedRestrictionsV1' in dir(aio)
+        with pytest.raises(AttributeError):
+            getattr(aio, 'AsyncNoSuchServiceV9')
+
+    def test_invalid_max_concurrency(self):
+        """
+        max_concurrency must be positive
+        """
+        with pytest.raises(ValueError, match='max_concurrency'):
+            AsyncResourceControllerV2(NoAuthAuthenticator(), max_concurrency=0)
+
+    def test_map_is_rejected(self):
+        """
+        map() cannot run the coroutine operations of an async client
+        """
+        service = AsyncGlobalTaggingV1(NoAuthAuthenticator())
+        with pytest.raises(TypeError, match='list_tags of AsyncGlobalTaggingV1 is a coroutine function'):
+            service.map('list_tags', [{}])
+        service.close()
+
+    def test_connection_pool_sized_to_max_concurrency(self):
+        """
+        The connection pool follows max_concurrency, including after retries are enabled
+        """
+        service = AsyncResourceControllerV2(NoAuthAuthenticator(), max_concurrency=48)
+        assert service.http_adapter._pool_maxsize == 48
+        service.enable_retries()
+        assert service.http_adapter._pool_maxsize == 48
+        service.close()
+
+
+class TestAsyncClientRequests:
+    """
+    Test Class for async operations against a local stub server
+    """
+
+    def test_concurrent_calls_overlap(self, stub_server):
+        """
+        Concurrent operations are in flight at the same time
+        """
+        service = _new_client(stub_server, max_concurrency=10)
+
+        async def run():
+            async with service:
+                return await asyncio.gather(*[service.get_resource_instance(str(i)) for i in range(10)])
+
+        start = time.perf_counter()
+        responses = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+
+        assert [r.get_result()['id'] for r in responses] == [str(i) for i in range(10)]
+        assert all(isinstance(r, DetailedResponse) for r in responses)
+        assert stub_server.max_in_flight > 1
+        # Serial execution would take 10 * RESPONSE_DELAY.
+        assert elapsed < 5 * RESPONSE_DELAY
+
+    def test_max_concurrency_bounds_in_flight_requests(self, stub_server):
+        """
+        No more than max_concurrency requests are sent at the same time
+        """
+        service = _new_client(stub_server, max_concurrency=2)
+
+        async def run():
+            async with service:
+                await asyncio.gather(*[service.get_resource_instance(str(i)) for i in range(6)])
+
+        asyncio.run(run())
+        assert stub_server.max_in_flight == 2
+
+    def test_result_model_handling(self, stub_server):
+        """
+        Results deserialize into the same models as the synchronous client
+        """
+        service = _new_client(stub_server)
+
+        async def run():
+            async with service:
+                return await service.get_resource_instance(id='abc')
+
+        instance = ResourceInstance.from_dict(asyncio.run(run()).get_result())
+        assert instance.name == 'instance-abc'
+
+    def test_error_raises_api_exception(self, stub_server):
+        """
+        Error responses raise ApiException in the awaiting coroutine
+        """
+        service = _new_client(stub_server)
+
+        async def run():
+            async with service:
+                await service.get_resource_instance(id='missing')
+
+        with pytest.raises(ApiException) as exc_info:
+            asyncio.run(run())
+        assert exc_info.value.status_code == 404
+
+    def test_required_param_validation(self):
+        """
+        Parameter validation errors are raised when the coroutine is awaited
+        """
+        service = AsyncResourceControllerV2(NoAuthAuthenticator())
+
+        async def run():
+            await service.get_resource_instance(None)
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+        service.close()
@@ -0,0 +1,192 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the bulk module
+"""
+
+import itertools
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+import responses
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.bulk import BulkMap
+from ibm_platform_services.global_search_v2 import GlobalSearchV2
+from ibm_platform_services.resource_controller_v2 import ResourceControllerV2
+
+_instances_url = re.compile(r'https://resource-controller.cloud.ibm.com/v2/resource_instances/[^/]+$')
+_keys_url = re.compile(r'https://resource-controller.cloud.ibm.com/v2/resource_keys/[^/]+$')
+_search_url = 'https://api.global-search-tagging.cloud.ibm.com/v3/resources/search'
+
+
+def _callback(delay=lambda guid: 0):
+    """Answer with the GUID of the instance after `delay(guid)` seconds, or 404 for the GUIDs starting with `missing`."""
+
+    def callback(request):
+        guid = request.url.rsplit('/', 1)[1]
+        time.sleep(delay(guid))
+        if guid.startswith('missing'):
+            return (404, {}, json.dumps({'message': 'not found'}))
+        return (200, {}, json.dumps({'guid': guid}))
+
+    return callback
+
+
+def _service() -> ResourceControllerV2:
+    return ResourceControllerV2(authenticator=NoAuthAuthenticator())
+
+
+class TestMap:
+    """
+    Test Class for PlatformBaseService.map
+    """
+
+    @responses.activate
+    def test_results_in_order(self):
+        """
+        The results are returned in the order of the items, with the exception of each failed item
+        """
+        # The first items are the slowest, so the operations complete in reverse order.
+        responses.add_callback(
+            responses.GET,
+            _instances_url,
+            callback=_callback(lambda guid: 0.05 * (4 - int(guid[-1]))),
+            content_type='application/json',
+        )
+        ids = ['i0', 'missing1', 'i2', 'missing3']
+        start = time.monotonic()
+        with _service().map('get_resource_instance', ids, max_workers=4) as results:
+            results = list(results)
+        assert time.monotonic() - start < 0.3
+        assert [(result.index, result.item) for result in results] == list(enumerate(ids))
+        assert results[0].get_result() == {'guid': 'i0'}
+        assert results[2].error is None and results[2].response.get_status_code() == 200
+        assert isinstance(results[1].error, ApiException) and results[1].error.status_code == 404
+        assert results[3].response is None
+        with pytest.raises(ApiException):
+            results[3].get_result()
+
+    @responses.activate
+    def test_keyword_items(self):
+        """
+        Dict items are passed as keyword arguments, together with the keyword arguments of map()
+        """
+        responses.add(responses.DELETE, _keys_url, status=204)
+        items = [{'id': 'key-1'}, {'id': 'key-2', 'headers': {'X-Test': 'item'}}]
+        results = list(_service().map('delete_resource_key', items, headers={'X-Test': 'map'}))
+        assert [result.response.get_status_code() for result in results] == [204, 204]
+        sent = sorted((call.request.url.rsplit('/', 1)[1], call.request.headers['X-Test']) for call in responses.calls)
+        assert sent == [('key-1', 'map'), ('key-2', 'item')]
+
+    @responses.activate
+    def test_operation_timeout(self):
+        """
+        The timeout of an operation is passed to the operation, not taken as the deadline of map()
+        """
+        responses.add(responses.POST, _search_url, json={'items': []})
+        service = GlobalSearchV2(authenticator=NoAuthAuthenticator())
+        results = list(service.map('search', [{'query': 'name:a'}, {'query': 'name:b'}], timeout=3000))
+        assert [result.error for result in results] == [None, None]
+        assert all('timeout=3000' in call.request.url for call in responses.calls)
+
+    def test_unknown_operation(self):
+        """
+        Only the operations of the service can be mapped
+        """
+        service = _service()
+        for name in ('list_resource_instance', 'send', 'map', '_intercept', 'DEFAULT_SERVICE_URL'):
+            with pytest.raises(ValueError, match='not an operation of ResourceControllerV2'):
+                service.map(name, [])
+
+    @responses.activate
+    def test_deadline(self):
+        """
+        The items taken but not answered by the deadline are returned with a TimeoutError
+        """
+        responses.add_callback(
+            responses.GET, _instances_url, callback=_callback(lambda guid: 0.2), content_type='application/json'
+        )
+        start = time.monotonic()
+        with _service().map('get_resource_instance', ['i0', 'i1', 'i2'], max_workers=1, deadline=0.1) as results:
+            errors = [result.error for result in results]
+        assert time.monotonic() - start < 0.2
+        assert all(isinstance(error, FutureTimeoutError) for error in errors)
+        # Two items are taken ahead of the results with one worker.
+        assert [str(error) for error in errors] == [
+            'the deadline passed during the call',
+            'the deadline passed before the call',
+        ]
+        # Let the request in flight complete before the mock is stopped.
+        time.sleep(0.15)
+
+    @responses.activate
+    def test_cancel(self):
+        """
+        cancel() stops taking items, and the items taken but not started are returned with a CancelledError
+        """
+        responses.add_callback(
+            responses.GET, _instances_url, callback=_callback(lambda guid: 0.05), content_type='application/json'
+        )
+        taken = []
+        ids = ('i{0}'.format(index) for index in itertools.count() if not taken.append(index))
+        results = _service().map('get_resource_instance', ids, max_workers=1)
+        first = next(results)
+        results.cancel()
+        rest = list(results)
+        assert first.get_result() == {'guid': 'i0'}
+        # The second item may have been started before cancel().
+        assert all(isinstance(result.error, CancelledError) for result in rest[1:])
+        assert [result.index for result in rest] == list(range(1, len(taken)))
+        assert len(taken) <= 3
+        assert len(responses.calls) <= 2
+
+    def test_cancel_from_another_thread(self):
+        """
+        cancel() can be called while another thread takes items and results
+        """
+        interval = sys.getswitchinterval()
+        # Switch threads as often as possible, to interleave cancel() with the consumer.
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(100):
+                results = BulkMap(lambda item: item, range(100000), max_workers=4)
+                first = next(results)
+                canceller = threading.Thread(target=lambda: [results.cancel() for _ in range(20)])
+                canceller.start()
+                rest = list(results)
+                canceller.join()
+                assert first.response == 0
+                assert [result.index for result in rest] == list(range(1, len(rest) + 1))
+                assert all(result.error is None or isinstance(result.error, CancelledError) for result in rest)
+                assert len(rest) < 99999
+        finally:
+            sys.setswitchinterval(interval)
+
+    def test_invalid_max_workers(self):
+        """
+        The number of workers must be positive
+        """
+        with pytest.raises(ValueError, match='max_workers'):
+            BulkMap(print, [], max_workers=0)
@@ -0,0 +1,118 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the client_factory module
+"""
+
+import time
+
+import jwt
+import pytest
+import responses
+
+from ibm_platform_services.client_factory import ClientFactory, credential_fingerprint
+from ibm_platform_services.context_based_restrictions_v1 import ContextBasedRestrictionsV1
+from ibm_platform_services.global_search_v2 import GlobalSearchV2
+from ibm_platform_services.global_tagging_v1 import GlobalTaggingV1
+from ibm_platform_services.resource_controller_v2 import ResourceControllerV2
+from ibm_platform_services.session_factory import SessionFactory
+
+_iam_url = 'https://iam.test.cloud.ibm.com'
+
+
+def _token_response() -> dict:
+    now = int(time.time())
+    access_token = jwt.encode({'iat': now, 'exp': now + 3600}, 'secret' * 8, algorithm='HS256')
+    return {'access_token': access_token, 'refresh_token': 'r', 'token_type': 'Bearer', 'expires_in': 3600}
+
+
+@pytest.fixture(name='credentials')
+def fixture_credentials(monkeypatch):
+    """The credentials of the services in the environment, most of them sharing one API key."""
+    for prefix in ('RESOURCE_CONTROLLER', 'GLOBAL_TAGGING', 'CONTEXT_BASED_RESTRICTIONS'):
+        monkeypatch.setenv(prefix + '_APIKEY', 'shared-key')
+        monkeypatch.setenv(prefix + '_AUTH_URL', _iam_url)
+    monkeypatch.setenv('GLOBAL_TAGGING_URL', 'https://tags.test.cloud.ibm.com')
+    monkeypatch.setenv('GLOBAL_SEARCH_APIKEY', 'other-key')
+    monkeypatch.setenv('GLOBAL_SEARCH_AUTH_URL', _iam_url)
+
+
+class TestClientFactory:
+    """
+    Test Class for ClientFactory
+    """
+
+    def test_credential_fingerprint(self):
+        """
+        The fingerprint depends on the credential properties only
+        """
+        config = {'APIKEY': 'key', 'AUTH_URL': _iam_url}
+        assert credential_fingerprint(config) == credential_fingerprint(dict(config, URL='https://x', MAX_RETRIES='3'))
+        assert credential_fingerprint(config) != credential_fingerprint(dict(config, APIKEY='other'))
+
+    def test_shared_authenticator(self, credentials):
+        """
+        Clients configured with the same credential share one authenticator and one set of pools
+        """
+        factory = ClientFactory()
+        resource_controller = factory.new_instance(ResourceControllerV2)
+        global_tagging = factory.new_instance('GlobalTaggingV1')
+        global_search = factory.new_instance(GlobalSearchV2)
+        assert isinstance(global_tagging, GlobalTaggingV1)
+        assert resource_controller.authenticator is global_tagging.authenticator
+        assert resource_controller.http_adapter is global_tagging.http_adapter
+        assert global_search.authenticator is not resource_controller.authenticator
+        assert global_search.http_adapter is not resource_controller.http_adapter
+        assert factory.get_authenticator('context_based_restrictions') is resource_controller.authenticator
+        # The service properties are still applied to each client.
+        assert global_tagging.service_url == 'https://tags.test.cloud.ibm.com'
+        assert resource_controller.service_url == ResourceControllerV2.DEFAULT_SERVICE_URL
+
+    def test_shared_session_factory(self, credentials):
+        """
+        A session factory passed to the factory is used by every client
+        """
+        session_factory = SessionFactory(pool_maxsize=64)
+        factory = ClientFactory(session_factory=session_factory)
+        assert factory.new_instance(GlobalSearchV2).get_session_factory() is session_factory
+        assert factory.new_instance(ContextBasedRestrictionsV1).get_session_factory() is session_factory
+
+    @responses.activate
+    def test_one_token_request(self, credentials):
+        """
+        Clients that share a credential share its IAM token
+        """
+        responses.add(responses.POST, _iam_url + '/identity/token', json=_token_response())
+        responses.add(responses.GET, 'https://resource-controller.cloud.ibm.com/v2/resource_instances/abc', json={})
+        responses.add(responses.GET, 'https://tags.test.cloud.ibm.com/v3/tags', json={'items': []})
+        factory = ClientFactory()
+        factory.new_instance(ResourceControllerV2).get_resource_instance('abc')
+        factory.new_instance(GlobalTaggingV1).list_tags()
+        token_requests = [call for call in responses.calls if call.request.url.startswith(_iam_url)]
+        assert len(token_requests) == 1
+
+    def test_errors(self, credentials, monkeypatch):
+        """
+        Unknown service classes and missing credentials are reported
+        """
+        factory = ClientFactory()
+        with pytest.raises(ValueError, match='Unknown service class'):
+            factory.new_instance('NoSuchServiceV1')
+        monkeypatch.delenv('GLOBAL_SEARCH_APIKEY')
+        monkeypatch.delenv('GLOBAL_SEARCH_AUTH_URL')
+        with pytest.raises(ValueError, match='global_search'):
+            factory.new_instance(GlobalSearchV2)
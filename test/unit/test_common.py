@@ -19,7 +19,10 @@ Test methods in the common module
 """
 
 import unittest
+from ibm_cloud_sdk_core import DetailedResponse
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
 from ibm_platform_services import common
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
 
 
 class TestCommon(unittest.TestCase):
@@ -36,3 +39,40 @@ class TestCommon(unittest.TestCase):
         self.assertIsNotNone(headers.get('User-Agent'))
         print("User-Agent: {0}".format(headers.get('User-Agent')))
         self.assertTrue(headers.get('User-Agent').startswith('platform-services-python-sdk'))
+
+    def test_interceptors(self):
+        """
+        Test that interceptors wrap the requests of a service in the order in which they were added
+        """
+        calls = []
+
+        def interceptor(name):
+            def intercept(_service, operation_id, request, send, **kwargs):
+                calls.append((name, operation_id))
+                return send(request, **kwargs)
+
+            return intercept
+
+        def short_circuit(_service, operation_id, _request, _send, **_kwargs):
+            calls.append(('short_circuit', operation_id))
+            return DetailedResponse(response={'id': 'cached'}, status_code=200)
+
+        service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+        self.assertIsInstance(service, common.PlatformBaseService)
+        first = interceptor('first')
+        service.add_interceptor(first)
+        service.add_interceptor(interceptor('second'))
+        service.add_interceptor(short_circuit)
+        response = service.get_resource_group('rg1')
+        self.assertEqual(response.get_result(), {'id': 'cached'})
+        self.assertEqual(
+            calls,
+            [
+                ('first', 'get_resource_group'),
+                ('second', 'get_resource_group'),
+                ('short_circuit', 'get_resource_group'),
+            ],
+        )
+        service.remove_interceptor(first)
+        self.assertEqual(len(service.get_interceptors()), 2)
+        self.assertEqual(common.get_current_operation_id(), 'get_resource_group')
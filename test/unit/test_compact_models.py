@@ -0,0 +1,145 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the compact_models module
+"""
+
+import copy
+import pickle
+from datetime import datetime
+from typing import List, Optional, Union
+
+import pytest
+from ibm_cloud_sdk_core.utils import string_to_datetime
+
+from ibm_platform_services.compact_models import CompactModel, _decoder_for, compact_model_class
+from ibm_platform_services.global_search_v2 import ResultItem
+from ibm_platform_services.resource_controller_v2 import (
+    PlanHistoryItem,
+    ResourceInstance,
+    ResourceInstanceLastOperation,
+)
+
+_RESOURCE_INSTANCE = {
+    'id': 'id',
+    'guid': 'guid',
+    'created_at': '2019-01-01T12:00:00.000Z',
+    'updated_at': '2019-01-02T12:00:00.000Z',
+    'name': 'name',
+    'parameters': {'anyKey': 'anyValue'},
+    'allow_cleanup': False,
+    'crn': 'crn',
+    'last_operation': {
+        'type': 'type',
+        'state': 'in progress',
+        'async': True,
+        'description': 'description',
+        'cancelable': True,
+        'poll': True,
+    },
+    'plan_history': [{'resource_plan_id': 'resource_plan_id', 'start_date': '2019-01-01T12:00:00.000Z'}],
+    'locked': True,
+}
+
+
+class TestCompactModel:
+    """
+    Test Class for compact model classes
+    """
+
+    def test_class_is_cached(self):
+        """
+        compact_model_class() returns one class per model class
+        """
+        compact_class = compact_model_class(ResourceInstance)
+        assert compact_class is compact_model_class(ResourceInstance)
+        assert issubclass(compact_class, CompactModel)
+        assert compact_class.__name__ == 'CompactResourceInstance'
+
+    def test_properties_match_model(self):
+        """
+        Every property has the same value as in the regular model
+        """
+        compact = compact_model_class(ResourceInstance).from_dict(_RESOURCE_INSTANCE)
+        model = ResourceInstance.from_dict(_RESOURCE_INSTANCE)
+        for name in vars(model):
+            assert getattr(compact, name) == getattr(model, name), name
+        assert compact.created_at == string_to_datetime('2019-01-01T12:00:00.000Z')
+        assert isinstance(compact.last_operation, ResourceInstanceLastOperation)
+        assert compact.last_operation.async_ is True
+        assert isinstance(compact.plan_history[0], PlanHistoryItem)
+        assert compact.deleted_at is None
+        assert compact.to_model() == model
+
+    def test_optional_properties(self):
+        """
+        Optional datetime and nested model properties are decoded, whichever way the hints spell them
+        """
+        compact = compact_model_class(ResourceInstance).from_dict(_RESOURCE_INSTANCE)
+        assert type(compact.created_at) is datetime
+        assert type(compact.last_operation) is ResourceInstanceLastOperation
+        assert type(compact.plan_history[0]) is PlanHistoryItem
+        assert _decoder_for(Optional[datetime]) is string_to_datetime
+        assert _decoder_for(Optional[ResourceInstanceLastOperation]) == ResourceInstanceLastOperation.from_dict
+        decode = _decoder_for(Optional[List[PlanHistoryItem]])
+        assert type(decode([{'resource_plan_id': 'p', 'start_date': '2019-01-01T12:00:00.000Z'}])[0]) is PlanHistoryItem
+        assert _decoder_for(Optional[str]) is None
+        assert _decoder_for(Union[datetime, str]) is None
+
+    def test_lazy_decoding(self):
+        """
+        Datetime and nested properties are decoded once, on first access
+        """
+        compact = compact_model_class(ResourceInstance).from_dict(_RESOURCE_INSTANCE)
+        assert compact._decoded is None
+        created_at = compact.created_at
+        assert compact.created_at is created_at
+        assert list(compact._decoded) == ['created_at']
+
+    def test_slots(self):
+        """
+        Compact models have no __dict__ and are read-only
+        """
+        compact = compact_model_class(ResourceInstance).from_dict(_RESOURCE_INSTANCE)
+        assert not hasattr(compact, '__dict__')
+        with pytest.raises(AttributeError):
+            compact.name = 'other'
+        with pytest.raises(AttributeError):
+            compact.no_such_property  # pylint: disable=pointless-statement
+
+    def test_additional_properties(self):
+        """
+        Properties not declared by the model are read from the json dictionary
+        """
+        compact = compact_model_class(ResultItem).from_dict({'crn': 'crn', 'name': 'name'})
+        assert compact.crn == 'crn'
+        assert compact.name == 'name'
+        assert compact.to_model() == ResultItem.from_dict({'crn': 'crn', 'name': 'name'})
+
+    def test_to_dict_eq_and_pickle(self):
+        """
+        to_dict(), equality, copy and pickle
+        """
+        compact_class = compact_model_class(ResourceInstance)
+        compact = compact_class.from_dict(_RESOURCE_INSTANCE)
+        assert compact.to_dict() == _RESOURCE_INSTANCE
+        assert compact.to_dict() is not _RESOURCE_INSTANCE
+        assert compact == compact_class.from_dict(copy.deepcopy(_RESOURCE_INSTANCE))
+        assert compact != compact_class.from_dict({'id': 'other'})
+        restored = pickle.loads(pickle.dumps(compact))
+        assert restored == compact
+        assert restored.last_operation.type == 'type'
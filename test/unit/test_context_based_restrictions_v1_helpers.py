@@ -0,0 +1,326 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the context_based_restrictions_v1_helpers module
+"""
+
+import ipaddress
+import json
+import random
+import re
+
+import pytest
+import responses
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.context_based_restrictions_v1 import ContextBasedRestrictionsV1, Rule, Zone
+from ibm_platform_services.context_based_restrictions_v1_helpers import RuleIndex, ZoneAddressIndex, address_interval
+
+_zones_url = 'https://cbr.cloud.ibm.com/v1/zones'
+_rules_url = 'https://cbr.cloud.ibm.com/v1/rules'
+
+
+def _address(value: str) -> dict:
+    if '/' in value:
+        return {'type': 'subnet', 'value': value}
+    if '-' in value:
+        return {'type': 'ipRange', 'value': value}
+    return {'type': 'ipAddress', 'value': value}
+
+
+def _zone_dict(zone_id: str, addresses, excluded=(), modified: str = '2023-01-01T00:00:00.000Z') -> dict:
+    """Return the JSON of a zone with the given addresses."""
+    return {
+        'id': zone_id,
+        'crn': 'crn:v1:bluemix:public:context-based-restrictions::a/acct::zone:' + zone_id,
+        'address_count': len(addresses),
+        'excluded_count': len(excluded),
+        'name': zone_id,
+        'account_id': 'acct',
+        'description': '',
+        'addresses': [_address(a) for a in addresses],
+        'excluded': [_address(a) for a in excluded],
+        'href': _zones_url + '/' + zone_id,
+        'created_at': '2023-01-01T00:00:00.000Z',
+        'created_by_id': 'IBMid-1',
+        'last_modified_at': modified,
+        'last_modified_by_id': 'IBMid-1',
+    }
+
+
+def _summary_dict(zone: dict) -> dict:
+    summary = {k: v for (k, v) in zone.items() if k not in ('addresses', 'excluded', 'account_id')}
+    summary['addresses_preview'] = zone['addresses'][:3]
+    return summary
+
+
+def _zone(zone_id: str, addresses, excluded=()) -> Zone:
+    return Zone.from_dict(_zone_dict(zone_id, addresses, excluded))
+
+
+def _attribute(name: str, value: str) -> dict:
+    """Return the JSON of an attribute; a value with a wildcard gets the `stringMatch` operator."""
+    if '*' in value or '?' in value:
+        return {'name': name, 'value': value, 'operator': 'stringMatch'}
+    return {'name': name, 'value': value}
+
+
+def _rule_dict(rule_id: str, *resources, modified: str = '2023-01-01T00:00:00.000Z') -> dict:
+    """Return the JSON of a rule whose resources are (attributes, tags) pairs of dicts."""
+    return {
+        'id': rule_id,
+        'crn': 'crn:v1:bluemix:public:context-based-restrictions::a/acct::rule:' + rule_id,
+        'description': '',
+        'contexts': [],
+        'resources': [
+            {
+                'attributes': [_attribute(n, v) for (n, v) in attributes.items()],
+                'tags': [_attribute(n, v) for (n, v) in tags.items()],
+            }
+            for (attributes, tags) in resources
+        ],
+        'href': _rules_url + '/' + rule_id,
+        'created_at': '2023-01-01T00:00:00.000Z',
+        'created_by_id': 'IBMid-1',
+        'last_modified_at': modified,
+        'last_modified_by_id': 'IBMid-1',
+    }
+
+
+def _rule(rule_id: str, *resources) -> Rule:
+    return Rule.from_dict(_rule_dict(rule_id, *resources))
+
+
+class TestZoneAddressIndex:
+    """
+    Test Class for ZoneAddressIndex
+    """
+
+    def test_address_interval(self):
+        """
+        Each kind of IP-based address is converted to an interval of integers
+        """
+        assert address_interval({'type': 'ipAddress', 'value': '10.0.0.1'}) == (4, 0x0A000001, 0x0A000001)
+        assert address_interval({'type': 'ipRange', 'value': '10.0.0.1-10.0.0.9'}) == (4, 0x0A000001, 0x0A000009)
+        assert address_interval({'type': 'subnet', 'value': '10.0.0.0/24'}) == (4, 0x0A000000, 0x0A0000FF)
+        assert address_interval({'type': 'subnet', 'value': '2001:db8::/127'}) == (
+            6,
+            int(ipaddress.ip_address('2001:db8::')),
+            int(ipaddress.ip_address('2001:db8::1')),
+        )
+        assert address_interval({'type': 'vpc', 'value': 'crn:v1:vpc'}) is None
+        with pytest.raises(ValueError, match='range'):
+            address_interval({'type': 'ipRange', 'value': '10.0.0.9-10.0.0.1'})
+
+    def test_find_zones(self):
+        """
+        The zones that contain an address, less their excluded addresses, are found
+        """
+        index = ZoneAddressIndex(
+            [
+                _zone('z1', ['10.0.0.0/24', '192.168.1.1'], excluded=['10.0.0.128-10.0.0.255']),
+                _zone('z2', ['10.0.0.100-10.0.1.10', '2001:db8::/32']),
+                _zone('z3', ['0.0.0.0/0']),
+            ]
+        )
+        assert len(index) == 3
+        assert index.find_zones('10.0.0.1') == {'z1', 'z3'}
+        assert index.find_zones('10.0.0.100') == {'z1', 'z2', 'z3'}
+        assert index.find_zones('10.0.0.200') == {'z2', 'z3'}
+        assert index.find_zones('192.168.1.1') == {'z1', 'z3'}
+        assert index.find_zones('255.255.255.255') == {'z3'}
+        assert index.find_zones(ipaddress.ip_address('2001:db8::1')) == {'z2'}
+        assert index.find_zones('2001:db9::1') == set()
+        with pytest.raises(ValueError, match='not an IP address'):
+            index.find_zones('10.0.0')
+
+    def test_update_and_remove(self):
+        """
+        The lookups reflect the zones updated and removed since the index was built
+        """
+        index = ZoneAddressIndex([_zone('z1', ['10.0.0.0/8']), _zone('z2', ['10.1.0.0/16'])])
+        assert index.find_zones('10.1.2.3') == {'z1', 'z2'}
+        index.update_zone(_zone('z2', ['172.16.0.0/12']))
+        assert index.find_zones('10.1.2.3') == {'z1'}
+        assert index.find_zones('172.16.0.1') == {'z2'}
+        index.remove_zone('z1')
+        index.remove_zone('unknown')
+        assert index.find_zones('10.1.2.3') == set()
+        assert len(index) == 1
+
+    def test_patched_index_matches_compiled_index(self):
+        """
+        Patching the compiled index zone by zone gives the same lookups as compiling the final zones
+        """
+        rng = random.Random(7)
+
+        def random_zone(zone_id: str) -> Zone:
+            def address() -> str:
+                first = rng.randrange(256)
+                return '10.0.{0}.0-10.0.{1}.255'.format(first, min(255, first + rng.randrange(8)))
+
+            return _zone(zone_id, [address() for _ in range(3)], excluded=['10.0.{0}.7'.format(rng.randrange(256))])
+
+        zones = {'z{0}'.format(i): random_zone('z{0}'.format(i)) for i in range(30)}
+        index = ZoneAddressIndex(zones.values())
+        index.find_zones('10.0.0.0')
+        for _ in range(60):
+            zone_id = 'z{0}'.format(rng.randrange(40))
+            if rng.random() < 0.2:
+                zones.pop(zone_id, None)
+                index.remove_zone(zone_id)
+            else:
+                zones[zone_id] = random_zone(zone_id)
+                index.update_zone(zones[zone_id])
+        compiled = ZoneAddressIndex(zones.values())
+        for third in range(256):
+            for fourth in (0, 6, 7, 8, 255):
+                ip = '10.0.{0}.{1}'.format(third, fourth)
+                assert index.find_zones(ip) == compiled.find_zones(ip)
+        assert index._tables[4].starts == compiled._build()[4].starts
+
+    @responses.activate
+    def test_refresh(self):
+        """
+        Only the new and modified zones that are not complete in the list are retrieved
+        """
+        small = _zone_dict('small', ['10.0.0.1'])
+        large = _zone_dict('large', ['10.1.0.1', '10.1.0.2', '10.1.0.3', '10.1.0.4'])
+        gone = _zone_dict('gone', ['10.2.0.0/16'], excluded=['10.2.0.1'])
+        zones = {'small': small, 'large': large, 'gone': gone}
+
+        def list_callback(_request):
+            summaries = [_summary_dict(zone) for zone in zones.values()]
+            return (200, {}, json.dumps({'count': len(summaries), 'zones': summaries}))
+
+        def get_callback(request):
+            zone = zones.get(request.url.rsplit('/', 1)[1])
+            if zone is None:
+                return (404, {}, json.dumps({'message': 'not found'}))
+            return (200, {}, json.dumps(zone))
+
+        responses.add_callback(responses.GET, _zones_url, callback=list_callback, content_type='application/json')
+        responses.add_callback(
+            responses.GET, re.compile(_zones_url + '/.+'), callback=get_callback, content_type='application/json'
+        )
+        service = ContextBasedRestrictionsV1(authenticator=NoAuthAuthenticator())
+        index = ZoneAddressIndex()
+        assert sorted(index.refresh(service, 'acct')) == ['gone', 'large', 'small']
+        assert sorted(call.request.url.rsplit('/', 1)[1].split('?')[0] for call in responses.calls) == [
+            'gone',
+            'large',
+            'zones',
+        ]
+        assert index.find_zones('10.1.0.4') == {'large'}
+        assert index.find_zones('10.2.0.1') == set()
+
+        responses.calls.reset()
+        zones['large'] = _zone_dict('large', ['10.3.0.0/16'] * 4, modified='2023-02-01T00:00:00.000Z')
+        del zones['gone']
+        assert sorted(index.refresh(service, 'acct')) == ['gone', 'large']
+        assert len(responses.calls) == 2
+        assert index.find_zones('10.3.0.1') == {'large'}
+        assert index.find_zones('10.2.0.2') == set()
+        assert index.find_zones('10.0.0.1') == {'small'}
+
+
+class TestRuleIndex:
+    """
+    Test Class for RuleIndex
+    """
+
+    _cos = {'accountId': 'acct', 'serviceName': 'cloud-object-storage'}
+
+    def _index(self) -> RuleIndex:
+        return RuleIndex(
+            [
+                _rule('r-account', ({'accountId': 'acct'}, {})),
+                _rule('r-cos', (self._cos, {})),
+                _rule('r-instance', (dict(self._cos, serviceInstance='i1'), {})),
+                _rule('r-prod', (self._cos, {'env': 'prod'})),
+                _rule('r-region', (dict(self._cos, region='us-*'), {})),
+                _rule('r-wildcard', ({'accountId': 'ac?t', 'serviceName': '*'}, {'team': 'a*'})),
+                _rule('r-iam', ({'accountId': 'acct', 'serviceName': 'iam-groups'}, {}), (self._cos, {'env': 'dev'})),
+                _rule('r-other', ({'accountId': 'other'}, {})),
+            ]
+        )
+
+    def test_find_rules(self):
+        """
+        The rules with a resource whose attributes and tags all match apply
+        """
+        index = self._index()
+        assert len(index) == 8
+
+        def find(attributes, tags=None):
+            return [rule.id for rule in index.find_rules(attributes, tags=tags)]
+
+        assert find(dict(self._cos, serviceInstance='i1', region='us-south')) == [
+            'r-account',
+            'r-cos',
+            'r-instance',
+            'r-region',
+        ]
+        assert find(dict(self._cos, serviceInstance='i2', region='eu-de'), tags=['env:prod', 'team:abc']) == [
+            'r-account',
+            'r-cos',
+            'r-prod',
+            'r-wildcard',
+        ]
+        assert find(dict(self._cos, serviceInstance='i2'), tags={'env': 'dev'}) == ['r-account', 'r-cos', 'r-iam']
+        assert find({'accountId': 'acct', 'serviceName': 'iam-groups'}) == ['r-account', 'r-iam']
+        assert find({'accountId': 'nobody'}) == []
+
+    def test_queries_check_the_anchored_resources_only(self):
+        """
+        A resource is indexed under its most selective exact attribute, or checked by every query
+        """
+        index = self._index()
+        assert ('serviceInstance', 'i1') in index._anchored
+        assert ('serviceName', 'cloud-object-storage') in index._anchored
+        assert [resource.rule_id for resource in index._unanchored] == ['r-wildcard']
+
+    def test_update_and_remove(self):
+        """
+        The queries reflect the rules updated and removed
+        """
+        index = self._index()
+        index.update_rule(_rule('r-instance', (dict(self._cos, serviceInstance='i2'), {})))
+        index.remove_rule('r-account')
+        index.remove_rule('unknown')
+        assert [rule.id for rule in index.find_rules(dict(self._cos, serviceInstance='i1'))] == ['r-cos']
+        assert ('serviceInstance', 'i1') not in index._anchored
+        assert len(index) == 7
+
+    @responses.activate
+    def test_refresh(self):
+        """
+        Only the new and modified rules are indexed again, and the rules no longer listed are removed
+        """
+        rules = [_rule_dict('r1', ({'accountId': 'acct'}, {})), _rule_dict('r2', (self._cos, {}))]
+        responses.add(responses.GET, _rules_url, json={'count': 2, 'rules': rules})
+        service = ContextBasedRestrictionsV1(authenticator=NoAuthAuthenticator())
+        index = RuleIndex()
+        assert index.refresh(service, 'acct') == ['r1', 'r2']
+        first_r1 = index.find_rules({'accountId': 'acct'})[0]
+
+        rules = [rules[0], _rule_dict('r3', (self._cos, {}), modified='2023-02-01T00:00:00.000Z')]
+        responses.replace(responses.GET, _rules_url, json={'count': 2, 'rules': rules})
+        assert index.refresh(service, 'acct', service_name='cloud-object-storage') == ['r2', 'r3']
+        assert [rule.id for rule in index.find_rules(self._cos)] == ['r1', 'r3']
+        assert index.find_rules({'accountId': 'acct'})[0] is first_r1
+        assert responses.calls[1].request.params == {'account_id': 'acct', 'service_name': 'cloud-object-storage'}
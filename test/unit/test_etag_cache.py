@@ -0,0 +1,197 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the etag_cache module
+"""
+
+import json
+
+import pytest
+import responses
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.catalog_management_v1 import CatalogManagementV1
+from ibm_platform_services.context_based_restrictions_v1 import ContextBasedRestrictionsV1
+from ibm_platform_services.etag_cache import CACHED_ETAG, ETagCache
+
+_zones_url = 'https://cbr.cloud.ibm.com/v1/zones'
+_zone_url = _zones_url + '/z1'
+
+
+class _Zone:
+    """A zone of the mock service, whose ETag changes with every write."""
+
+    def __init__(self) -> None:
+        self.version = 1
+
+    def etag(self) -> str:
+        return '"v{0}"'.format(self.version)
+
+    def get(self, request):
+        return (200, {'ETag': self.etag()}, json.dumps({'id': 'z1', 'description': 'v' + str(self.version)}))
+
+    def put(self, request):
+        if request.headers['If-Match'] != self.etag():
+            return (412, {}, json.dumps({'message': 'precondition failed'}))
+        self.version += 1
+        return (200, {'ETag': self.etag()}, json.dumps({'id': 'z1', 'name': json.loads(request.body)['name']}))
+
+
+def _service(zone: _Zone, cache: ETagCache) -> ContextBasedRestrictionsV1:
+    responses.add_callback(responses.GET, _zone_url, callback=zone.get, content_type='application/json')
+    responses.add_callback(responses.PUT, _zone_url, callback=zone.put, content_type='application/json')
+    service = ContextBasedRestrictionsV1(authenticator=NoAuthAuthenticator())
+    service.add_interceptor(cache)
+    return service
+
+
+def _methods() -> list:
+    return [call.request.method for call in responses.calls]
+
+
+class TestETagCache:
+    """
+    Test Class for ETagCache
+    """
+
+    @responses.activate
+    def test_cached_etag_is_sent(self):
+        """
+        The ETags of the responses are cached and sent instead of CACHED_ETAG
+        """
+        cache = ETagCache()
+        service = _service(_Zone(), cache)
+        service.get_zone('z1')
+        assert cache.get(_zone_url) == '"v1"'
+        assert service.replace_zone('z1', CACHED_ETAG, name='a').get_result()['name'] == 'a'
+        service.replace_zone('z1', if_match=CACHED_ETAG, name='b')
+        assert _methods() == ['GET', 'PUT', 'PUT']
+        assert [call.request.headers['If-Match'] for call in responses.calls[1:]] == ['"v1"', '"v2"']
+        assert (cache.hits, cache.misses, cache.conflicts) == (2, 0, 0)
+
+    @responses.activate
+    def test_missing_etag_is_read(self):
+        """
+        The ETag of a resource is read with a GET request when it is not cached
+        """
+        cache = ETagCache()
+        service = _service(_Zone(), cache)
+        service.replace_zone('z1', CACHED_ETAG, name='a', x_correlation_id='c1')
+        assert _methods() == ['GET', 'PUT']
+        assert 'If-Match' not in responses.calls[0].request.headers
+        assert responses.calls[0].request.body is None
+        assert responses.calls[0].request.headers['X-Correlation-Id'] == 'c1'
+        assert cache.misses == 1 and cache.get(_zone_url) == '"v2"'
+
+    @responses.activate
+    def test_conflict(self):
+        """
+        A request that fails with a 412 error raises it, so the concurrent modification is kept
+        """
+        zone = _Zone()
+        cache = ETagCache()
+        service = _service(zone, cache)
+        service.get_zone('z1')
+        zone.version = 5
+        with pytest.raises(ApiException) as error:
+            service.replace_zone('z1', CACHED_ETAG, name='a')
+        assert error.value.status_code == 412
+        assert _methods() == ['GET', 'PUT'] and zone.version == 5
+        assert cache.get(_zone_url) is None
+
+    @responses.activate
+    def test_conflict_callback(self):
+        """
+        A request that fails with a 412 error is sent again with the body rebuilt by on_conflict, up to max_conflicts times
+        """
+        zone = _Zone()
+        calls = []
+
+        def on_conflict(operation_id, current, body):
+            calls.append((operation_id, current['description'], body['name']))
+            return dict(body, description=current['description'])
+
+        cache = ETagCache(max_conflicts=1, on_conflict=on_conflict)
+        service = _service(zone, cache)
+        service.get_zone('z1')
+        zone.version = 5
+        service.replace_zone('z1', CACHED_ETAG, name='a')
+        assert _methods() == ['GET', 'PUT', 'GET', 'PUT']
+        assert calls == [('replace_zone', 'v5', 'a')]
+        assert json.loads(responses.calls[3].request.body)['description'] == 'v5'
+        assert cache.conflicts == 1 and cache.get(_zone_url) == '"v6"'
+
+    def test_max_conflicts_requires_callback(self):
+        """
+        A request is only sent again after a 412 error with a callback that rebuilds its body
+        """
+        with pytest.raises(ValueError, match='on_conflict'):
+            ETagCache(max_conflicts=1)
+
+    @responses.activate
+    def test_create_and_delete(self):
+        """
+        The ETag of a created resource is cached under its URL, and removed when it is deleted
+        """
+        responses.add(responses.POST, _zones_url, json={'id': 'z2'}, headers={'ETag': '"c1"'}, status=201)
+        responses.add(responses.DELETE, _zones_url + '/z2', status=204)
+        cache = ETagCache()
+        service = ContextBasedRestrictionsV1(authenticator=NoAuthAuthenticator())
+        service.add_interceptor(cache)
+        service.create_zone(name='zone', account_id='acct', addresses=[])
+        assert cache.get(_zones_url + '/z2') == '"c1"'
+        service.delete_zone('z2')
+        assert cache.get(_zones_url + '/z2') is None
+
+    @responses.activate
+    def test_update_offering(self):
+        """
+        Offering updates send the cached ETag of the offering
+        """
+        offering_url = 'https://cm.globalcatalog.cloud.ibm.com/api/v1-beta/catalogs/c1/offerings/o1'
+        responses.add(responses.GET, offering_url, json={'id': 'o1'}, headers={'ETag': '"1-abc"'})
+        responses.add(responses.PATCH, offering_url, json={'id': 'o1'}, headers={'ETag': '"2-def"'})
+        cache = ETagCache()
+        service = CatalogManagementV1(authenticator=NoAuthAuthenticator())
+        service.add_interceptor(cache)
+        service.get_offering('c1', 'o1')
+        service.update_offering('c1', 'o1', CACHED_ETAG, updates=[])
+        assert responses.calls[1].request.headers['If-Match'] == '"1-abc"'
+        assert cache.get(offering_url) == '"2-def"'
+
+    @responses.activate
+    def test_resource_without_etag(self):
+        """
+        CACHED_ETAG cannot be used for a resource without an ETag
+        """
+        responses.add(responses.GET, _zone_url, json={'id': 'z1'})
+        service = ContextBasedRestrictionsV1(authenticator=NoAuthAuthenticator())
+        service.add_interceptor(ETagCache())
+        with pytest.raises(ValueError, match='no ETag'):
+            service.replace_zone('z1', CACHED_ETAG, name='a')
+
+    def test_eviction(self):
+        """
+        The least recently used ETags are evicted
+        """
+        cache = ETagCache(max_entries=2)
+        cache.put('a', '1')
+        cache.put('b', '2')
+        cache.get('a')
+        cache.put('c', '3')
+        assert (cache.get('a'), cache.get('b'), cache.get('c'), len(cache)) == ('1', None, '3', 2)
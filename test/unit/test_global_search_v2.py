@@ -226,6 +226,59 @@ class TestSearch:
         _service.disable_retries()
         self.test_search_required_params()
 
+    @responses.activate
+    def test_search_with_pager_get_next(self):
+        """
+        test_search_with_pager_get_next()
+        """
+        # Set up a three-page mock response; an empty page ends the result set
+        url = preprocess_url('/v3/resources/search')
+        mock_response1 = '{"search_cursor":"cursor1","limit":1,"items":[{"crn":"crn1"}]}'
+        mock_response2 = '{"search_cursor":"cursor2","limit":1,"items":[{"crn":"crn2"}]}'
+        mock_response3 = '{"limit":1,"items":[]}'
+        responses.add(responses.POST, url, body=mock_response1, content_type='application/json', status=200)
+        responses.add(responses.POST, url, body=mock_response2, content_type='application/json', status=200)
+        responses.add(responses.POST, url, body=mock_response3, content_type='application/json', status=200)
+
+        # Exercise the pager class for this operation
+        all_results = []
+        pager = SearchPager(
+            client=_service,
+            query='testString',
+            fields=['testString'],
+            limit=1,
+        )
+        while pager.has_next():
+            next_page = pager.get_next()
+            assert next_page is not None
+            all_results.extend(next_page)
+        assert len(all_results) == 2
+        req_body = json.loads(str(responses.calls[1].request.body, 'utf-8'))
+        assert req_body['search_cursor'] == 'cursor1'
+
+    @responses.activate
+    def test_search_with_pager_get_all(self):
+        """
+        test_search_with_pager_get_all()
+        """
+        # Set up a two-page mock response; the last page has no search cursor
+        url = preprocess_url('/v3/resources/search')
+        mock_response1 = '{"search_cursor":"cursor1","limit":1,"items":[{"crn":"crn1"}]}'
+        mock_response2 = '{"limit":1,"items":[{"crn":"crn2"}]}'
+        responses.add(responses.POST, url, body=mock_response1, content_type='application/json', status=200)
+        responses.add(responses.POST, url, body=mock_response2, content_type='application/json', status=200)
+
+        # Exercise the pager class for this operation
+        pager = SearchPager(
+            client=_service,
+            query='testString',
+            fields=['testString'],
+            limit=1,
+        )
+        all_results = pager.get_all()
+        assert all_results is not None
+        assert len(all_results) == 2
+
 
 # endregion
 ##############################################################################
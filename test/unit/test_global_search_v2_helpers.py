@@ -0,0 +1,228 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the global_search_v2_helpers module
+"""
+
+import json
+import re
+
+import pytest
+import responses
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.global_search_v2 import GlobalSearchV2, ResultItem
+from ibm_platform_services.global_search_v2_helpers import CrnResolver, ParallelSearchScanner, quote_query_value
+
+_service = GlobalSearchV2(authenticator=NoAuthAuthenticator())
+_url = 'https://api.global-search-tagging.cloud.ibm.com/v3/resources/search'
+
+# Resources of the mock account: (crn, region).
+_RESOURCES = [
+    ('crn:{0}'.format(i), region) for (i, region) in enumerate(['us-south'] * 5 + ['eu-de'] * 3 + ['jp-tok'] * 4)
+]
+
+
+def _search_callback(request):
+    """Answer a search request from _RESOURCES, paging with an integer cursor."""
+    body = json.loads(request.body)
+    query = body['query']
+    if 'NOT' in query:
+        excluded = re.findall(r'region:"([^"]+)"', query)
+        matches = [crn for (crn, region) in _RESOURCES if region not in excluded]
+    else:
+        region = re.search(r'region:"([^"]+)"', query).group(1)
+        matches = [crn for (crn, r) in _RESOURCES if r == region]
+    limit = int(request.params.get('limit', 10))
+    start = int(body.get('search_cursor', 0))
+    items = [{'crn': crn, 'name': crn.upper()} for crn in matches[start : start + limit]]
+    result = {'limit': limit, 'items': items}
+    if items:
+        result['search_cursor'] = str(start + limit)
+    return (200, {}, json.dumps(result))
+
+
+class TestParallelSearchScanner:
+    """
+    Test Class for ParallelSearchScanner
+    """
+
+    def test_quote_query_value(self):
+        """
+        Quotes and backslashes are escaped
+        """
+        assert quote_query_value('a"b\\c') == '"a\\"b\\\\c"'
+
+    def test_partition_queries(self):
+        """
+        One sub-query per distinct value plus a remainder sub-query
+        """
+        queries = ParallelSearchScanner.partition_queries('family:iam', 'region', ['us-south', 'eu-de', 'us-south'])
+        assert queries == [
+            '(family:iam) AND region:"us-south"',
+            '(family:iam) AND region:"eu-de"',
+            '(family:iam) AND NOT (region:"us-south" OR region:"eu-de")',
+        ]
+
+    def test_partition_queries_invalid(self):
+        """
+        Unsupported facets and empty value lists are rejected
+        """
+        with pytest.raises(ValueError, match='partition_field'):
+            ParallelSearchScanner.partition_queries('*', 'name', ['a'])
+        with pytest.raises(ValueError, match='partition_values'):
+            ParallelSearchScanner.partition_queries('*', 'type', [])
+        with pytest.raises(ValueError, match='max_concurrency'):
+            ParallelSearchScanner(_service, max_concurrency=0)
+
+    @responses.activate
+    def test_scan_all(self):
+        """
+        The merged sub-queries return every resource exactly once
+        """
+        responses.add_callback(responses.POST, _url, callback=_search_callback, content_type='application/json')
+        scanner = ParallelSearchScanner(_service, max_concurrency=3)
+        results = scanner.scan_all(
+            'family:resource_controller',
+            partition_field='region',
+            partition_values=['us-south', 'eu-de'],
+            fields=['crn', 'name'],
+            limit=2,
+        )
+        assert all(isinstance(item, ResultItem) for item in results)
+        assert sorted(item.crn for item in results) == sorted(crn for (crn, _) in _RESOURCES)
+        assert results[0].name == results[0].crn.upper()
+        assert json.loads(responses.calls[0].request.body)['fields'] == ['crn', 'name']
+
+    @responses.activate
+    def test_scan_deduplicates_by_crn(self):
+        """
+        A resource returned by two sub-queries is yielded once
+        """
+        responses.add(
+            responses.POST,
+            _url,
+            json={'limit': 10, 'search_cursor': 'c', 'items': [{'crn': 'crn:dup'}]},
+        )
+        responses.add(responses.POST, _url, json={'limit': 10, 'items': []})
+        responses.add(
+            responses.POST,
+            _url,
+            json={'limit': 10, 'search_cursor': 'c', 'items': [{'crn': 'crn:dup'}]},
+        )
+        responses.add(responses.POST, _url, json={'limit': 10, 'items': []})
+        scanner = ParallelSearchScanner(_service, max_concurrency=1)
+        results = scanner.scan_all(partition_field='type', partition_values=['vpc'])
+        assert [item.crn for item in results] == ['crn:dup']
+
+    @responses.activate
+    def test_scan_error(self):
+        """
+        An error in one sub-query is raised by the scan
+        """
+        responses.add(responses.POST, _url, json={'message': 'error'}, status=500)
+        scanner = ParallelSearchScanner(_service)
+        with pytest.raises(ApiException):
+            scanner.scan_all(partition_field='type', partition_values=['vpc', 'cos'])
+
+
+def _crn_callback(request):
+    """Answer a query over CRNs with the resources of the CRNs that do not start with `crn:missing`."""
+    body = json.loads(request.body)
+    crns = [crn for crn in re.findall(r'crn:"([^"]+)"', body['query']) if not crn.startswith('crn:missing')]
+    limit = int(request.params['limit'])
+    start = int(body.get('search_cursor', 0))
+    items = [{'crn': crn, 'name': crn.upper()} for crn in crns[start : start + limit]]
+    return (200, {}, json.dumps({'limit': limit, 'items': items, 'search_cursor': str(start + limit)}))
+
+
+class TestCrnResolver:
+    """
+    Test Class for CrnResolver
+    """
+
+    def test_batch_queries(self):
+        """
+        The distinct CRNs are packed into queries bounded by the batch size and the query length
+        """
+        resolver = CrnResolver(_service, batch_size=2, max_query_length=40)
+        queries = resolver.batch_queries(['crn:a', 'crn:b', 'crn:a', 'crn:c', 'crn:' + 'x' * 50, 'crn:d'])
+        assert queries == [
+            'crn:"crn:a" OR crn:"crn:b"',
+            'crn:"crn:c"',
+            'crn:"crn:{0}"'.format('x' * 50),
+            'crn:"crn:d"',
+        ]
+
+    def test_invalid_arguments(self):
+        """
+        The batch size must be a valid search limit
+        """
+        with pytest.raises(ValueError, match='batch_size'):
+            CrnResolver(_service, batch_size=1001)
+        with pytest.raises(ValueError, match='max_concurrency'):
+            CrnResolver(_service, max_concurrency=0)
+
+    @responses.activate
+    def test_resolve(self):
+        """
+        Each batch is resolved with one request, and the missing CRNs are left out
+        """
+        responses.add_callback(responses.POST, _url, callback=_crn_callback, content_type='application/json')
+        crns = ['crn:{0}'.format(i) for i in range(25)] + ['crn:missing']
+        resources = CrnResolver(_service, batch_size=10, max_concurrency=3).resolve(
+            crns, fields=['crn', 'name'], account_id='acct'
+        )
+        assert sorted(resources) == sorted(crns[:-1])
+        assert isinstance(resources['crn:7'], ResultItem) and resources['crn:7'].name == 'CRN:7'
+        assert len(responses.calls) == 3
+        body = json.loads(responses.calls[0].request.body)
+        assert body['fields'] == ['crn', 'name']
+        assert responses.calls[0].request.params == {'account_id': 'acct', 'limit': '10'}
+
+    @responses.activate
+    def test_resolve_full_pages(self):
+        """
+        The next pages of a query are retrieved when its page is full
+        """
+        responses.add_callback(responses.POST, _url, callback=_crn_callback, content_type='application/json')
+        crns = ['crn:{0}'.format(i) for i in range(5)]
+        resources = CrnResolver(_service, batch_size=5).resolve(crns, limit=2)
+        assert sorted(resources) == crns
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_resolve_timeout(self):
+        """
+        The timeout of the search is passed to the first request of each query and to the next pages
+        """
+        responses.add_callback(responses.POST, _url, callback=_crn_callback, content_type='application/json')
+        crns = ['crn:{0}'.format(i) for i in range(4)]
+        resources = CrnResolver(_service, batch_size=4).resolve(crns, limit=2, timeout=3000)
+        assert sorted(resources) == crns
+        assert len(responses.calls) == 2
+        assert [call.request.params['timeout'] for call in responses.calls] == ['3000', '3000']
+
+    @responses.activate
+    def test_resolve_error(self):
+        """
+        The error of a failed query is raised
+        """
+        responses.add(responses.POST, _url, json={'message': 'error'}, status=500)
+        with pytest.raises(ApiException):
+            CrnResolver(_service).resolve(['crn:a'])
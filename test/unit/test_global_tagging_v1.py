@@ -17,7 +17,9 @@
 Unit Tests for GlobalTaggingV1
 """
 
+from ibm_cloud_sdk_core import ApiException
 from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+import gc
 import inspect
 import json
 import os
@@ -193,6 +195,113 @@ class TestListTags:
         _service.disable_retries()
         self.test_list_tags_required_params()
 
+    @staticmethod
+    def _list_tags_callback(total_count: int):
+        """Answer list_tags requests from `total_count` tags named tag-0, tag-1, ..."""
+
+        def callback(request):
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+            offset = int(query.get('offset', ['0'])[0])
+            limit = int(query.get('limit', ['100'])[0])
+            items = [{'name': 'tag-{0}'.format(i)} for i in range(offset, min(offset + limit, total_count))]
+            result = {'total_count': total_count, 'offset': offset, 'limit': limit, 'items': items}
+            return (200, {}, json.dumps(result))
+
+        return callback
+
+    @responses.activate
+    def test_list_tags_with_pager_get_next(self):
+        """
+        test_list_tags_with_pager_get_next()
+        """
+        url = preprocess_url('/v3/tags')
+        responses.add_callback(
+            responses.GET, url, callback=self._list_tags_callback(7), content_type='application/json'
+        )
+
+        all_results = []
+        pager = TagsPager(client=_service, account_id='testString', limit=2, max_workers=2)
+        while pager.has_next():
+            next_page = pager.get_next()
+            assert next_page is not None
+            all_results.extend(next_page)
+        assert [tag['name'] for tag in all_results] == ['tag-{0}'.format(i) for i in range(7)]
+        assert len(responses.calls) == 4
+        assert 'account_id=testString' in responses.calls[1].request.url
+
+    @responses.activate
+    def test_list_tags_with_pager_get_all(self):
+        """
+        test_list_tags_with_pager_get_all()
+        """
+        url = preprocess_url('/v3/tags')
+        responses.add_callback(
+            responses.GET, url, callback=self._list_tags_callback(25), content_type='application/json'
+        )
+
+        pager = TagsPager(client=_service, limit=3, max_workers=1)
+        all_results = pager.get_all()
+        assert [tag['name'] for tag in all_results] == ['tag-{0}'.format(i) for i in range(25)]
+        assert not pager.has_next()
+        models = TagsPager(client=_service, limit=10).get_all_models()
+        assert [tag.name for tag in models] == ['tag-{0}'.format(i) for i in range(25)]
+
+    @responses.activate
+    def test_list_tags_with_pager_single_page(self):
+        """
+        test_list_tags_with_pager_single_page()
+        """
+        url = preprocess_url('/v3/tags')
+        responses.add_callback(
+            responses.GET, url, callback=self._list_tags_callback(3), content_type='application/json'
+        )
+
+        pager = TagsPager(client=_service)
+        assert len(pager.get_all()) == 3
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_list_tags_with_pager_error(self):
+        """
+        test_list_tags_with_pager_error()
+        """
+        url = preprocess_url('/v3/tags')
+        responses.add(responses.GET, url, json={'total_count': 4, 'limit': 2, 'items': [{'name': 'a'}, {'name': 'b'}]})
+        responses.add(responses.GET, url, json={'message': 'error'}, status=500)
+
+        with TagsPager(client=_service, limit=2) as pager:
+            assert len(pager.get_next()) == 2
+            with pytest.raises(ApiException):
+                pager.get_next()
+            assert not pager.has_next()
+
+    @responses.activate
+    def test_list_tags_with_pager_dropped(self):
+        """
+        test_list_tags_with_pager_dropped()
+        """
+        url = preprocess_url('/v3/tags')
+        responses.add_callback(
+            responses.GET, url, callback=self._list_tags_callback(100), content_type='application/json'
+        )
+
+        with TagsPager(client=_service, limit=2, max_workers=3) as pager:
+            pager.get_next()
+            pager.get_next()
+            executor = pager._executor
+        assert pager._executor is None and executor._shutdown
+
+        pager = TagsPager(client=_service, limit=2, max_workers=3)
+        for _ in pager:
+            break
+        executor = pager._executor
+        del pager
+        gc.collect()
+        assert executor._shutdown
+        for thread in list(executor._threads):
+            thread.join(timeout=1)
+            assert not thread.is_alive()
+
 
 class TestCreateTag:
     """
@@ -0,0 +1,149 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the hedging module
+"""
+
+import itertools
+import json
+import threading
+import time
+
+import pytest
+import responses
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.hedging import RequestHedger
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
+
+_groups_url = 'https://resource-controller.cloud.ibm.com/v2/resource_groups'
+
+
+def _callback(*answers):
+    """Answer the successive requests with the (delay, status) pairs of `answers`."""
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def callback(_request):
+        with lock:
+            attempt = next(counter)
+        (delay, status) = answers[min(attempt, len(answers) - 1)]
+        time.sleep(delay)
+        return (status, {}, json.dumps({'attempt': attempt}))
+
+    return callback
+
+
+def _service(hedger: RequestHedger, *answers) -> ResourceManagerV2:
+    responses.add_callback(
+        responses.GET, _groups_url + '/rg1', callback=_callback(*answers), content_type='application/json'
+    )
+    service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+    service.add_interceptor(hedger)
+    return service
+
+
+class TestRequestHedger:
+    """
+    Test Class for RequestHedger
+    """
+
+    @responses.activate
+    def test_slow_request_is_hedged(self):
+        """
+        A request not answered within the delay is sent again and the first answer is returned
+        """
+        hedger = RequestHedger(initial_delay=0.05, budget=1)
+        service = _service(hedger, (0.5, 200), (0, 200))
+        start = time.monotonic()
+        assert service.get_resource_group('rg1').get_result() == {'attempt': 1}
+        assert time.monotonic() - start < 0.4
+        assert (hedger.requests, hedger.hedges, hedger.hedges_won) == (1, 1, 1)
+        hedger.close()
+
+    @responses.activate
+    def test_fast_request_is_not_hedged(self):
+        """
+        A request answered within the delay is sent once
+        """
+        hedger = RequestHedger(initial_delay=0.5, budget=1)
+        service = _service(hedger, (0, 200))
+        assert service.get_resource_group('rg1').get_result() == {'attempt': 0}
+        assert len(responses.calls) == 1
+        assert hedger.hedges == 0
+        hedger.close()
+
+    @responses.activate
+    def test_budget(self):
+        """
+        Requests are not hedged once the budget is spent
+        """
+        hedger = RequestHedger(initial_delay=0.01, budget=0.5)
+        service = _service(hedger, (0.05, 200))
+        for _ in range(4):
+            service.get_resource_group('rg1')
+        # The second and fourth requests have earned a whole hedge.
+        assert (hedger.requests, hedger.hedges, hedger.hedges_denied) == (4, 2, 2)
+        hedger.close()
+
+    @responses.activate
+    def test_errors(self):
+        """
+        A failed copy is ignored if the other one succeeds, and the first exception is raised if both fail
+        """
+        hedger = RequestHedger(initial_delay=0.05, budget=1)
+        service = _service(hedger, (0.1, 500), (0.2, 200), (0.1, 503), (0.2, 500))
+        assert service.get_resource_group('rg1').get_result() == {'attempt': 1}
+        with pytest.raises(ApiException) as error:
+            service.get_resource_group('rg1')
+        assert error.value.status_code == 503
+        hedger.close()
+
+    @responses.activate
+    def test_non_get_requests(self):
+        """
+        Only GET requests are hedged
+        """
+        responses.add(responses.DELETE, _groups_url + '/rg1', status=204)
+        hedger = RequestHedger(initial_delay=0)
+        service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+        service.add_interceptor(hedger)
+        service.delete_resource_group('rg1')
+        assert (len(responses.calls), hedger.requests) == (1, 0)
+        hedger.close()
+
+    def test_delay_percentile(self):
+        """
+        The delay of an operation follows the percentile of its recent latencies
+        """
+        hedger = RequestHedger(percentile=90, initial_delay=2.0, window=160)
+        assert hedger.get_delay('get_resource_group') == 2.0
+        for latency in range(1, 161):
+            hedger._record('get_resource_group', latency / 1000)
+        assert hedger.get_delay('get_resource_group') == pytest.approx(0.144)
+        assert hedger.get_delay('list_resource_groups') == 2.0
+        hedger.close()
+
+    def test_invalid_arguments(self):
+        """
+        The percentile and budget are validated
+        """
+        with pytest.raises(ValueError, match='percentile'):
+            RequestHedger(percentile=0)
+        with pytest.raises(ValueError, match='budget'):
+            RequestHedger(budget=2)
@@ -0,0 +1,284 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the iam_policy_management_v1_helpers module
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import responses
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.iam_policy_management_v1 import IamPolicyManagementV1, Role, V2Policy
+from ibm_platform_services.iam_policy_management_v1_helpers import PolicyDecisionEngine, RoleCatalog
+
+_viewer = 'crn:v1:bluemix:public:iam::::role:Viewer'
+_writer = 'crn:v1:bluemix:public:iam::::serviceRole:Writer'
+_roles = [
+    Role(display_name='Viewer', actions=['cos.bucket.list'], crn=_viewer),
+    Role(display_name='Writer', actions=['cos.object.put'], crn=_writer),
+]
+
+
+def _policy(policy_id, subject, attributes, roles=(_viewer,), **fields) -> dict:
+    """Return the dict of an access policy of a subject on the resource with the (key, operator, value) attributes."""
+    (key, value) = ('access_group_id', subject) if subject.startswith('AccessGroupId') else ('iam_id', subject)
+    policy = {
+        'id': policy_id,
+        'type': 'access',
+        'state': 'active',
+        'subject': {'attributes': [{'key': key, 'operator': 'stringEquals', 'value': value}]},
+        'resource': {
+            'attributes': [{'key': key, 'operator': operator, 'value': value} for (key, operator, value) in attributes]
+        },
+        'control': {'grant': {'roles': [{'role_id': role} for role in roles]}},
+        'last_modified_at': '2023-01-01T00:00:00Z',
+    }
+    policy.update(fields)
+    return policy
+
+
+_account = ('accountId', 'stringEquals', 'acct')
+_cos = ('serviceName', 'stringEquals', 'cos')
+_bucket = {'accountId': 'acct', 'serviceName': 'cos', 'serviceInstance': 'i1', 'resourceType': 'bucket'}
+
+
+class TestPolicyDecisionEngine:
+    """
+    Test Class for PolicyDecisionEngine
+    """
+
+    def test_resource_attributes(self):
+        """
+        A policy allows the actions of its roles on the resources that match all of its attributes
+        """
+        engine = PolicyDecisionEngine(
+            [
+                _policy('p1', 'IBMid-u1', [_account, _cos, ('serviceInstance', 'stringEquals', 'i1')]),
+                _policy('p2', 'IBMid-u2', [_account, ('resourceType', 'stringMatch', 'buck*')], roles=[_writer]),
+                _policy('p3', 'IBMid-u3', [_account, _cos, ('resource', 'stringExists', True)]),
+            ],
+            roles=_roles,
+        )
+        assert len(engine) == 3
+        assert engine.find_policy('IBMid-u1', 'cos.bucket.list', _bucket)['id'] == 'p1'
+        assert not engine.is_allowed('IBMid-u1', 'cos.object.put', _bucket)
+        assert not engine.is_allowed('IBMid-u1', 'cos.bucket.list', dict(_bucket, serviceInstance='i2'))
+        assert not engine.is_allowed('IBMid-u1', 'cos.bucket.list', dict(_bucket, accountId='other'))
+        assert engine.is_allowed('IBMid-u2', 'cos.object.put', _bucket)
+        assert not engine.is_allowed('IBMid-u2', 'cos.object.put', dict(_bucket, resourceType='object'))
+        assert not engine.is_allowed('IBMid-u3', 'cos.bucket.list', _bucket)
+        assert engine.is_allowed('IBMid-u3', 'cos.bucket.list', dict(_bucket, resource='b1'))
+
+    def test_access_groups_and_tags(self):
+        """
+        The policies of the access groups of the subject apply, and the tags of a policy must match the resource
+        """
+        engine = PolicyDecisionEngine(
+            [
+                _policy(
+                    'p1',
+                    'AccessGroupId-g1',
+                    [_account],
+                    resource={'attributes': [], 'tags': [{'key': 'env', 'value': 'prod', 'operator': 'stringEquals'}]},
+                )
+            ],
+            roles=_roles,
+        )
+        assert not engine.is_allowed('IBMid-u1', 'cos.bucket.list', _bucket, tags=['env:prod'])
+        assert engine.is_allowed(
+            'IBMid-u1', 'cos.bucket.list', _bucket, access_group_ids=['AccessGroupId-g1'], tags=['env:prod']
+        )
+        assert not engine.is_allowed(
+            'IBMid-u1', 'cos.bucket.list', _bucket, access_group_ids=['AccessGroupId-g1'], tags={'env': 'dev'}
+        )
+
+    def test_time_based_conditions(self):
+        """
+        A policy with a rule only allows actions when its conditions are satisfied
+        """
+        rule = {
+            'operator': 'and',
+            'conditions': [
+                {
+                    'key': '{{environment.attributes.day_of_week}}',
+                    'operator': 'dayOfWeekAnyOf',
+                    'value': ['1+00:00', '2+00:00', '3+00:00', '4+00:00', '5+00:00'],
+                },
+                {
+                    'key': '{{environment.attributes.current_time}}',
+                    'operator': 'timeGreaterThanOrEquals',
+                    'value': '09:00:00+02:00',
+                },
+                {
+                    'key': '{{environment.attributes.current_date_time}}',
+                    'operator': 'dateTimeLessThan',
+                    'value': '2024-01-01T00:00:00Z',
+                },
+            ],
+        }
+        engine = PolicyDecisionEngine([_policy('p1', 'IBMid-u1', [_cos], rule=rule)], roles=_roles)
+
+        def allowed(at):
+            return engine.is_allowed('IBMid-u1', 'cos.bucket.list', _bucket, at=at)
+
+        # Monday, 2023-06-05.
+        assert allowed(datetime(2023, 6, 5, 7, 0, tzinfo=timezone.utc))
+        assert not allowed(datetime(2023, 6, 5, 6, 59, tzinfo=timezone.utc))
+        assert not allowed(datetime(2023, 6, 4, 12, 0, tzinfo=timezone.utc))
+        assert not allowed(datetime(2024, 6, 3, 12, 0))
+
+        malformed = {'key': '{{environment.attributes.day_of_week}}', 'operator': 'dayOfWeekEquals', 'value': 'Monday'}
+        with pytest.raises(ValueError, match="'Monday'"):
+            PolicyDecisionEngine([_policy('p2', 'IBMid-u1', [_cos], rule=malformed)], roles=_roles)
+
+    def test_update_roles_and_policies(self):
+        """
+        Policies can be replaced and removed, and the policies of a role are recompiled when its actions change
+        """
+        enriched = {
+            'grant': {'roles': [{'role_id': _viewer, 'actions': [{'id': 'cos.bucket.get', 'display_name': 'Get'}]}]}
+        }
+        engine = PolicyDecisionEngine([_policy('p1', 'IBMid-u1', [_cos], control=enriched)])
+        assert engine.is_allowed('IBMid-u1', 'cos.bucket.get', _bucket)
+        assert not engine.is_allowed('IBMid-u1', 'cos.bucket.list', _bucket)
+        engine.update_roles([{'crn': _viewer, 'actions': ['cos.bucket.list']}])
+        assert engine.is_allowed('IBMid-u1', 'cos.bucket.list', _bucket)
+        engine.update_policy(V2Policy.from_dict(_policy('p1', 'IBMid-u1', [('serviceName', 'stringEquals', 'kms')])))
+        assert not engine.is_allowed('IBMid-u1', 'cos.bucket.list', _bucket)
+        engine.update_policy(_policy('p1', 'IBMid-u1', [_cos], state='deleted'))
+        engine.update_policy(_policy('p2', 'IBMid-u1', [_cos], type='authorization'))
+        assert len(engine) == 0
+        engine.update_policy(_policy('p3', 'IBMid-u1', [_cos]))
+        engine.remove_policy('p3')
+        assert not engine.is_allowed('IBMid-u1', 'cos.bucket.list', _bucket)
+
+    @responses.activate
+    def test_refresh(self):
+        """
+        refresh() compiles the policies that are new or were modified since the previous refresh, and removes the others
+        """
+        listed = [_policy('p1', 'IBMid-u1', [_cos]), _policy('p2', 'IBMid-u2', [_cos])]
+
+        def list_policies(_request):
+            return (200, {}, json.dumps({'policies': listed}))
+
+        responses.add_callback(
+            responses.GET,
+            'https://iam.cloud.ibm.com/v2/policies',
+            callback=list_policies,
+            content_type='application/json',
+        )
+        client = IamPolicyManagementV1(authenticator=NoAuthAuthenticator())
+        engine = PolicyDecisionEngine(roles=_roles)
+        assert engine.refresh(client, 'acct', format='display') == ['p1', 'p2']
+        assert 'format=display' in responses.calls[0].request.url
+        assert engine.refresh(client, 'acct') == []
+        listed = [_policy('p2', 'IBMid-u3', [_cos], last_modified_at='2023-02-01T00:00:00Z')]
+        assert engine.refresh(client, 'acct') == ['p1', 'p2']
+        assert not engine.is_allowed('IBMid-u1', 'cos.bucket.list', _bucket)
+        assert not engine.is_allowed('IBMid-u2', 'cos.bucket.list', _bucket)
+        assert engine.is_allowed('IBMid-u3', 'cos.bucket.list', _bucket)
+
+
+_cos_writer = 'crn:v1:bluemix:public:cloud-object-storage::::serviceRole:Writer'
+_custom = 'crn:v1:bluemix:public:iam-access-management::a/acct::customRole:Auditor'
+
+
+def _list_roles(request):
+    """Answer list_roles with the roles of the service_name query parameter, or the system and custom roles."""
+    query = parse_qs(urlparse(request.url).query)
+    assert query['account_id'] == ['acct']
+    service = query.get('service_name', [None])[0]
+    if service is None:
+        roles = {
+            'system_roles': [{'display_name': 'Viewer', 'crn': _viewer, 'actions': ['iam.policy.read']}],
+            'custom_roles': [{'display_name': 'Auditor', 'crn': _custom, 'actions': ['cos.bucket.list']}],
+        }
+    else:
+        roles = {
+            'system_roles': [
+                {'display_name': 'Viewer', 'crn': _viewer, 'actions': ['{0}.bucket.list'.format(service)]}
+            ],
+            'service_roles': [
+                {
+                    'display_name': 'Writer',
+                    'crn': _cos_writer,
+                    'actions': ['cos.bucket.list', 'cos.object.put', 'cos.object.delete'],
+                }
+            ],
+        }
+    return (200, {}, json.dumps(roles))
+
+
+def _catalog(**kwargs) -> RoleCatalog:
+    responses.add_callback(
+        responses.GET, 'https://iam.cloud.ibm.com/v2/roles', callback=_list_roles, content_type='application/json'
+    )
+    client = IamPolicyManagementV1(authenticator=NoAuthAuthenticator())
+    return RoleCatalog(client, account_id='acct', service_names=['cos'], **kwargs)
+
+
+class TestRoleCatalog:
+    """
+    Test Class for RoleCatalog
+    """
+
+    @responses.activate
+    def test_indexes(self):
+        """
+        The catalog indexes the actions of the system, service and custom roles, in both directions
+        """
+        catalog = _catalog()
+        assert len(catalog) == 3
+        assert len(responses.calls) == 2
+        assert catalog.actions_for_role(_viewer) == {'iam.policy.read', 'cos.bucket.list'}
+        assert catalog.roles_for_action('cos.bucket.list') == {_viewer, _cos_writer, _custom}
+        assert catalog.roles_for_action('cos.object.put') == {_cos_writer}
+        assert catalog.roles_for_action('kms.key.read') == set()
+        assert catalog.actions_for_role('crn:unknown') == set()
+        # Actions and role CRNs are interned, and equal sets are stored once.
+        (action,) = catalog.actions_for_role(_custom)
+        assert action is sys.intern('cos.bucket.list')
+        assert catalog.roles_for_action('cos.object.put') is catalog.roles_for_action('cos.object.delete')
+
+        engine = PolicyDecisionEngine(roles=catalog.roles())
+        engine.update_policy(_policy('p1', 'IBMid-u1', [_cos], roles=[_cos_writer]))
+        assert engine.is_allowed('IBMid-u1', 'cos.object.put', _bucket)
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_ttl(self):
+        """
+        The roles are listed again on the first query after the TTL
+        """
+        catalog = _catalog(ttl=0.05)
+        catalog.roles_for_action('cos.object.put')
+        catalog.actions_for_role(_viewer)
+        assert len(responses.calls) == 2
+        time.sleep(0.06)
+        catalog.roles_for_action('cos.object.put')
+        assert len(responses.calls) == 4
+        catalog.refresh()
+        assert len(responses.calls) == 6
+        with pytest.raises(ValueError, match='ttl'):
+            _catalog(ttl=-1)
@@ -0,0 +1,65 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the lazy loading of service classes in the package __init__ module
+"""
+
+import subprocess
+import sys
+import unittest
+
+import ibm_platform_services
+
+
+class TestLazyImport(unittest.TestCase):
+    """
+    Test the PEP 562 lazy loading of service classes
+    """
+
+    def test_service_modules_not_loaded_on_import(self):
+        """
+        Importing one service class must not load the other service modules
+        """
+        code = (
+            'import sys\n'
+            'from ibm_platform_services import ResourceControllerV2\n'
+            'loaded = sorted(m for m in sys.modules if m.startswith("ibm_platform_services."))\n'
+            'print(",".join(loaded))\n'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code], text=True).strip()
+        loaded = output.split(',')
+        self.assertIn('ibm_platform_services.resource_controller_v2', loaded)
+        self.assertNotIn('ibm_platform_services.catalog_management_v1', loaded)
+        self.assertNotIn('ibm_platform_services.iam_identity_v1', loaded)
+
+    def test_getattr_returns_service_class(self):
+        """
+        Test that each exported service class resolves to the class in its module
+        """
+        from ibm_platform_services.global_tagging_v1 import GlobalTaggingV1
+
+        for name in ibm_platform_services._SERVICE_MODULES:
+            self.assertTrue(isinstance(getattr(ibm_platform_services, name), type))
+        self.assertIs(ibm_platform_services.GlobalTaggingV1, GlobalTaggingV1)
+        self.assertIn('ResourceManagerV2', dir(ibm_platform_services))
+
+    def test_getattr_unknown_name(self):
+        """
+        Test that an unknown attribute raises AttributeError
+        """
+        with self.assertRaises(AttributeError):
+            getattr(ibm_platform_services, 'NoSuchServiceV9')
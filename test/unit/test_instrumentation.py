@@ -0,0 +1,174 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the instrumentation module
+"""
+
+import json
+
+import pytest
+import responses
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services import instrumentation
+from ibm_platform_services.global_tagging_v1 import GlobalTaggingV1, Tag, TagsPager
+from ibm_platform_services.instrumentation import OperationObserver, add_observer, get_observers, remove_observer
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
+
+_groups_url = 'https://resource-controller.cloud.ibm.com/v2/resource_groups'
+
+
+class _Recorder(OperationObserver):
+    def __init__(self):
+        self.events = []
+
+    def operation_started(self, record):
+        self.events.append(('started', record.operation_id, record.duration))
+
+    def operation_finished(self, record):
+        self.events.append(('finished', record.operation_id, record))
+
+    def models_constructed(self, service_name, operation_id, count, seconds):
+        self.events.append(('models', service_name, operation_id, count, seconds))
+
+    def records(self):
+        return [event[2] for event in self.events if event[0] == 'finished']
+
+
+@pytest.fixture(name='recorder')
+def fixture_recorder():
+    """A _Recorder registered as an observer for the duration of the test."""
+    recorder = _Recorder()
+    add_observer(recorder)
+    yield recorder
+    remove_observer(recorder)
+
+
+class TestInstrumentation:
+    """
+    Test Class for the operation observers
+    """
+
+    def test_registration(self):
+        """
+        Observers are notified in the order in which they were added
+        """
+        first, second = OperationObserver(), OperationObserver()
+        assert get_observers() == ()
+        add_observer(first)
+        add_observer(second)
+        assert get_observers() == (first, second)
+        remove_observer(first)
+        remove_observer(second)
+        assert get_observers() == ()
+
+    @responses.activate
+    def test_successful_operation(self, recorder):
+        """
+        A record has the timings, sizes and status of the operation
+        """
+        body = json.dumps({'id': 'rg1', 'name': 'default'})
+        responses.add(responses.GET, _groups_url + '/rg1', body=body, content_type='application/json')
+        ResourceManagerV2(authenticator=NoAuthAuthenticator()).get_resource_group('rg1')
+        assert [event[:2] for event in recorder.events] == [
+            ('started', 'get_resource_group'),
+            ('finished', 'get_resource_group'),
+        ]
+        assert recorder.events[0][2] is None
+        record = recorder.records()[0]
+        assert record.service_name == 'resource_manager'
+        assert record.status_code == 200
+        assert (record.request_bytes, record.response_bytes) == (0, len(body))
+        assert record.retries == 0
+        assert record.error is None
+        assert record.build_time >= 0
+        assert record.network_time > 0
+        assert record.decode_time >= 0
+        assert record.duration >= record.network_time + record.decode_time
+
+    @responses.activate
+    def test_request_bytes_and_errors(self, recorder):
+        """
+        A record has the size of the request body, and the status and exception of a failed operation
+        """
+        responses.add(responses.POST, _groups_url, json={'message': 'conflict'}, status=409)
+        with pytest.raises(ApiException):
+            ResourceManagerV2(authenticator=NoAuthAuthenticator()).create_resource_group(name='group', account_id='a')
+        record = recorder.records()[0]
+        assert record.operation_id == 'create_resource_group'
+        assert record.request_bytes == len(responses.calls[0].request.body)
+        assert record.status_code == 409
+        assert isinstance(record.error, ApiException)
+
+    @responses.activate
+    def test_retries_by_interceptor(self, recorder):
+        """
+        Requests sent again by an interceptor are counted as retries
+        """
+        responses.add(responses.GET, _groups_url + '/rg1', json={'message': 'unavailable'}, status=503)
+        responses.add(responses.GET, _groups_url + '/rg1', json={'id': 'rg1'})
+
+        def retry_once(_service, _operation_id, request, send, **kwargs):
+            try:
+                return send(request, **kwargs)
+            except ApiException:
+                return send(request, **kwargs)
+
+        service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+        service.add_interceptor(retry_once)
+        service.get_resource_group('rg1')
+        record = recorder.records()[0]
+        assert (record.retries, record.status_code, record.error) == (1, 200, None)
+
+    @responses.activate
+    def test_models_constructed(self, recorder):
+        """
+        Pagers report the models built from each page of results
+        """
+        responses.add(
+            responses.GET,
+            'https://tags.global-search-tagging.cloud.ibm.com/v3/tags',
+            json={'total_count': 2, 'offset': 0, 'limit': 10, 'items': [{'name': 'a'}, {'name': 'b'}]},
+        )
+        client = GlobalTaggingV1(authenticator=NoAuthAuthenticator())
+        models = TagsPager(client=client, limit=10).get_all_models()
+        assert all(isinstance(model, Tag) for model in models)
+        models_events = [event for event in recorder.events if event[0] == 'models']
+        assert [event[1:4] for event in models_events] == [('global_tagging', 'list_tags', 2)]
+
+    @responses.activate
+    def test_failing_observer(self, recorder, caplog):
+        """
+        Exceptions raised by an observer are logged and do not fail the operation
+        """
+
+        class _Failing(OperationObserver):
+            def operation_finished(self, record):
+                raise RuntimeError('observer failure')
+
+        failing = _Failing()
+        add_observer(failing)
+        try:
+            responses.add(responses.GET, _groups_url + '/rg1', json={'id': 'rg1'})
+            result = ResourceManagerV2(authenticator=NoAuthAuthenticator()).get_resource_group('rg1').get_result()
+        finally:
+            remove_observer(failing)
+        assert result == {'id': 'rg1'}
+        assert len(recorder.records()) == 1
+        assert 'observer failure' in caplog.text
+        assert instrumentation.get_observers() == (recorder,)
@@ -0,0 +1,161 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the metrics module
+"""
+
+import gc
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.instrumentation import OperationRecord, add_observer, remove_observer
+from ibm_platform_services.metrics import PrometheusMetrics
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
+
+_groups_url = 'https://resource-controller.cloud.ibm.com/v2/resource_groups'
+
+
+def _samples(text: str) -> dict:
+    """Parse the samples of a rendered exposition into a dict keyed by metric name and labels."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def _record(operation_id: str, duration: float, **attributes) -> OperationRecord:
+    record = OperationRecord('resource_manager', operation_id)
+    record.duration = duration
+    for name, value in attributes.items():
+        setattr(record, name, value)
+    return record
+
+
+@pytest.fixture(name='metrics')
+def fixture_metrics():
+    """A PrometheusMetrics registered as an observer for the duration of the test."""
+    metrics = PrometheusMetrics(buckets=[0.1, 1.0])
+    add_observer(metrics)
+    yield metrics
+    remove_observer(metrics)
+
+
+class TestPrometheusMetrics:
+    """
+    Test Class for PrometheusMetrics
+    """
+
+    def test_histogram_and_counters(self):
+        """
+        The observed records are rendered as a histogram and counters labelled by service and operation
+        """
+        metrics = PrometheusMetrics(buckets=[1.0, 0.1])
+        for record in (
+            _record('get_resource_group', 0.05, request_bytes=0, response_bytes=100),
+            _record('get_resource_group', 0.5, response_bytes=100, retries=2),
+            _record('get_resource_group', 3.0, status_code=503, error=ApiException(503)),
+            _record('list_resource_groups', 0.1, error=ConnectionError()),
+        ):
+            metrics.operation_started(record)
+            metrics.operation_finished(record)
+        text = metrics.render()
+        assert '# TYPE ibm_platform_services_operation_duration_seconds histogram' in text
+        samples = _samples(text)
+        labels = 'service="resource_manager",operation="get_resource_group"'
+        name = 'ibm_platform_services_operation_duration_seconds'
+        assert samples[name + '_bucket{' + labels + ',le="0.1"}'] == 1
+        assert samples[name + '_bucket{' + labels + ',le="1.0"}'] == 2
+        assert samples[name + '_bucket{' + labels + ',le="+Inf"}'] == 3
+        assert samples[name + '_sum{' + labels + '}'] == pytest.approx(3.55)
+        assert samples[name + '_count{' + labels + '}'] == 3
+        assert samples['ibm_platform_services_operations_total{' + labels + '}'] == 3
+        assert samples['ibm_platform_services_operations_in_flight{' + labels + '}'] == 0
+        assert samples['ibm_platform_services_operation_retries_total{' + labels + '}'] == 2
+        assert samples['ibm_platform_services_response_bytes_total{' + labels + '}'] == 200
+        assert samples['ibm_platform_services_operation_errors_total{' + labels + ',status="503"}'] == 1
+        list_labels = 'service="resource_manager",operation="list_resource_groups"'
+        assert samples[name + '_bucket{' + list_labels + ',le="0.1"}'] == 1
+        assert samples['ibm_platform_services_operation_errors_total{' + list_labels + ',status="none"}'] == 1
+
+    def test_in_flight(self):
+        """
+        Operations that have started but not finished are counted by the gauge
+        """
+        metrics = PrometheusMetrics(namespace='sdk')
+        metrics.operation_started(_record('get_resource_group', None))
+        labels = 'service="resource_manager",operation="get_resource_group"'
+        assert _samples(metrics.render())['sdk_operations_in_flight{' + labels + '}'] == 1
+
+    @responses.activate
+    def test_observed_operations(self, metrics):
+        """
+        The operations of the service clients are collected from many threads
+        """
+        responses.add(responses.GET, _groups_url + '/rg1', json={'id': 'rg1'})
+        service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: service.get_resource_group('rg1'), range(200)))
+        samples = _samples(metrics.render())
+        labels = 'service="resource_manager",operation="get_resource_group"'
+        assert samples['ibm_platform_services_operations_total{' + labels + '}'] == 200
+        assert samples['ibm_platform_services_operation_duration_seconds_count{' + labels + '}'] == 200
+        assert samples['ibm_platform_services_operations_in_flight{' + labels + '}'] == 0
+        assert samples['ibm_platform_services_response_bytes_total{' + labels + '}'] == 200 * len('{"id": "rg1"}')
+
+    def test_finished_threads(self):
+        """
+        The statistics of the threads that have ended are kept, without a shard per thread
+        """
+        metrics = PrometheusMetrics()
+        for _ in range(50):
+            thread = threading.Thread(target=lambda: metrics.operation_finished(_record('get_resource_group', 0.2)))
+            thread.start()
+            thread.join()
+        gc.collect()
+        assert not metrics._shards
+        labels = 'service="resource_manager",operation="get_resource_group"'
+        assert _samples(metrics.render())['ibm_platform_services_operations_total{' + labels + '}'] == 50
+
+    def test_write_to_file(self, tmp_path):
+        """
+        The metrics are written to a file, with label values escaped
+        """
+        metrics = PrometheusMetrics()
+        record = OperationRecord('service "a"', 'op\\b')
+        record.duration = 0.2
+        metrics.operation_started(record)
+        metrics.operation_finished(record)
+        path = tmp_path / 'platform_services.prom'
+        metrics.write_to_file(str(path))
+        text = path.read_text()
+        assert text == metrics.render()
+        assert 'service="service \\"a\\"",operation="op\\\\b"' in text
+        assert [p.name for p in tmp_path.iterdir()] == ['platform_services.prom']
+
+    def test_invalid_buckets(self):
+        """
+        The histogram needs at least one bucket
+        """
+        with pytest.raises(ValueError):
+            PrometheusMetrics(buckets=[])
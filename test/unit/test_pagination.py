@@ -0,0 +1,309 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the pagination module
+"""
+
+import gc
+import threading
+import time
+
+import pytest
+import responses
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.compact_models import CompactModel
+from ibm_platform_services.pagination import BasePager, PrefetchingPager, iter_pages_concurrently
+from ibm_platform_services.resource_controller_v2 import ResourceControllerV2, ResourceInstance, ResourceInstancesPager
+
+
+class _FakePager(BasePager):
+    """Returns `pages` pages of `size` items, sleeping `delay` seconds per page."""
+
+    def __init__(self, pages: int, size: int = 2, delay: float = 0.0, fail_at: int = None) -> None:
+        self.pages = pages
+        self.size = size
+        self.delay = delay
+        self.fail_at = fail_at
+        self.fetched = 0
+        self.threads = set()
+
+    def has_next(self) -> bool:
+        return self.fetched < self.pages
+
+    def get_next(self):
+        self.threads.add(threading.current_thread())
+        time.sleep(self.delay)
+        if self.fetched == self.fail_at:
+            raise RuntimeError('page {0} failed'.format(self.fetched))
+        start = self.fetched * self.size
+        self.fetched += 1
+        return [{'id': i} for i in range(start, start + self.size)]
+
+
+class TestBasePager:
+    """
+    Test Class for BasePager
+    """
+
+    def test_get_all(self):
+        """
+        get_all() concatenates every page
+        """
+        assert [item['id'] for item in _FakePager(3).get_all()] == list(range(6))
+
+    def test_iter_yields_items_lazily(self):
+        """
+        Iterating a pager yields items one at a time and fetches pages on demand
+        """
+        pager = _FakePager(3)
+        items = iter(pager)
+        assert next(items) == {'id': 0}
+        assert pager.fetched == 1
+        assert next(items) == {'id': 1}
+        assert pager.fetched == 1
+        assert next(items) == {'id': 2}
+        assert pager.fetched == 2
+        assert [item['id'] for item in items] == [3, 4, 5]
+
+    def test_iter_pages(self):
+        """
+        iter_pages() yields each page as it is fetched
+        """
+        pager = _FakePager(3)
+        sizes = []
+        for page in pager.iter_pages():
+            sizes.append((len(page), pager.fetched))
+        assert sizes == [(2, 1), (2, 2), (2, 3)]
+        assert list(pager.iter_pages()) == []
+
+    def test_generated_pagers_extend_base_pager(self):
+        """
+        The generated pagers share the BasePager functionality
+        """
+        assert issubclass(ResourceInstancesPager, BasePager)
+
+
+class TestPrefetchingPager:
+    """
+    Test Class for PrefetchingPager
+    """
+
+    def test_returns_pages_in_order(self):
+        """
+        Pages are returned in order and has_next() turns false after the last page
+        """
+        pager = _FakePager(4).prefetch(depth=2)
+        pages = []
+        while pager.has_next():
+            pages.append(pager.get_next())
+        assert [item['id'] for page in pages for item in page] == list(range(8))
+        assert not pager.has_next()
+        with pytest.raises(StopIteration):
+            pager.get_next()
+
+    def test_pages_fetched_in_background(self):
+        """
+        Pages are fetched by a background thread while the caller processes a page
+        """
+        source = _FakePager(5, delay=0.05)
+        pager = PrefetchingPager(source, depth=2)
+        start = time.perf_counter()
+        count = 0
+        while pager.has_next():
+            pager.get_next()
+            time.sleep(0.05)  # Simulate processing of the page by the caller.
+            count += 1
+        elapsed = time.perf_counter() - start
+        assert count == 5
+        assert threading.current_thread() not in source.threads
+        # Fetching and processing serially would take 10 * 0.05 seconds.
+        assert elapsed < 0.45
+
+    def test_buffer_is_bounded(self):
+        """
+        The background thread stops fetching when `depth` pages are buffered
+        """
+        source = _FakePager(10)
+        pager = PrefetchingPager(source, depth=2)
+        assert pager.has_next()
+        time.sleep(0.2)
+        # One page taken by has_next(), two buffered and one waiting to be buffered.
+        assert source.fetched <= 4
+        pager.close()
+        assert not pager.has_next()
+
+    def test_dropped_pager_stops_thread(self):
+        """
+        The background thread stops when the pager is dropped without being closed or read to the end
+        """
+        source = _FakePager(1000)
+        pager = PrefetchingPager(source, depth=1)
+        assert pager.has_next()
+        thread = pager._thread
+        del pager
+        gc.collect()
+        thread.join(timeout=1)
+        assert not thread.is_alive()
+        assert source.fetched < 1000
+
+    def test_error_raised_by_get_next(self):
+        """
+        An error while fetching is raised to the caller at the failing page
+        """
+        pager = _FakePager(3, fail_at=1).prefetch()
+        assert len(pager.get_next()) == 2
+        with pytest.raises(RuntimeError, match='page 1 failed'):
+            pager.get_next()
+        assert not pager.has_next()
+
+    def test_invalid_depth(self):
+        """
+        depth must be positive
+        """
+        with pytest.raises(ValueError):
+            _FakePager(1).prefetch(depth=0)
+
+    @responses.activate
+    def test_prefetch_generated_pager(self):
+        """
+        prefetch() works with a generated pager
+        """
+        service = ResourceControllerV2(authenticator=NoAuthAuthenticator())
+        url = 'https://resource-controller.cloud.ibm.com/v2/resource_instances'
+        mock_response1 = '{"next_url":"https://myhost.com/somePath?start=1","resources":[{"id":"a"},{"id":"b"}]}'
+        mock_response2 = '{"resources":[{"id":"c"}]}'
+        responses.add(responses.GET, url, body=mock_response1, content_type='application/json', status=200)
+        responses.add(responses.GET, url, body=mock_response2, content_type='application/json', status=200)
+
+        with ResourceInstancesPager(client=service, limit=2).prefetch() as pager:
+            all_results = pager.get_all()
+        assert [r['id'] for r in all_results] == ['a', 'b', 'c']
+        assert 'start=1' in responses.calls[1].request.url
+
+    def test_iterate_prefetching_pager(self):
+        """
+        A prefetching pager is iterable as well
+        """
+        with _FakePager(3).prefetch() as pager:
+            assert [item['id'] for item in pager] == list(range(6))
+
+
+class TestIterPagesConcurrently:
+    """
+    Test Class for iter_pages_concurrently
+    """
+
+    def test_pages_of_all_pagers(self):
+        """
+        Every page of every pager is yielded, pagers run at the same time
+        """
+        sources = [_FakePager(3, delay=0.05) for _ in range(4)]
+        start = time.perf_counter()
+        pages = list(iter_pages_concurrently(sources, max_workers=4))
+        elapsed = time.perf_counter() - start
+        assert len(pages) == 12
+        assert all(source.fetched == 3 for source in sources)
+        # Fetching the pagers one after the other would take 12 * 0.05 seconds.
+        assert elapsed < 0.4
+
+    def test_error_stops_iteration(self):
+        """
+        An error raised by one pager is raised by the generator
+        """
+        sources = [_FakePager(3), _FakePager(3, fail_at=0)]
+        with pytest.raises(RuntimeError, match='page 0 failed'):
+            list(iter_pages_concurrently(sources, max_workers=1))
+
+    def test_close_stops_pagers(self):
+        """
+        Closing the generator early stops retrieving pages
+        """
+        source = _FakePager(100)
+        pages = iter_pages_concurrently([source], max_workers=1, depth=1)
+        next(pages)
+        pages.close()
+        assert source.fetched < 100
+
+    def test_invalid_max_workers(self):
+        """
+        max_workers must be positive
+        """
+        with pytest.raises(ValueError):
+            list(iter_pages_concurrently([], max_workers=0))
+
+
+class TestGeneratedPagerIteration:
+    """
+    Test Class for iteration over a generated pager
+    """
+
+    @responses.activate
+    def test_iterate_generated_pager(self):
+        """
+        A generated pager yields the items of every page
+        """
+        service = ResourceControllerV2(authenticator=NoAuthAuthenticator())
+        url = 'https://resource-controller.cloud.ibm.com/v2/resource_instances'
+        mock_response1 = '{"next_url":"https://myhost.com/somePath?start=1","resources":[{"id":"a"},{"id":"b"}]}'
+        mock_response2 = '{"resources":[{"id":"c"}]}'
+        responses.add(responses.GET, url, body=mock_response1, content_type='application/json', status=200)
+        responses.add(responses.GET, url, body=mock_response2, content_type='application/json', status=200)
+
+        pager = ResourceInstancesPager(client=service, limit=2)
+        assert [r['id'] for r in pager] == ['a', 'b', 'c']
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_iter_models(self):
+        """
+        iter_models() yields instances of the pager's model class
+        """
+        service = ResourceControllerV2(authenticator=NoAuthAuthenticator())
+        url = 'https://resource-controller.cloud.ibm.com/v2/resource_instances'
+        mock_response1 = '{"next_url":"https://myhost.com/somePath?start=1","resources":[{"id":"a"},{"id":"b"}]}'
+        mock_response2 = '{"resources":[{"id":"c","created_at":"2019-01-01T12:00:00.000Z"}]}'
+        responses.add(responses.GET, url, body=mock_response1, content_type='application/json', status=200)
+        responses.add(responses.GET, url, body=mock_response2, content_type='application/json', status=200)
+
+        models = ResourceInstancesPager(client=service, limit=2).get_all_models()
+        assert all(isinstance(m, ResourceInstance) for m in models)
+        assert [m.id for m in models] == ['a', 'b', 'c']
+        assert models[2].created_at.year == 2019
+
+    @responses.activate
+    def test_iter_models_compact(self):
+        """
+        iter_models(compact=True) yields compact models, also through a prefetching pager
+        """
+        service = ResourceControllerV2(authenticator=NoAuthAuthenticator())
+        url = 'https://resource-controller.cloud.ibm.com/v2/resource_instances'
+        mock_response = '{"resources":[{"id":"a","created_at":"2019-01-01T12:00:00.000Z"}]}'
+        responses.add(responses.GET, url, body=mock_response, content_type='application/json', status=200)
+
+        with ResourceInstancesPager(client=service).prefetch() as pager:
+            models = list(pager.iter_models(compact=True))
+        assert isinstance(models[0], CompactModel)
+        assert models[0].to_model() == ResourceInstance(id='a', created_at=models[0].created_at)
+        assert models[0].created_at.year == 2019
+
+    def test_iter_models_without_model_class(self):
+        """
+        A pager without a model class cannot build models
+        """
+        with pytest.raises(TypeError, match='model class'):
+            list(_FakePager(1).iter_models())
@@ -0,0 +1,185 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the rate_limiter module
+"""
+
+import email.utils
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.global_tagging_v1 import GlobalTaggingV1
+from ibm_platform_services.rate_limiter import (
+    AdaptiveRateLimiter,
+    _parse_retry_after,
+    enable_rate_limiting,
+    get_shared_rate_limiter,
+)
+
+
+def _tagging_service(url: str) -> GlobalTaggingV1:
+    service = GlobalTaggingV1(authenticator=NoAuthAuthenticator())
+    service.set_service_url(url)
+    return service
+
+
+class TestAdaptiveRateLimiter:
+    """
+    Test Class for AdaptiveRateLimiter
+    """
+
+    def test_token_bucket(self):
+        """
+        Requests are sent at most at `rate` per second after the burst
+        """
+        limiter = AdaptiveRateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(7):
+            limiter.release(limiter.acquire())
+        # Two requests are sent at once, the five others 20 ms apart.
+        assert time.monotonic() - start >= 0.09
+
+    def test_concurrency_limit(self):
+        """
+        At most the concurrency limit of requests are in flight
+        """
+        limiter = AdaptiveRateLimiter(max_concurrency=3)
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def request(_):
+            sent = limiter.acquire()
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            limiter.release(sent)
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(request, range(40)))
+        assert in_flight[1] == 3
+
+    def test_aimd(self):
+        """
+        The limit is halved once for requests throttled together and grows back with successes
+        """
+        limiter = AdaptiveRateLimiter(max_concurrency=16)
+        sent = [limiter.acquire() for _ in range(8)]
+        for request in sent:
+            limiter.release(request, throttled=True)
+        assert limiter.get_concurrency_limit() == 8
+        assert limiter.throttled == 8
+        limiter.release(limiter.acquire(), throttled=True)
+        assert limiter.get_concurrency_limit() == 4
+        # About one more for each round of `limit` successes.
+        for _ in range(5):
+            limiter.release(limiter.acquire())
+        assert limiter.get_concurrency_limit() == 5
+        for _ in range(1000):
+            limiter.release(limiter.acquire())
+        assert limiter.get_concurrency_limit() == 16
+
+    @responses.activate
+    def test_retry_after(self):
+        """
+        A throttled request is retried after the Retry-After delay, which also holds back other requests
+        """
+        url = 'https://retry-after.test.cloud.ibm.com'
+        responses.add(responses.GET, url + '/v3/tags', json={}, status=429, headers={'Retry-After': '0.2'})
+        responses.add(responses.GET, url + '/v3/tags', json={'items': []})
+        service = _tagging_service(url)
+        limiter = enable_rate_limiting(service, backoff=0)
+        start = time.monotonic()
+        assert service.list_tags().get_result() == {'items': []}
+        assert time.monotonic() - start >= 0.2
+        assert (limiter.throttled, limiter.retried) == (1, 1)
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_max_retries(self):
+        """
+        The ApiException of a request that is still throttled after max_retries is raised
+        """
+        url = 'https://max-retries.test.cloud.ibm.com'
+        responses.add(responses.GET, url + '/v3/tags', json={}, status=503)
+        responses.add(responses.GET, url + '/v4/errors', json={}, status=500)
+        service = _tagging_service(url)
+        enable_rate_limiting(service, max_retries=2, backoff=0.001)
+        with pytest.raises(ApiException) as error:
+            service.list_tags()
+        assert error.value.status_code == 503
+        assert len(responses.calls) == 3
+
+    def test_throttled_without_response(self):
+        """
+        A throttling ApiException without an http response is retried, then raised, and releases the limiter
+        """
+        limiter = AdaptiveRateLimiter(max_retries=1, backoff=0)
+        calls = []
+
+        def send(request, **_kwargs):
+            calls.append(request)
+            raise ApiException(429)
+
+        with pytest.raises(ApiException) as error:
+            limiter(None, 'list_tags', {}, send)
+        assert error.value.status_code == 429
+        assert len(calls) == 2
+        assert (limiter.throttled, limiter.retried) == (2, 1)
+        assert limiter._in_flight == 0
+
+    def test_shared_by_service_url(self):
+        """
+        Services with the same service URL share one limiter
+        """
+        first = _tagging_service('https://shared.test.cloud.ibm.com')
+        second = _tagging_service('https://shared.test.cloud.ibm.com/')
+        other = _tagging_service('https://other.test.cloud.ibm.com')
+        limiter = enable_rate_limiting(first, max_concurrency=4)
+        assert enable_rate_limiting(second) is limiter
+        assert enable_rate_limiting(second) is limiter
+        assert second.get_interceptors() == (limiter,)
+        assert enable_rate_limiting(other) is not limiter
+        assert get_shared_rate_limiter('https://shared.test.cloud.ibm.com').max_concurrency == 4
+
+    def test_parse_retry_after(self):
+        """
+        Retry-After is given in seconds or as an HTTP date
+        """
+        assert _parse_retry_after('3') == 3.0
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after('soon') is None
+        assert 9 <= _parse_retry_after(email.utils.formatdate(time.time() + 10, usegmt=True)) <= 10
+
+    def test_invalid_arguments(self):
+        """
+        The settings are validated
+        """
+        with pytest.raises(ValueError, match='rate'):
+            AdaptiveRateLimiter(rate=0)
+        with pytest.raises(ValueError, match='min_concurrency'):
+            AdaptiveRateLimiter(min_concurrency=4, max_concurrency=2)
+        with pytest.raises(ValueError, match='decrease_factor'):
+            AdaptiveRateLimiter(decrease_factor=1)
@@ -0,0 +1,151 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the response_cache module
+"""
+
+import time
+
+import pytest
+import responses
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.global_catalog_v1 import GlobalCatalogV1
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
+from ibm_platform_services.response_cache import ResponseCache
+
+_catalog_url = 'https://globalcatalog.cloud.ibm.com/api/v1'
+
+
+def _catalog_service(cache: ResponseCache) -> GlobalCatalogV1:
+    service = GlobalCatalogV1(authenticator=NoAuthAuthenticator())
+    service.add_interceptor(cache)
+    return service
+
+
+class TestResponseCache:
+    """
+    Test Class for ResponseCache
+    """
+
+    @responses.activate
+    def test_hit_within_ttl(self):
+        """
+        A repeated lookup is answered from the cache until its TTL expires
+        """
+        responses.add(responses.GET, _catalog_url + '/entry1', json={'id': 'entry1', 'name': 'one'})
+        cache = ResponseCache({'get_catalog_entry': 60})
+        service = _catalog_service(cache)
+        first = service.get_catalog_entry('entry1').get_result()
+        second = service.get_catalog_entry('entry1').get_result()
+        assert first == second == {'id': 'entry1', 'name': 'one'}
+        assert len(responses.calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        # Callers get their own copy of the cached result.
+        second['name'] = 'changed'
+        assert service.get_catalog_entry('entry1').get_result()['name'] == 'one'
+
+    @responses.activate
+    def test_key_includes_query_parameters(self):
+        """
+        Lookups with different parameters are cached separately
+        """
+        responses.add(responses.GET, _catalog_url + '/entry1/pricing', json={'currency': 'USD'})
+        service = _catalog_service(ResponseCache({'get_pricing': 60}))
+        service.get_pricing('entry1')
+        service.get_pricing('entry1', account='global')
+        service.get_pricing('entry1', account='global')
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_uncached_operations(self):
+        """
+        Operations without a TTL and non-GET requests are always sent
+        """
+        responses.add(responses.GET, _catalog_url + '/entry1', json={'id': 'entry1'})
+        responses.add(responses.DELETE, _catalog_url + '/entry1', status=204)
+        cache = ResponseCache({'get_pricing': 60, 'delete_catalog_entry': 60})
+        service = _catalog_service(cache)
+        service.get_catalog_entry('entry1')
+        service.get_catalog_entry('entry1')
+        service.delete_catalog_entry('entry1')
+        service.delete_catalog_entry('entry1')
+        assert len(responses.calls) == 4
+        assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+    @responses.activate
+    def test_revalidation_with_etag(self):
+        """
+        An expired result with an ETag is renewed by a 304 response
+        """
+        responses.add(responses.GET, _catalog_url + '/entry1/%2A', json=[{'id': 'child'}], headers={'ETag': '"v1"'})
+        responses.add(responses.GET, _catalog_url + '/entry1/%2A', status=304)
+        cache = ResponseCache({'get_child_objects': 0.05})
+        service = _catalog_service(cache)
+        assert service.get_child_objects('entry1', '*').get_result() == [{'id': 'child'}]
+        time.sleep(0.1)
+        response = service.get_child_objects('entry1', '*')
+        assert response.get_result() == [{'id': 'child'}]
+        assert response.get_status_code() == 200
+        assert responses.calls[1].request.headers['If-None-Match'] == '"v1"'
+        assert (cache.hits, cache.misses, cache.revalidations) == (0, 1, 1)
+        # The renewed result is reused again.
+        service.get_child_objects('entry1', '*')
+        assert (len(responses.calls), cache.hits) == (2, 1)
+
+    @responses.activate
+    def test_changed_result_replaces_entry(self):
+        """
+        A 200 response to a revalidation replaces the cached result
+        """
+        url = 'https://resource-controller.cloud.ibm.com/v2/resource_groups/rg1'
+        responses.add(responses.GET, url, json={'id': 'rg1', 'name': 'old'}, headers={'ETag': '"v1"'})
+        responses.add(responses.GET, url, json={'id': 'rg1', 'name': 'new'}, headers={'ETag': '"v2"'})
+        service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+        cache = ResponseCache({'get_resource_group': 0.05})
+        service.add_interceptor(cache)
+        service.get_resource_group('rg1')
+        time.sleep(0.1)
+        assert service.get_resource_group('rg1').get_result()['name'] == 'new'
+        assert service.get_resource_group('rg1').get_result()['name'] == 'new'
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_lru_eviction(self):
+        """
+        The least recently used results are evicted to stay below max_bytes
+        """
+        for name in ('a', 'b', 'c'):
+            responses.add(responses.GET, _catalog_url + '/' + name, json={'id': name, 'data': 'x' * 80})
+        cache = ResponseCache({'get_catalog_entry': 60}, max_bytes=250)
+        service = _catalog_service(cache)
+        service.get_catalog_entry('a')
+        service.get_catalog_entry('b')
+        service.get_catalog_entry('a')
+        service.get_catalog_entry('c')
+        assert (len(cache), cache.evictions) == (2, 1)
+        assert cache.get_size() <= 250
+        service.get_catalog_entry('a')
+        service.get_catalog_entry('b')
+        assert [call.request.url.rsplit('/', 1)[1] for call in responses.calls] == ['a', 'b', 'c', 'b']
+
+    def test_invalid_max_bytes(self):
+        """
+        max_bytes must be positive
+        """
+        with pytest.raises(ValueError):
+            ResponseCache({}, max_bytes=0)
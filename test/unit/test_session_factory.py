@@ -0,0 +1,134 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the session_factory module
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from benchmark.stub_server import StubHandler
+from ibm_platform_services.global_tagging_v1 import GlobalTaggingV1
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
+from ibm_platform_services.session_factory import PooledHTTPAdapter, SessionFactory
+
+
+class _StubHandler(StubHandler):
+    """Answers every request with an empty JSON object over a persistent connection."""
+
+    def respond(self, body):
+        return (200, {}, None)
+
+
+class TestSessionFactory:
+    """
+    Test Class for SessionFactory
+    """
+
+    def test_services_share_adapter(self):
+        """
+        Services configured with the same factory and settings share one adapter
+        """
+        factory = SessionFactory(pool_maxsize=64)
+        tagging = factory.configure_service(GlobalTaggingV1(authenticator=NoAuthAuthenticator()))
+        groups = factory.configure_service(ResourceManagerV2(authenticator=NoAuthAuthenticator()))
+        assert isinstance(tagging.http_adapter, PooledHTTPAdapter)
+        assert tagging.http_adapter is groups.http_adapter
+        assert (
+            tagging.http_client.get_adapter('https://tags.global-search-tagging.cloud.ibm.com') is tagging.http_adapter
+        )
+        assert tagging.http_adapter.poolmanager.connection_pool_kw['maxsize'] == 64
+        assert tagging.get_session_factory() is factory
+
+    def test_settings_changes_keep_shared_pools(self):
+        """
+        Changing the retry or SSL settings of a service moves it to the shared adapter for the new settings
+        """
+        factory = SessionFactory()
+        first = factory.configure_service(ResourceManagerV2(authenticator=NoAuthAuthenticator()))
+        second = factory.configure_service(ResourceManagerV2(authenticator=NoAuthAuthenticator()))
+        shared = first.http_adapter
+        first.enable_retries(max_retries=2)
+        assert isinstance(first.http_adapter, PooledHTTPAdapter)
+        assert first.http_adapter is not shared
+        assert first.http_adapter.max_retries.total == 2
+        assert second.http_adapter is shared
+        second.enable_retries(max_retries=2)
+        assert second.http_adapter is first.http_adapter
+        second.disable_retries()
+        assert second.http_adapter is shared
+        second.set_disable_ssl_verification(True)
+        assert second.http_adapter not in (shared, first.http_adapter)
+        assert second.http_adapter._disable_ssl_verification
+
+    def test_max_retries(self):
+        """
+        configure_service() enables retries when the factory has max_retries
+        """
+        factory = SessionFactory(max_retries=3, retry_interval=5.0)
+        service = factory.configure_service(ResourceManagerV2(authenticator=NoAuthAuthenticator()))
+        assert service.retry_config.total == 3
+        assert service.http_adapter.max_retries.total == 3
+
+    def test_remove_session_factory(self):
+        """
+        A service goes back to an adapter of its own without a factory
+        """
+        factory = SessionFactory()
+        service = factory.configure_service(ResourceManagerV2(authenticator=NoAuthAuthenticator()))
+        service.set_session_factory(None)
+        assert not isinstance(service.http_adapter, PooledHTTPAdapter)
+        assert service.http_client.get_adapter('https://x') is service.http_adapter
+
+    def test_invalid_arguments(self):
+        """
+        Pool sizes must be positive
+        """
+        with pytest.raises(ValueError, match='pool_maxsize'):
+            SessionFactory(pool_maxsize=0)
+        with pytest.raises(ValueError, match='pool_connections'):
+            SessionFactory(pool_connections=0)
+
+    @responses.activate
+    def test_keep_alive_disabled(self):
+        """
+        Requests ask the server to close the connection when keep-alive is disabled
+        """
+        responses.add(responses.GET, 'https://resource-controller.cloud.ibm.com/v2/resource_groups/rg1', json={})
+        factory = SessionFactory(keep_alive=False)
+        service = factory.configure_service(ResourceManagerV2(authenticator=NoAuthAuthenticator()))
+        service.get_resource_group('rg1')
+        assert responses.calls[0].request.headers['Connection'] == 'close'
+
+    def test_connections_reused_across_services(self, start_stub_server):
+        """
+        Concurrent requests of several services reuse the connections of the shared pool
+        """
+        stub_server = start_stub_server(_StubHandler)
+        factory = SessionFactory(pool_maxsize=8, pool_block=True)
+        services = []
+        for _ in range(4):
+            service = factory.configure_service(ResourceManagerV2(authenticator=NoAuthAuthenticator()))
+            service.set_service_url(stub_server.url)
+            services.append(service)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(lambda i: services[i % 4].get_resource_group(str(i)), range(400)))
+        assert stub_server.connections <= 8
+        factory.close()
@@ -0,0 +1,128 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the single_flight module
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.resource_manager_v2 import ResourceManagerV2
+from ibm_platform_services.single_flight import RequestCoalescer
+
+_groups_url = 'https://resource-controller.cloud.ibm.com/v2/resource_groups'
+
+
+def _slow_callback(status: int = 200, delay: float = 0.2):
+    """Answer each request after `delay` seconds, once all the test threads have had time to send theirs."""
+
+    def callback(request):
+        time.sleep(delay)
+        return (status, {}, json.dumps({'id': request.url.rsplit('/', 1)[1]}))
+
+    return callback
+
+
+def _service(coalescer: RequestCoalescer) -> ResourceManagerV2:
+    service = ResourceManagerV2(authenticator=NoAuthAuthenticator())
+    service.add_interceptor(coalescer)
+    return service
+
+
+class TestRequestCoalescer:
+    """
+    Test Class for RequestCoalescer
+    """
+
+    @responses.activate
+    def test_identical_requests_share_one_call(self):
+        """
+        Concurrent identical GETs send one request, and every caller gets its own copy of the result
+        """
+        responses.add_callback(
+            responses.GET, _groups_url + '/rg1', callback=_slow_callback(), content_type='application/json'
+        )
+        coalescer = RequestCoalescer()
+        service = _service(coalescer)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: service.get_resource_group('rg1').get_result(), range(8)))
+        assert results == [{'id': 'rg1'}] * 8
+        assert len({id(result) for result in results}) == 8
+        assert len(responses.calls) == 1
+        assert (coalescer.sent, coalescer.coalesced, len(coalescer)) == (1, 7, 0)
+
+    @responses.activate
+    def test_distinct_and_sequential_requests(self):
+        """
+        Different requests, and requests sent after the answer, are sent on their own
+        """
+        responses.add_callback(
+            responses.GET, _groups_url + '/rg1', callback=_slow_callback(delay=0), content_type='application/json'
+        )
+        responses.add_callback(
+            responses.GET, _groups_url + '/rg2', callback=_slow_callback(delay=0), content_type='application/json'
+        )
+        service = _service(RequestCoalescer())
+        service.get_resource_group('rg1')
+        service.get_resource_group('rg1')
+        service.get_resource_group('rg2')
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_errors_are_shared(self):
+        """
+        The callers waiting for a failed request get its exception
+        """
+        responses.add_callback(
+            responses.GET,
+            _groups_url + '/missing',
+            callback=_slow_callback(status=404),
+            content_type='application/json',
+        )
+        service = _service(RequestCoalescer())
+        barrier = threading.Barrier(4)
+
+        def get_missing(_):
+            barrier.wait()
+            with pytest.raises(ApiException) as error:
+                service.get_resource_group('missing')
+            return error.value.status_code
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert list(executor.map(get_missing, range(4))) == [404] * 4
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_selected_operations(self):
+        """
+        Only the requests of the selected GET operations are coalesced
+        """
+        responses.add_callback(
+            responses.GET, _groups_url + '/rg1', callback=_slow_callback(), content_type='application/json'
+        )
+        responses.add_callback(responses.GET, _groups_url, callback=_slow_callback(), content_type='application/json')
+        service = _service(RequestCoalescer(['list_resource_groups']))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: service.get_resource_group('rg1'), range(4)))
+        assert len(responses.calls) == 4
@@ -0,0 +1,147 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the token_cache module
+"""
+
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import responses
+from ibm_cloud_sdk_core.authenticators import BasicAuthenticator, IAMAuthenticator
+
+from ibm_platform_services.client_factory import ClientFactory
+from ibm_platform_services.resource_controller_v2 import ResourceControllerV2
+from ibm_platform_services.token_cache import DiskTokenCache
+
+_iam_url = 'https://iam.test.cloud.ibm.com'
+_token_url = _iam_url + '/identity/token'
+
+
+def _token_response(iat: float = None, ttl: int = 3600) -> dict:
+    iat = int(time.time()) if iat is None else int(iat)
+    access_token = jwt.encode({'iat': iat, 'exp': iat + ttl}, 'secret' * 8, algorithm='HS256')
+    return {'access_token': access_token, 'refresh_token': 'r', 'token_type': 'Bearer', 'expires_in': ttl}
+
+
+def _authenticator() -> IAMAuthenticator:
+    return IAMAuthenticator('apikey', url=_iam_url)
+
+
+class TestDiskTokenCache:
+    """
+    Test Class for DiskTokenCache
+    """
+
+    def test_store_and_load(self, tmp_path):
+        """
+        A stored token response is loaded while it is fresh, from a file only readable by its owner
+        """
+        cache = DiskTokenCache(str(tmp_path / 'tokens'))
+        assert cache.load('fp') is None
+        token_response = _token_response()
+        cache.store('fp', token_response)
+        assert cache.load('fp') == token_response
+        assert stat.S_IMODE(os.stat(str(tmp_path / 'tokens' / 'fp.json')).st_mode) == 0o600
+        cache.remove('fp')
+        assert cache.load('fp') is None
+
+    def test_stale_and_corrupt_files(self, tmp_path):
+        """
+        Tokens past their refresh time and unreadable files are not loaded
+        """
+        cache = DiskTokenCache(str(tmp_path))
+        # Issued 50 minutes ago with a TTL of one hour: past 80% of its lifetime.
+        cache.store('stale', _token_response(iat=time.time() - 3000))
+        assert cache.load('stale') is None
+        (tmp_path / 'corrupt.json').write_text('{not json')
+        assert cache.load('corrupt') is None
+        cache.store('no-token', {'expires_in': 3600})
+        assert cache.load('no-token') is None
+
+    @responses.activate
+    def test_attach_reuses_cached_token(self, tmp_path):
+        """
+        An attached authenticator starts with the cached token instead of requesting one
+        """
+        responses.add(responses.POST, _token_url, json=_token_response())
+        cache = DiskTokenCache(str(tmp_path))
+        first = _authenticator()
+        assert cache.attach(first, 'fp')
+        first_token = first.token_manager.get_token()
+        second = _authenticator()
+        assert cache.attach(second, 'fp')
+        assert second.token_manager.get_token() == first_token
+        assert len(responses.calls) == 1
+        # Attaching again has no effect.
+        assert cache.attach(second, 'fp')
+        assert not cache.attach(BasicAuthenticator('user', 'password'), 'fp')
+
+    @responses.activate
+    def test_refresh_replaces_cached_token(self, tmp_path):
+        """
+        A token requested to refresh a stale one replaces it in the cache
+        """
+        fresh = _token_response()
+        responses.add(responses.POST, _token_url, json=fresh)
+        cache = DiskTokenCache(str(tmp_path))
+        cache.store('fp', _token_response(iat=time.time() - 3000))
+        authenticator = _authenticator()
+        cache.attach(authenticator, 'fp')
+        assert authenticator.token_manager.get_token() == fresh['access_token']
+        assert cache.load('fp') == fresh
+
+    @responses.activate
+    def test_concurrent_requests(self, tmp_path):
+        """
+        Token managers that start together with an empty cache request one token between them
+        """
+        responses.add(responses.POST, _token_url, json=_token_response())
+        cache = DiskTokenCache(str(tmp_path))
+        authenticators = [_authenticator() for _ in range(8)]
+        for authenticator in authenticators:
+            cache.attach(authenticator, 'fp')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = set(executor.map(lambda authenticator: authenticator.token_manager.get_token(), authenticators))
+        assert len(tokens) == 1
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_external_configuration(self, tmp_path, monkeypatch):
+        """
+        TOKEN_CACHE enables the cache for the clients of new_instance() and of a ClientFactory
+        """
+        monkeypatch.setenv('RESOURCE_CONTROLLER_APIKEY', 'apikey')
+        monkeypatch.setenv('RESOURCE_CONTROLLER_AUTH_URL', _iam_url)
+        monkeypatch.setenv('RESOURCE_CONTROLLER_TOKEN_CACHE', 'true')
+        monkeypatch.setenv('RESOURCE_CONTROLLER_TOKEN_CACHE_DIR', str(tmp_path / 'env'))
+        responses.add(responses.POST, _token_url, json=_token_response())
+        responses.add(responses.GET, ResourceControllerV2.DEFAULT_SERVICE_URL + '/v2/resource_instances/abc', json={})
+        ResourceControllerV2.new_instance().get_resource_instance('abc')
+        ResourceControllerV2.new_instance().get_resource_instance('abc')
+        assert len(os.listdir(str(tmp_path / 'env'))) == 2
+        monkeypatch.delenv('RESOURCE_CONTROLLER_TOKEN_CACHE')
+        factory = ClientFactory(token_cache=DiskTokenCache(str(tmp_path / 'factory')))
+        factory.new_instance(ResourceControllerV2).get_resource_instance('abc')
+        ClientFactory(token_cache=DiskTokenCache(str(tmp_path / 'factory'))).new_instance(
+            ResourceControllerV2
+        ).get_resource_instance('abc')
+        token_requests = [call for call in responses.calls if call.request.url == _token_url]
+        assert len(token_requests) == 2
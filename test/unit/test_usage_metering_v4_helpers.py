@@ -0,0 +1,223 @@
+# coding: utf-8
+
+# Copyright 2023 IBM All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit Tests for the usage_metering_v4_helpers module
+"""
+
+import json
+import re
+import threading
+import time
+
+import pytest
+import responses
+from ibm_cloud_sdk_core.authenticators.no_auth_authenticator import NoAuthAuthenticator
+
+from ibm_platform_services.usage_metering_v4 import ResourceInstanceUsage, UsageMeteringV4
+from ibm_platform_services.usage_metering_v4_helpers import UsageBatchSubmitter
+
+_service = UsageMeteringV4(authenticator=NoAuthAuthenticator())
+_url = re.compile(r'https://billing\.cloud\.ibm\.com/v4/metering/resources/([^/]+)/usage')
+
+
+def _record(instance_id: str) -> dict:
+    return {
+        'resource_instance_id': instance_id,
+        'plan_id': 'plan',
+        'start': 1485907200000,
+        'end': 1485910800000,
+        'measured_usage': [{'measure': 'STORAGE', 'quantity': 1}],
+    }
+
+
+class _UsageStub:
+    """Accepts every record except those whose instance ID is in `failures`, for `times` attempts."""
+
+    def __init__(self, failures: dict = None, delay: float = 0.0) -> None:
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.batches = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __call__(self, request):
+        resource_id = _url.match(request.url).group(1)
+        records = json.loads(request.body)
+        with self.lock:
+            self.batches.append((resource_id, [r['resource_instance_id'] for r in records]))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        results = []
+        with self.lock:
+            for record in records:
+                (status, times) = self.failures.get(record['resource_instance_id'], (201, 0))
+                if times:
+                    self.failures[record['resource_instance_id']] = (status, times - 1)
+                    results.append({'status': status, 'location': 'x', 'code': 'error'})
+                else:
+                    results.append({'status': 201, 'location': record['resource_instance_id']})
+            self.in_flight -= 1
+        return (202, {}, json.dumps({'resources': results}))
+
+
+class TestUsageBatchSubmitter:
+    """
+    Test Class for UsageBatchSubmitter
+    """
+
+    @responses.activate
+    def test_groups_records_by_resource_id(self):
+        """
+        Records are sent in one batch per resource ID when flushed
+        """
+        stub = _UsageStub()
+        responses.add_callback(responses.POST, _url, callback=stub, content_type='application/json')
+        with UsageBatchSubmitter(_service, flush_interval=60) as submitter:
+            submitter.submit('res-a', _record('a1'))
+            submitter.submit('res-b', _record('b1'))
+            submitter.submit('res-a', ResourceInstanceUsage.from_dict(_record('a2')))
+        assert sorted(stub.batches) == [('res-a', ['a1', 'a2']), ('res-b', ['b1'])]
+        assert submitter.accepted == 3
+
+    @responses.activate
+    def test_flush_on_batch_size(self):
+        """
+        A full batch is sent without waiting for the flush interval
+        """
+        stub = _UsageStub()
+        responses.add_callback(responses.POST, _url, callback=stub, content_type='application/json')
+        submitter = UsageBatchSubmitter(_service, max_batch_size=2, flush_interval=60)
+        for i in range(5):
+            submitter.submit('res', _record(str(i)))
+        for _ in range(50):
+            if len(stub.batches) == 2:
+                break
+            time.sleep(0.01)
+        assert sorted(stub.batches) == [('res', ['0', '1']), ('res', ['2', '3'])]
+        submitter.close()
+        assert stub.batches[-1] == ('res', ['4'])
+
+    @responses.activate
+    def test_flush_on_interval(self):
+        """
+        A partial batch is sent once its oldest record has waited the flush interval
+        """
+        stub = _UsageStub()
+        responses.add_callback(responses.POST, _url, callback=stub, content_type='application/json')
+        with UsageBatchSubmitter(_service, flush_interval=0.1) as submitter:
+            submitter.submit('res', _record('a'))
+            time.sleep(0.5)
+            assert stub.batches == [('res', ['a'])]
+
+    @responses.activate
+    def test_batches_sent_in_parallel(self):
+        """
+        Up to max_concurrency batches are in flight at the same time
+        """
+        stub = _UsageStub(delay=0.1)
+        responses.add_callback(responses.POST, _url, callback=stub, content_type='application/json')
+        with UsageBatchSubmitter(_service, max_batch_size=1, max_concurrency=3) as submitter:
+            for i in range(6):
+                submitter.submit('res', _record(str(i)))
+        assert len(stub.batches) == 6
+        assert 1 < stub.max_in_flight <= 3
+
+    @responses.activate
+    def test_resubmits_only_failed_records(self):
+        """
+        Records reported with a retryable status are sent again on their own
+        """
+        stub = _UsageStub(failures={'b': (503, 1), 'c': (400, 1)})
+        responses.add_callback(responses.POST, _url, callback=stub, content_type='application/json')
+        results = {}
+        submitter = UsageBatchSubmitter(
+            _service,
+            retry_interval=0.01,
+            on_result=lambda resource_id, record, details: results.update({record['resource_instance_id']: details}),
+        )
+        with submitter:
+            for name in 'abc':
+                submitter.submit('res', _record(name))
+        assert stub.batches == [('res', ['a', 'b', 'c']), ('res', ['b'])]
+        assert {name: details.status for (name, details) in results.items()} == {'a': 201, 'b': 201, 'c': 400}
+        assert (submitter.accepted, submitter.failed, submitter.retried) == (2, 1, 1)
+
+    @responses.activate
+    def test_gives_up_after_max_attempts(self):
+        """
+        A record still failing after max_attempts is reported with its last status
+        """
+        stub = _UsageStub(failures={'a': (500, 10)})
+        responses.add_callback(responses.POST, _url, callback=stub, content_type='application/json')
+        results = []
+        submitter = UsageBatchSubmitter(
+            _service, max_attempts=2, retry_interval=0.01, on_result=lambda *args: results.append(args[2].status)
+        )
+        with submitter:
+            submitter.submit('res', _record('a'))
+        assert len(stub.batches) == 2
+        assert results == [500]
+
+    @responses.activate
+    def test_request_failure_retried(self):
+        """
+        A request that fails as a whole with a retryable status is sent again
+        """
+        responses.add(responses.POST, _url, json={'message': 'unavailable'}, status=503)
+        responses.add(responses.POST, _url, json={'resources': [{'status': 201, 'location': 'a'}]}, status=202)
+        with UsageBatchSubmitter(_service, retry_interval=0.01) as submitter:
+            submitter.submit('res', _record('a'))
+        assert len(responses.calls) == 2
+        assert submitter.accepted == 1
+
+    @responses.activate
+    def test_on_result_error(self):
+        """
+        An exception raised by on_result does not skip the other records, and is raised by close()
+        """
+        responses.add_callback(responses.POST, _url, callback=_UsageStub(), content_type='application/json')
+        results = []
+
+        def on_result(_resource_id, record, _details):
+            results.append(record['resource_instance_id'])
+            if record['resource_instance_id'] == 'a':
+                raise RuntimeError('on_result failed')
+
+        submitter = UsageBatchSubmitter(_service, flush_interval=60, on_result=on_result)
+        submitter.submit('res', _record('a'))
+        submitter.submit('res', _record('b'))
+        with pytest.raises(RuntimeError, match='on_result failed'):
+            submitter.close()
+        assert results == ['a', 'b']
+        assert submitter.accepted == 2
+
+    def test_invalid_arguments(self):
+        """
+        Invalid options and records are rejected
+        """
+        with pytest.raises(ValueError, match='max_batch_size'):
+            UsageBatchSubmitter(_service, max_batch_size=0)
+        with pytest.raises(ValueError, match='max_concurrency'):
+            UsageBatchSubmitter(_service, max_concurrency=0)
+        submitter = UsageBatchSubmitter(_service)
+        with pytest.raises(ValueError, match='resource_id'):
+            submitter.submit(None, _record('a'))
+        submitter.close()
+        with pytest.raises(RuntimeError):
+            submitter.submit('res', _record('a'))